@@ -0,0 +1,343 @@
+"""알람 규칙 엔진
+
+구독(규칙)은 골프장, 지역, 플레이 날짜 범위, 티타임 시간대, 가격 상한, 잔여 팀 기준(이상/이하)과
+팀 수 변화 방향을 조합한다. 스냅샷이 들어오면 직전 상태와 달라진 (날짜, 골프장)만 골라
+골프장/지역별, 날짜별로 색인된 규칙만 확인하므로 규칙이 수천 개여도 사이클당 수십 ms면 된다.
+
+    engine = RuleEngine()
+    engine.add(Rule(golf_course='테스트CC', direction='down'))
+    engine.add(Rule(region='경기', date_from='2024-12-07', start='06:00', end='08:00', max_price=150000, min_teams=1))
+    engine.bus.subscribe(lambda alerts: ...)
+    engine.evaluate(df)
+
+규칙은 JSON 파일(TEETIME_ALARM_RULES)에 저장되어 재시작해도 유지되고, 다른 프로세스(GUI)가 파일을
+바꾸면 다음 evaluate()에서 다시 읽는다. 조건은 만족하지 않다가 만족하게 될 때만 알리며(direction이
+있으면 그 방향으로 팀 수가 바뀔 때마다), 처음 보는 날짜는 기준점으로만 기록한다.
+
+    python alarm_rules.py add --course 테스트CC --direction down
+    python alarm_rules.py list
+    python alarm_rules.py remove 3
+"""
+import argparse
+import json
+import os
+import threading
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from datetime import date, timedelta
+
+import config
+import records
+from diff_engine import ChangeBus
+from slot_index import parse_clock
+
+DIRECTIONS = ("down", "up")
+MAX_INDEXED_DAYS = 62  # 이보다 짧은 날짜 범위는 날짜마다 색인에 넣음
+
+# 골프장 하나의 한 날짜 상태 (tee_times는 정렬된 분 배열)
+CourseState = namedtuple('CourseState', 'remaining_teams price tee_times location region')
+
+# 규칙이 걸린 알림 (tee_times는 규칙 시간대 안의 티타임, 분)
+Alert = namedtuple('Alert', 'rule_id label golf_course play_date location previous_teams current_teams price tee_times')
+
+
+def _clock_text(minutes):
+    return None if minutes is None else f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+class Rule:
+    """알람 구독 하나 (None인 조건은 따지지 않음)"""
+
+    __slots__ = ("id", "label", "golf_course", "region", "date_from", "date_to", "start", "end",
+                 "max_price", "min_teams", "max_teams", "direction")
+
+    def __init__(self, golf_course=None, region=None, date_from=None, date_to=None, start=None, end=None,
+                 max_price=None, min_teams=None, max_teams=None, direction=None, label=None, id=None):
+        if direction is not None and direction not in DIRECTIONS:
+            raise ValueError(f"알 수 없는 방향: {direction} (가능한 값: {', '.join(DIRECTIONS)})")
+        if date_from and date_to and date_from > date_to:
+            raise ValueError(f"날짜 범위가 잘못되었습니다: {date_from} ~ {date_to}")
+        self.id = id
+        self.label = label
+        self.golf_course = golf_course
+        self.region = region
+        self.date_from = date_from
+        self.date_to = date_to
+        self.start = parse_clock(start)
+        self.end = parse_clock(end)
+        self.max_price = max_price
+        self.min_teams = min_teams
+        self.max_teams = max_teams
+        self.direction = direction
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{name: data.get(name) for name in cls.__slots__})
+
+    def as_dict(self):
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data["start"] = _clock_text(self.start)
+        data["end"] = _clock_text(self.end)
+        return {name: value for name, value in data.items() if value is not None}
+
+    def index_dates(self):
+        """날짜 색인 키 목록 (범위가 없거나 너무 길면 [None]: 날짜마다 covers()로 확인)"""
+        if not self.date_from or not self.date_to:
+            return [None]
+        first = date.fromisoformat(self.date_from)
+        days = (date.fromisoformat(self.date_to) - first).days
+        if days > MAX_INDEXED_DAYS:
+            return [None]
+        return [(first + timedelta(days=offset)).isoformat() for offset in range(days + 1)]
+
+    def covers(self, play_date):
+        return ((self.date_from is None or play_date >= self.date_from)
+                and (self.date_to is None or play_date <= self.date_to))
+
+    def window(self, state):
+        """시간대 안의 티타임 (시간대가 없으면 전체)"""
+        times = state.tee_times
+        lo = 0 if self.start is None else bisect_left(times, self.start)
+        hi = len(times) if self.end is None else bisect_right(times, self.end)
+        return times[lo:hi]
+
+    def satisfied(self, state):
+        if state is None:
+            return False
+        if self.max_price is not None and (state.price is None or state.price > self.max_price):
+            return False
+        teams = state.remaining_teams
+        if self.min_teams is not None and (teams is None or teams < self.min_teams):
+            return False
+        if self.max_teams is not None and (teams is None or teams > self.max_teams):
+            return False
+        if (self.start is not None or self.end is not None) and not len(self.window(state)):
+            return False
+        return True
+
+    def fires(self, previous, current):
+        """직전 상태 → 현재 상태에서 알릴지"""
+        if not self.satisfied(current):
+            return False
+        if self.direction is None:
+            return not self.satisfied(previous)
+        if previous is None or previous.remaining_teams is None or current.remaining_teams is None:
+            return False
+        if self.direction == "down":
+            return current.remaining_teams < previous.remaining_teams
+        return current.remaining_teams > previous.remaining_teams
+
+    def __repr__(self):
+        return f"Rule({self.as_dict()})"
+
+
+def _columns(snapshot):
+    """(play_date, golf_course, 잔여 팀, 가격, play_time, location) 행 (데이터프레임은 열 단위로 꺼냄)"""
+    if hasattr(snapshot, 'columns'):
+        nullable = [snapshot[name] for name in ('remaining_teams', 'price', 'location')]
+        teams, prices, locations = [column.astype(object).where(column.notna(), None).tolist() for column in nullable]
+        return zip(snapshot['play_date'].astype(str).tolist(), snapshot['golf_course'].tolist(), teams, prices,
+                   snapshot['play_time'].tolist(), locations)
+    return (
+        (str(row['play_date']), row['golf_course'], records.parse_count(row.get('remaining_teams')),
+         records.parse_count(row.get('price')), records.parse_minutes(row.get('play_time')), row.get('location'))
+        for row in snapshot
+    )
+
+
+def _states(snapshot):
+    """스냅샷(데이터프레임 또는 레코드 목록) → {play_date: {golf_course: CourseState}}"""
+    states = {}
+    regions = {}
+    for play_date, golf_course, teams, price, play_time, location in _columns(snapshot):
+        region = regions.get(location)
+        if region is None:
+            region = regions[location] = records.region_of(location)
+        states.setdefault(play_date[:10], {})[golf_course] = CourseState(teams, price, sorted(play_time), location, region)
+    return states
+
+
+class RuleEngine:
+    """규칙 저장/색인과 스냅샷 일괄 평가"""
+
+    def __init__(self, path=None, bus=None):
+        self.path = config.ALARM_RULES_PATH if path is None else path
+        self.bus = bus or ChangeBus()  # 알림(Alert) 목록 발행
+        self._rules = {}
+        self._by_course = {}  # 골프장 → {날짜 또는 None(기간 제한 없음): [규칙]}
+        self._by_region = {}  # 지역 접두어 → {...}
+        self._region_buckets = {}  # 골프장 지역 → 접두어가 맞는 _by_region 버킷 목록 (캐시)
+        self._global = {}     # 골프장/지역 조건 없는 규칙
+        self._state = {}      # play_date → {golf_course: CourseState}
+        self._mtime = None
+        self._lock = threading.RLock()
+        self.reload_if_changed()
+
+    # 저장과 색인
+
+    def _index(self):
+        self._by_course, self._by_region, self._global = {}, {}, {}
+        self._region_buckets = {}
+        for rule in self._rules.values():
+            if rule.golf_course is not None:
+                bucket = self._by_course.setdefault(rule.golf_course, {})
+            elif rule.region is not None:
+                bucket = self._by_region.setdefault(rule.region, {})
+            else:
+                bucket = self._global
+            for key in rule.index_dates():
+                bucket.setdefault(key, []).append(rule)
+
+    def reload_if_changed(self):
+        """규칙 파일이 바뀌었으면 다시 읽음 (다른 프로세스가 추가/삭제한 규칙 반영)"""
+        if not self.path:
+            return False
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if mtime == self._mtime:
+            return False
+        rules = {}
+        if mtime is not None:
+            with open(self.path, encoding="utf-8") as f:
+                for data in json.load(f).get("rules", []):
+                    rule = Rule.from_dict(data)
+                    rules[rule.id] = rule
+        with self._lock:
+            self._rules = rules
+            self._mtime = mtime
+            self._index()
+        return True
+
+    def _save(self):
+        if not self.path:
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"rules": [rule.as_dict() for rule in self._rules.values()]}, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.path)
+        self._mtime = os.stat(self.path).st_mtime_ns
+
+    def add(self, rule):
+        """규칙을 추가하고 저장한 뒤 번호 반환"""
+        with self._lock:
+            self.reload_if_changed()
+            rule.id = max(self._rules, default=0) + 1
+            self._rules[rule.id] = rule
+            self._index()
+            self._save()
+            return rule.id
+
+    def remove(self, rule_id):
+        with self._lock:
+            self.reload_if_changed()
+            rule = self._rules.pop(rule_id, None)
+            if rule is not None:
+                self._index()
+                self._save()
+            return rule
+
+    def rules(self):
+        with self._lock:
+            return sorted(self._rules.values(), key=lambda rule: rule.id)
+
+    # 평가
+
+    def _region_matches(self, region):
+        """지역 규칙은 접두어로 맞춤 ('경기' 규칙은 '경기남부' 골프장에도 적용)"""
+        buckets = self._region_buckets.get(region)
+        if buckets is None:
+            buckets = [bucket for prefix, bucket in self._by_region.items()
+                       if region is not None and region.startswith(prefix)]
+            self._region_buckets[region] = buckets
+        return buckets
+
+    def _candidates(self, play_date, golf_course, region):
+        for bucket in [self._by_course.get(golf_course)] + self._region_matches(region) + [self._global]:
+            if not bucket:
+                continue
+            yield from bucket.get(play_date, ())
+            for rule in bucket.get(None, ()):
+                if rule.covers(play_date):
+                    yield rule
+
+    def evaluate(self, snapshot):
+        """새 스냅샷을 모든 규칙에 한 번에 적용하고 알림 목록 반환 (bus로도 발행)"""
+        self.reload_if_changed()
+        current = _states(snapshot)
+        alerts = []
+        with self._lock:
+            for play_date, courses in current.items():
+                previous = self._state.get(play_date)
+                self._state[play_date] = courses
+                if previous is None:
+                    continue
+                for golf_course, state in courses.items():
+                    old = previous.get(golf_course)
+                    if old == state:
+                        continue
+                    for rule in self._candidates(play_date, golf_course, state.region):
+                        if rule.fires(old, state):
+                            alerts.append(Alert(
+                                rule.id, rule.label, golf_course, play_date, state.location,
+                                None if old is None else old.remaining_teams, state.remaining_teams,
+                                state.price, tuple(rule.window(state)),
+                            ))
+        self.bus.publish(alerts)
+        return alerts
+
+    def forget_before(self, play_date):
+        """지난 플레이 날짜의 상태 제거"""
+        with self._lock:
+            for old_date in [d for d in self._state if d < play_date]:
+                del self._state[old_date]
+
+
+def format_alert(alert):
+    """알림 한 건을 사람이 읽는 문자열로"""
+    text = f"{alert.play_date} {alert.golf_course}"
+    if alert.previous_teams != alert.current_teams:
+        text += f" 팀 수 {records.format_teams(alert.previous_teams)} → {records.format_teams(alert.current_teams)}"
+    else:
+        text += f" 남은 팀 {records.format_teams(alert.current_teams)}"
+    text += f", {records.format_price(alert.price)}"
+    if alert.tee_times:
+        text += f", 티타임 {', '.join(records.format_minutes(alert.tee_times[:5]))}"
+    if alert.label:
+        text = f"[{alert.label}] " + text
+    return text
+
+
+def main():
+    parser = argparse.ArgumentParser(description="알람 규칙 관리")
+    parser.add_argument("command", choices=["add", "list", "remove"])
+    parser.add_argument("rule_id", nargs="?", type=int, help="remove: 규칙 번호")
+    parser.add_argument("--course", help="골프장 이름")
+    parser.add_argument("--region", help="지역 (예: 경기)")
+    parser.add_argument("--from", dest="date_from", help="플레이 날짜 시작 (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="date_to", help="플레이 날짜 끝 (YYYY-MM-DD)")
+    parser.add_argument("--start", help="티타임 시작 (HH:MM)")
+    parser.add_argument("--end", help="티타임 끝 (HH:MM)")
+    parser.add_argument("--max-price", type=int, help="가격 상한(원)")
+    parser.add_argument("--min-teams", type=int, help="잔여 팀이 이 수 이상이 되면")
+    parser.add_argument("--max-teams", type=int, help="잔여 팀이 이 수 이하가 되면")
+    parser.add_argument("--direction", choices=DIRECTIONS, help="팀 수가 줄거나(down) 늘 때마다(up)")
+    parser.add_argument("--label", help="알림에 붙일 이름")
+    args = parser.parse_args()
+
+    engine = RuleEngine()
+    if args.command == "add":
+        rule = Rule(args.course, args.region, args.date_from, args.date_to, args.start, args.end,
+                    args.max_price, args.min_teams, args.max_teams, args.direction, args.label)
+        print(f"규칙 {engine.add(rule)}번 추가: {rule}")
+    elif args.command == "remove":
+        rule = engine.remove(args.rule_id)
+        print(f"규칙 {args.rule_id}번 삭제" if rule else f"규칙 {args.rule_id}번이 없습니다")
+    else:
+        for rule in engine.rules():
+            print(rule)
+
+
+if __name__ == "__main__":
+    main()
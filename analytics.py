@@ -0,0 +1,446 @@
+"""수요 분석 뷰 (SQLite에 미리 집계해 두고 스냅샷마다 바뀐 골프장만 반영)
+
+- sales: (플레이 날짜, 골프장, 스크래핑 시각의 시간대)별 판매 팀 수(잔여 팀 감소, 당일 지난 티타임 제외)와 풀린 팀 수(증가)
+- sellout: 골프장/플레이 날짜별 처음 본 시각, 처음 잔여 팀, 처음 매진(0팀)된 시각과 걸린 시간
+- price: 플레이 날짜까지 남은 일수별 가격 변경 횟수/인상/인하/평균 변동폭, 골프장/날짜별 가격 변경 이력
+- heatmap: 지역 × 요일 × 티타임 시간대별 예약된 티타임 수 (목록에서 사라진 티타임, 이미 지난 시각 제외)
+
+원본 데이터 전체를 다시 읽지 않고 (날짜, 골프장)마다 직전 상태만 기억해 두었다가 값이
+바뀐 행만 집계 테이블에 더하므로, 이력이 쌓여도 갱신 비용은 사이클의 변경 수에만 비례하고
+조회는 작은 집계 테이블만 읽는다.
+
+    views = get_views()
+    views.update(rows)           # save_snapshot에서 사이클마다
+    views.sales(golf_course='테스트CC')
+
+    python analytics.py rebuild  # 관측 이력(history/)에서 처음부터 다시 만들기
+    python analytics.py show heatmap --region 경기
+"""
+import argparse
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+import config
+import history
+import records
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS course_state (
+    play_date TEXT NOT NULL,
+    golf_course TEXT NOT NULL,
+    region TEXT,
+    remaining_teams INTEGER,
+    price INTEGER,
+    play_time TEXT,                      -- JSON 분 배열
+    first_seen TEXT NOT NULL,            -- 처음 본 스크래핑 시각
+    first_teams INTEGER,
+    sold_out_at TEXT,                    -- 잔여 팀이 판매로 처음 0이 된 스크래핑 시각
+    PRIMARY KEY (play_date, golf_course)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sales_hourly (
+    play_date TEXT NOT NULL,
+    golf_course TEXT NOT NULL,
+    hour TEXT NOT NULL,                  -- 스크래핑 시각 'YYYY-MM-DD HH'
+    region TEXT,
+    sold INTEGER NOT NULL,
+    released INTEGER NOT NULL,
+    PRIMARY KEY (play_date, golf_course, hour)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS sales_hourly_hour ON sales_hourly (hour);
+CREATE TABLE IF NOT EXISTS price_history (
+    golf_course TEXT NOT NULL,
+    play_date TEXT NOT NULL,
+    changed_at TEXT NOT NULL,
+    days_before INTEGER NOT NULL,
+    price INTEGER,
+    PRIMARY KEY (golf_course, play_date, changed_at)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS price_trend (
+    golf_course TEXT NOT NULL,
+    days_before INTEGER NOT NULL,
+    region TEXT,
+    changes INTEGER NOT NULL,
+    increases INTEGER NOT NULL,
+    decreases INTEGER NOT NULL,
+    delta_sum INTEGER NOT NULL,          -- 변동폭 합계 (원)
+    PRIMARY KEY (golf_course, days_before)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS demand_heatmap (
+    region TEXT NOT NULL,
+    weekday INTEGER NOT NULL,            -- 월요일 0
+    hour INTEGER NOT NULL,               -- 티타임 시각의 시
+    booked INTEGER NOT NULL,
+    PRIMARY KEY (region, weekday, hour)
+) WITHOUT ROWID;
+"""
+
+TABLES = ("course_state", "sales_hourly", "price_history", "price_trend", "demand_heatmap")
+
+STATE_SQL = """
+INSERT OR REPLACE INTO course_state
+    (play_date, golf_course, region, remaining_teams, price, play_time, first_seen, first_teams, sold_out_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+SALES_SQL = """
+INSERT INTO sales_hourly (play_date, golf_course, hour, region, sold, released) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (play_date, golf_course, hour) DO UPDATE SET
+    sold = sold + excluded.sold, released = released + excluded.released, region = excluded.region
+"""
+
+PRICE_TREND_SQL = """
+INSERT INTO price_trend (golf_course, days_before, region, changes, increases, decreases, delta_sum)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (golf_course, days_before) DO UPDATE SET
+    changes = changes + excluded.changes, increases = increases + excluded.increases,
+    decreases = decreases + excluded.decreases, delta_sum = delta_sum + excluded.delta_sum,
+    region = excluded.region
+"""
+
+HEATMAP_SQL = """
+INSERT INTO demand_heatmap (region, weekday, hour, booked) VALUES (?, ?, ?, ?)
+ON CONFLICT (region, weekday, hour) DO UPDATE SET booked = booked + excluded.booked
+"""
+
+VIEWS = ("sales", "sellout", "price", "heatmap")
+MAX_LIMIT = 5000
+
+
+class CourseState:
+    """(날짜, 골프장) 하나의 직전 관측값"""
+
+    __slots__ = ("region", "teams", "price", "tee_times", "first_seen", "first_teams", "sold_out_at")
+
+    def __init__(self, region, teams, price, tee_times, first_seen, first_teams, sold_out_at=None):
+        self.region = region
+        self.teams = teams
+        self.price = price
+        self.tee_times = tee_times
+        self.first_seen = first_seen
+        self.first_teams = first_teams
+        self.sold_out_at = sold_out_at
+
+    def row(self, play_date, golf_course):
+        return (play_date, golf_course, self.region, self.teams, self.price, json.dumps(list(self.tee_times)),
+                self.first_seen, self.first_teams, self.sold_out_at)
+
+
+def _seconds_between(start, end):
+    return (datetime.strptime(end, "%Y-%m-%d %H:%M:%S") - datetime.strptime(start, "%Y-%m-%d %H:%M:%S")).total_seconds()
+
+
+def _prefix(region):
+    """지역 접두어 조건 ('경기' → '경기남부', '경기북부'도 포함)"""
+    return None if region is None else region.replace("%", "") + "%"
+
+
+def _add(totals, key, *values):
+    current = totals.get(key)
+    totals[key] = values if current is None else tuple(a + b for a, b in zip(current, values))
+
+
+class AnalyticsViews:
+    """분석 집계 테이블과 증분 갱신"""
+
+    def __init__(self, path=None):
+        self.path = path or config.ANALYTICS_PATH
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._state = {}      # play_date → {golf_course: CourseState}
+        self._weekdays = {}   # play_date → 요일
+
+    def _date_state(self, play_date):
+        """플레이 날짜의 직전 상태 (처음 보는 날짜면 테이블에서 한 번 불러옴)"""
+        state = self._state.get(play_date)
+        if state is None:
+            state = self._state[play_date] = {}
+            for golf_course, region, teams, price, play_time, first_seen, first_teams, sold_out_at in self._conn.execute(
+                "SELECT golf_course, region, remaining_teams, price, play_time, first_seen, first_teams, sold_out_at "
+                "FROM course_state WHERE play_date = ?", (play_date,)
+            ):
+                state[golf_course] = CourseState(region, teams, price, tuple(json.loads(play_time or "[]")),
+                                                 first_seen, first_teams, sold_out_at)
+            self._weekdays[play_date] = datetime.strptime(play_date, "%Y-%m-%d").weekday()
+        return state
+
+    def update(self, rows):
+        """한 사이클의 스크래핑 결과(레코드 목록)를 반영하고 바뀐 (날짜, 골프장) 수 반환"""
+        state_rows = []
+        sales = {}
+        price_history = []
+        price_trend = {}
+        heatmap = {}
+        with self._lock:
+            for record in rows:
+                play_date = str(record["play_date"])[:10]
+                golf_course = record["golf_course"]
+                teams = records.parse_count(record.get("remaining_teams"))
+                price = records.parse_count(record.get("price"))
+                tee_times = tuple(records.parse_minutes(record.get("play_time")))
+                states = self._date_state(play_date)
+                old = states.get(golf_course)
+                if old is not None and old.teams == teams and old.price == price and old.tee_times == tee_times:
+                    continue
+
+                scraping_date = str(record["scraping_date"])[:19]
+                region = records.region_of(records.parse_text(record.get("location")))
+                if old is None:
+                    # 처음 보는 골프장은 기준점만 기록
+                    new = CourseState(region, teams, price, tee_times, scraping_date, teams,
+                                      scraping_date if teams == 0 else None)
+                    price_history.append((golf_course, play_date, scraping_date,
+                                          self._days_before(play_date, scraping_date), price))
+                else:
+                    new = CourseState(region, teams, price, tee_times, old.first_seen, old.first_teams, old.sold_out_at)
+                    vanished = set(old.tee_times) - set(tee_times)
+                    # 당일에 이미 지난 티타임은 예약이 아니라 시간이 지나 빠진 것 (판매/매진/예약 집계에서 제외)
+                    expired = set()
+                    if vanished and play_date == scraping_date[:10]:
+                        now = int(scraping_date[11:13]) * 60 + int(scraping_date[14:16])
+                        expired = {minute for minute in vanished if minute <= now}
+                    if old.teams is not None and teams is not None and old.teams != teams:
+                        delta = teams - old.teams
+                        sold = max(-delta - len(expired), 0)
+                        if sold or delta > 0:
+                            _add(sales, (play_date, golf_course, scraping_date[:13], region), sold, max(delta, 0))
+                        if teams == 0 and sold and new.sold_out_at is None:
+                            new.sold_out_at = scraping_date
+                    if old.price != price:
+                        days_before = self._days_before(play_date, scraping_date)
+                        price_history.append((golf_course, play_date, scraping_date, days_before, price))
+                        if old.price is not None and price is not None:
+                            _add(price_trend, (golf_course, days_before, region),
+                                 1, int(price > old.price), int(price < old.price), price - old.price)
+                    booked = vanished - expired
+                    if booked and region:
+                        weekday = self._weekdays[play_date]
+                        for minute in booked:
+                            _add(heatmap, (region, weekday, minute // 60), 1)
+                states[golf_course] = new
+                state_rows.append(new.row(play_date, golf_course))
+
+            if state_rows:
+                with self._conn:
+                    self._conn.executemany(STATE_SQL, state_rows)
+                    self._conn.executemany(SALES_SQL, [key + values for key, values in sales.items()])
+                    self._conn.executemany("INSERT OR REPLACE INTO price_history VALUES (?, ?, ?, ?, ?)", price_history)
+                    self._conn.executemany(PRICE_TREND_SQL, [key + values for key, values in price_trend.items()])
+                    self._conn.executemany(HEATMAP_SQL, [key + values for key, values in heatmap.items()])
+        return len(state_rows)
+
+    @staticmethod
+    def _days_before(play_date, scraping_date):
+        return (datetime.strptime(play_date, "%Y-%m-%d") - datetime.strptime(scraping_date[:10], "%Y-%m-%d")).days
+
+    def forget_before(self, play_date):
+        """지난 플레이 날짜의 직전 상태를 메모리에서 제거 (집계 테이블은 유지)"""
+        with self._lock:
+            for old_date in [d for d in self._state if d < play_date]:
+                del self._state[old_date]
+                self._weekdays.pop(old_date, None)
+
+    # 조회 (별도 연결로 읽어서 갱신과 잠금을 나누지 않음)
+
+    def _query(self, sql, params=()):
+        reader = sqlite3.connect(self.path)
+        reader.row_factory = sqlite3.Row
+        try:
+            return [dict(row) for row in reader.execute(sql, params)]
+        finally:
+            reader.close()
+
+    @staticmethod
+    def _where(conditions, fixed=()):
+        """값이 None이 아닌 조건만 모아 WHERE 절과 파라미터 반환"""
+        clauses = list(fixed) + [clause for clause, value in conditions if value is not None]
+        params = [value for clause, value in conditions if value is not None]
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def sales(self, play_date=None, golf_course=None, region=None, since=None, group=None, limit=500):
+        """시간대별 판매/풀린 팀 수 (group='course'면 골프장/날짜별 합계, 'hour'면 시간대별 합계)"""
+        where, params = self._where([
+            ("play_date = ?", play_date), ("golf_course = ?", golf_course), ("region LIKE ?", _prefix(region)),
+            ("hour >= ?", since),
+        ])
+        if group == "course":
+            sql = (f"SELECT play_date, golf_course, region, SUM(sold) AS sold, SUM(released) AS released, "
+                   f"COUNT(*) AS hours FROM sales_hourly{where} GROUP BY play_date, golf_course "
+                   f"ORDER BY sold DESC LIMIT ?")
+        elif group == "hour":
+            sql = (f"SELECT hour, SUM(sold) AS sold, SUM(released) AS released FROM sales_hourly{where} "
+                   f"GROUP BY hour ORDER BY hour DESC LIMIT ?")
+        elif group is None:
+            sql = f"SELECT * FROM sales_hourly{where} ORDER BY hour DESC, sold DESC LIMIT ?"
+        else:
+            raise ValueError(f"알 수 없는 group: {group} (course 또는 hour)")
+        return self._query(sql, params + [limit])
+
+    def sellout(self, play_date=None, region=None, limit=500):
+        """매진된 골프장과 매진까지 걸린 시간 (최근 매진 순)
+
+        seconds_to_sellout은 처음 본 시각부터, hours_before_play는 매진 시각부터 플레이 날짜 0시까지.
+        """
+        where, params = self._where([("play_date = ?", play_date), ("region LIKE ?", _prefix(region))],
+                                    fixed=["sold_out_at IS NOT NULL"])
+        rows = self._query(
+            f"SELECT play_date, golf_course, region, first_seen, first_teams, sold_out_at FROM course_state{where} "
+            f"ORDER BY sold_out_at DESC LIMIT ?", params + [limit],
+        )
+        for row in rows:
+            row["seconds_to_sellout"] = _seconds_between(row["first_seen"], row["sold_out_at"])
+            row["hours_before_play"] = _seconds_between(row["sold_out_at"], row["play_date"] + " 00:00:00") / 3600
+        return rows
+
+    def price_trend(self, golf_course=None, region=None):
+        """남은 일수별 가격 변경 통계 (avg_change: 변경 한 번의 평균 변동폭)"""
+        where, params = self._where([("golf_course = ?", golf_course), ("region LIKE ?", _prefix(region))])
+        return self._query(
+            f"SELECT days_before, SUM(changes) AS changes, SUM(increases) AS increases, SUM(decreases) AS decreases, "
+            f"CAST(SUM(delta_sum) AS REAL) / SUM(changes) AS avg_change FROM price_trend{where} "
+            f"GROUP BY days_before ORDER BY days_before DESC", params,
+        )
+
+    def price_history(self, golf_course, play_date=None, limit=500):
+        """골프장의 가격 변경 이력 (플레이 날짜별 변경 시각 순)"""
+        where, params = self._where([("golf_course = ?", golf_course), ("play_date = ?", play_date)])
+        return self._query(f"SELECT * FROM price_history{where} ORDER BY play_date, changed_at LIMIT ?",
+                           params + [limit])
+
+    def heatmap(self, region=None):
+        """지역 × 요일 × 티타임 시간대별 예약된 티타임 수"""
+        where, params = self._where([("region LIKE ?", _prefix(region))])
+        return self._query(f"SELECT region, weekday, hour, booked FROM demand_heatmap{where} "
+                           f"ORDER BY region, weekday, hour", params)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def rebuild(path=None, history_root=None):
+    """관측 이력에서 모든 분석 뷰를 처음부터 다시 만듦
+
+    플레이 날짜 파티션을 하나씩 읽어 변경 행을 스크래핑 시각 순으로 다시 흘려보낸다 (이력은
+    값이 바뀐 행만 담고 있으므로 사이클마다 전체를 넣은 것과 결과가 같다). 임시 파일에 만든 뒤
+    한 트랜잭션으로 바꿔 넣으므로 실행 중인 데몬도 계속 갱신할 수 있다. 아직 이력 파일로 기록되지
+    않은 최근 사이클은 빠진다.
+    """
+    path = path or config.ANALYTICS_PATH
+    tmp_path = path + ".rebuild"
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(tmp_path + suffix):
+            os.remove(tmp_path + suffix)
+
+    views = AnalyticsViews(tmp_path)
+    observed = 0
+    try:
+        for play_date in history.play_dates(history_root):
+            frame = history.read_history(start=play_date, end=play_date, root=history_root)
+            frame = frame[frame["listed"].astype(bool)].sort_values("scraping_date", kind="stable")
+            frame["scraping_date"] = frame["scraping_date"].dt.strftime("%Y-%m-%d %H:%M:%S")
+            frame["location"] = frame["location"].astype(object)
+            frame["golf_course"] = frame["golf_course"].astype(object)
+            frame["play_time"] = [[] if minutes is None else minutes.tolist() for minutes in frame["play_time"]]
+            rows = frame.to_dict("records")
+            # 같은 사이클의 행끼리 묶어서 반영 (update 한 번 = 트랜잭션 한 번)
+            start = 0
+            for end in range(1, len(rows) + 1):
+                if end == len(rows) or rows[end]["scraping_date"] != rows[start]["scraping_date"]:
+                    views.update(rows[start:end])
+                    start = end
+            observed += len(rows)
+    finally:
+        views.close()
+
+    target = AnalyticsViews(path)
+    try:
+        with target._lock, target._conn:
+            target._conn.execute("ATTACH DATABASE ? AS rebuilt", (tmp_path,))
+            for table in TABLES:
+                target._conn.execute(f"DELETE FROM main.{table}")
+                target._conn.execute(f"INSERT INTO main.{table} SELECT * FROM rebuilt.{table}")
+        target._conn.execute("DETACH DATABASE rebuilt")
+    finally:
+        target.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(tmp_path + suffix):
+                os.remove(tmp_path + suffix)
+    return observed
+
+
+def flask_response(views, request, name):
+    """/api/analytics/<name> 응답 (sales, sellout, price, heatmap, 잘못된 파라미터는 400)"""
+    from flask import Response
+    from api_snapshot import dumps
+
+    args = request.args
+    try:
+        limit = min(MAX_LIMIT, max(1, int(args.get("limit", 500))))
+        if name == "sales":
+            result = views.sales(args.get("play_date"), args.get("golf_course"), args.get("region"),
+                                 args.get("since"), args.get("group"), limit)
+        elif name == "sellout":
+            result = views.sellout(args.get("play_date"), args.get("region"), limit)
+        elif name == "price":
+            result = {"trend": views.price_trend(args.get("golf_course"), args.get("region"))}
+            if args.get("golf_course"):
+                result["history"] = views.price_history(args["golf_course"], args.get("play_date"), limit)
+        elif name == "heatmap":
+            result = views.heatmap(args.get("region"))
+        else:
+            return Response(dumps({"error": f"알 수 없는 분석 뷰: {name} (가능한 값: {', '.join(VIEWS)})"}),
+                            status=404, mimetype="application/json")
+    except ValueError as e:
+        return Response(dumps({"error": str(e)}), status=400, mimetype="application/json")
+    return Response(dumps(result), mimetype="application/json")
+
+
+_views = None
+_views_lock = threading.Lock()
+
+
+def get_views():
+    """프로세스에서 공유하는 분석 뷰"""
+    global _views
+    with _views_lock:
+        if _views is None:
+            _views = AnalyticsViews()
+        return _views
+
+
+def main():
+    parser = argparse.ArgumentParser(description="수요 분석 뷰 관리")
+    parser.add_argument("command", choices=["rebuild", "show"])
+    parser.add_argument("view", nargs="?", choices=VIEWS, default="sales", help="show: 볼 뷰")
+    parser.add_argument("--course", help="골프장 이름")
+    parser.add_argument("--date", help="플레이 날짜 (YYYY-MM-DD)")
+    parser.add_argument("--region", help="지역 (예: 경기)")
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.command == "rebuild":
+        print(f"분석 뷰를 다시 만들었습니다: {config.ANALYTICS_PATH} (이력 {rebuild()}건)")
+        return
+
+    views = AnalyticsViews()
+    if args.view == "sales":
+        rows = views.sales(args.date, args.course, args.region, limit=args.limit)
+    elif args.view == "sellout":
+        rows = views.sellout(args.date, args.region, args.limit)
+    elif args.view == "price":
+        rows = views.price_trend(args.course, args.region)
+    else:
+        rows = views.heatmap(args.region)
+    for row in rows:
+        print(row)
+    views.close()
+
+
+if __name__ == "__main__":
+    main()
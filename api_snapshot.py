@@ -0,0 +1,224 @@
+"""/api/golf-data 응답용 사전 직렬화 스냅샷
+
+스크래핑 사이클마다 한 번만 JSON으로 직렬화하고 강한 ETag와 gzip(가능하면
+brotli) 압축본을 미리 만들어 둔다. 필터(play_date, location, 가격 범위, 최소 잔여
+팀)와 페이지 조회는 미리 만든 색인으로 처리하고, 같은 조건의 응답은 스냅샷이
+바뀔 때까지 캐시한다.
+
+값은 records 형태 그대로 내보낸다 (가격/잔여 팀은 정수, 평점은 실수, 없으면 null,
+play_time은 'HH:MM' 목록).
+"""
+import gzip
+import hashlib
+import threading
+from array import array
+from collections import OrderedDict
+
+import numpy as np
+
+import records as records_model
+
+try:
+    import orjson
+
+    def dumps(value):
+        return orjson.dumps(value)
+except ImportError:
+    import json
+
+    def dumps(value):
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+FILTER_PARAMS = ("play_date", "location", "min_price", "max_price", "min_teams", "page", "per_page")
+MAX_PER_PAGE = 500
+
+
+def _json_safe(record):
+    safe = {}
+    for key, value in record.items():
+        if isinstance(value, array):
+            safe[key] = records_model.format_minutes(value)
+        elif isinstance(value, (list, tuple)):
+            safe[key] = list(value)
+        elif value is None or isinstance(value, (str, int, float, bool)):
+            safe[key] = None if isinstance(value, float) and value != value else value
+        else:
+            safe[key] = str(value)
+    return safe
+
+
+class EncodedBody:
+    """직렬화된 본문과 압축본, ETag"""
+
+    __slots__ = ("raw", "gzip", "br", "etag")
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.gzip = gzip.compress(raw, compresslevel=6)
+        self.br = brotli.compress(raw, quality=5) if brotli is not None else None
+        self.etag = '"' + hashlib.sha1(raw).hexdigest() + '"'
+
+    def pick(self, accept_encoding):
+        """Accept-Encoding에 맞는 (본문, Content-Encoding) 선택"""
+        accept_encoding = accept_encoding or ""
+        if self.br is not None and "br" in accept_encoding:
+            return self.br, "br"
+        if "gzip" in accept_encoding:
+            return self.gzip, "gzip"
+        return self.raw, None
+
+
+class Snapshot:
+    """한 사이클의 레코드와 필터용 열 배열"""
+
+    def __init__(self, records, version, last_update=None, stale_dates=()):
+        frame = records if hasattr(records, 'columns') else records_model.to_frame(records)
+        self.records = [_json_safe(record) for record in records_model.to_records(frame)]
+        self.version = version
+        self.last_update = last_update
+        self.stale_dates = tuple(stale_dates)  # 새로 받지 못하고 이전 결과를 쓰는 날짜
+
+        # 필터는 열 배열에 대한 벡터 연산으로 처리 (결측 가격/팀은 NaN이라 비교에서 빠짐)
+        if len(frame):
+            self.play_dates = frame['play_date'].astype(str).str[:10].to_numpy()
+            locations = frame['location'].astype(object).where(frame['location'].notna(), None)
+            self.locations = locations.to_numpy()
+            # 지역 필터는 접두어로 맞추므로 ('경기' → '경기남부', '경기북부') 지역 종류별로 한 번만 비교
+            regions = locations.map(records_model.region_of).fillna("").to_numpy(dtype=str)
+            self.region_names, self.region_codes = np.unique(regions, return_inverse=True)
+            self.prices = frame['price'].astype('float64').to_numpy()
+            self.teams = frame['remaining_teams'].astype('float64').to_numpy()
+        else:
+            self.play_dates = self.locations = np.empty(0, dtype=object)
+            self.region_names, self.region_codes = np.empty(0, dtype=str), np.empty(0, dtype=np.intp)
+            self.prices = self.teams = np.empty(0)
+
+        self.full = EncodedBody(dumps(self.records))
+
+    def select(self, play_date=None, location=None, min_price=None, max_price=None, min_teams=None):
+        """조건에 맞는 행 번호 목록 (원래 순서 유지)"""
+        mask = np.ones(len(self.records), dtype=bool)
+        if play_date is not None:
+            mask &= self.play_dates == play_date
+        if location is not None:
+            region_mask = (np.char.startswith(self.region_names, location) & (self.region_names != ""))
+            mask &= (self.locations == location) | region_mask[self.region_codes]
+        if min_price is not None:
+            mask &= self.prices >= min_price
+        if max_price is not None:
+            mask &= self.prices <= max_price
+        if min_teams is not None:
+            mask &= self.teams >= min_teams
+        return np.flatnonzero(mask).tolist()
+
+
+class SnapshotCache:
+    """최신 스냅샷과 조건별 응답 캐시"""
+
+    def __init__(self, max_cached_queries=256):
+        self._lock = threading.Lock()
+        self._snapshot = Snapshot([], 0)
+        self._queries = OrderedDict()
+        self.max_cached_queries = max_cached_queries
+
+    @property
+    def snapshot(self):
+        return self._snapshot
+
+    def publish(self, records, last_update=None, stale_dates=()):
+        """새 스크래핑 결과로 스냅샷 교체 (직렬화/압축/색인은 여기서 한 번만)"""
+        snapshot = Snapshot(records, self._snapshot.version + 1, last_update, stale_dates)
+        with self._lock:
+            self._snapshot = snapshot
+            self._queries.clear()
+        return snapshot
+
+    def body_for(self, args):
+        """요청 파라미터에 맞는 (EncodedBody, 전체 개수, 페이지, 페이지 크기)
+
+        잘못된 파라미터는 ValueError.
+        """
+        snapshot = self._snapshot
+        params = {name: args.get(name) for name in FILTER_PARAMS if args.get(name) not in (None, "")}
+        if not params:
+            return snapshot.full, len(snapshot.records), None, None
+
+        key = (snapshot.version,) + tuple(sorted(params.items()))
+        with self._lock:
+            cached = self._queries.get(key)
+            if cached is not None:
+                self._queries.move_to_end(key)
+                return cached
+
+        filters = {
+            "play_date": params.get("play_date"),
+            "location": params.get("location"),
+        }
+        for name in ("min_price", "max_price", "min_teams"):
+            filters[name] = int(params[name]) if name in params else None
+        rows = snapshot.select(**filters)
+
+        page = per_page = None
+        if "page" in params or "per_page" in params:
+            page = max(1, int(params.get("page", 1)))
+            per_page = min(MAX_PER_PAGE, max(1, int(params.get("per_page", 100))))
+            rows_page = rows[(page - 1) * per_page:page * per_page]
+        else:
+            rows_page = rows
+
+        result = (EncodedBody(dumps([snapshot.records[row] for row in rows_page])), len(rows), page, per_page)
+        with self._lock:
+            if snapshot.version == self._snapshot.version:
+                self._queries[key] = result
+                while len(self._queries) > self.max_cached_queries:
+                    self._queries.popitem(last=False)
+        return result
+
+
+def etag_matches(if_none_match, etag):
+    """If-None-Match 헤더가 ETag와 일치하는지"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return etag in candidates or f"W/{etag}" in candidates
+
+
+def flask_response(cache, request):
+    """Flask 요청에 대한 응답 (304, 압축, 페이지 헤더 처리)"""
+    from flask import Response
+
+    try:
+        body, total, page, per_page = cache.body_for(request.args)
+    except ValueError:
+        return Response(b'{"error":"invalid filter parameter"}', status=400, mimetype="application/json")
+
+    headers = {
+        "ETag": body.etag,
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+        "X-Total-Count": str(total),
+    }
+    snapshot = cache.snapshot
+    if snapshot.last_update:
+        headers["X-Last-Update"] = snapshot.last_update
+    if snapshot.stale_dates:
+        # 시작할 때 불러온 이전 데이터 (새로 수집하면 빠짐)
+        headers["X-Stale-Dates"] = ",".join(snapshot.stale_dates)
+    if page is not None:
+        headers["X-Page"] = str(page)
+        headers["X-Per-Page"] = str(per_page)
+
+    if etag_matches(request.headers.get("If-None-Match"), body.etag):
+        return Response(status=304, headers=headers)
+
+    payload, encoding = body.pick(request.headers.get("Accept-Encoding"))
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(payload, status=200, headers=headers, mimetype="application/json")
@@ -1,44 +1,157 @@
-from flask import Flask, render_template, jsonify
-import pandas as pd
-from scraper import scrape_golf_data, update_excel_file
-import threading
-import time
-
-app = Flask(__name__)
-
-# 전역 변수로 최신 데이터 저장
-latest_data = None
-last_update = None
-
-def background_scraping():
-    global latest_data, last_update
-    while True:
-        try:
-            print("\n데이터 수집 시작")
-            df = scrape_golf_data()
-            if df is not None and not df.empty:
-                latest_data = df
-                last_update = time.strftime("%Y-%m-%d %H:%M:%S")
-                update_excel_file(df)
-            time.sleep(300)  # 5분 대기
-        except Exception as e:
-            print(f"스크래핑 오류: {str(e)}")
-            time.sleep(60)
-
-@app.route('/')
-def home():
-    return render_template('index.html', last_update=last_update)
-
-@app.route('/api/golf-data')
-def get_golf_data():
-    if latest_data is not None:
-        return jsonify(latest_data.to_dict('records'))
-    return jsonify([])
-
-if __name__ == '__main__':
-    # 스크래핑 스레드 시작
-    scraper_thread = threading.Thread(target=background_scraping, daemon=True)
-    scraper_thread.start()
-    
-    # Flask 앱 실행
-    app.run(host='0.0.0.0', port=5000) 
\ No newline at end of file
+from flask import Flask, render_template, request
+from scraper import scrape_golf_data, save_snapshot, change_bus, change_detector, target_dates
+from scheduler import RefreshScheduler, run_scheduler
+from api_snapshot import SnapshotCache, flask_response
+import analytics
+import change_feed
+import config
+import metrics
+import records
+import slot_index
+import snapshot_feed
+import threading
+import time
+
+app = Flask(__name__)
+
+# 전역 변수로 최신 데이터 저장
+latest_data = None
+last_update = None
+
+# /api/golf-data 응답 캐시 (사이클마다 한 번 직렬화/압축)
+snapshot_cache = SnapshotCache()
+
+# 변경 이벤트 스트림 (save_snapshot이 발행한 이벤트를 구독)
+feed = change_feed.ChangeFeed()
+change_bus.subscribe(feed.publish)
+
+# 티타임 슬롯 검색 색인 (갱신된 날짜의 파티션만 다시 만듦)
+slots = slot_index.SlotIndex()
+
+# 날짜별 최신 수집 결과 (스케줄러가 날짜마다 다른 주기로 갱신)
+latest_by_date = {}
+
+# 마지막 스냅샷에서 불러와 아직 새로 받지 못한 날짜 (응답 헤더 X-Stale-Dates로 표시)
+stale_dates = set()
+
+# 직접 수집(local) 모드에서도 다음 시작 때 바로 띄울 수 있도록 스냅샷을 남김
+snapshot_publisher = None
+
+def warm_start():
+    # 첫 수집을 기다리지 않고 마지막 스냅샷을 바로 제공 (새로 받을 때까지 stale)
+    global latest_data, last_update
+    snapshot = snapshot_feed.warm_start()
+    if snapshot is None:
+        return 0
+    frame, info = snapshot
+    dates = target_dates()
+    for play_date in dates:
+        rows = snapshot_feed.select_dates(frame, [play_date])
+        if len(rows):
+            latest_by_date[play_date] = rows
+            stale_dates.add(play_date)
+    latest_data = records.concat([latest_by_date[d] for d in dates if d in latest_by_date])
+    last_update = info['published_at']
+    snapshot_cache.publish(latest_data, last_update, sorted(stale_dates))
+    slots.update(latest_data, dates)
+    return info['version']
+
+def publish_date(play_date, df):
+    global latest_data, last_update
+    latest_by_date[play_date] = df
+    stale_dates.discard(play_date)
+    dates = target_dates()
+    for old_date in [d for d in latest_by_date if d not in dates]:
+        del latest_by_date[old_date]
+        stale_dates.discard(old_date)
+    latest_data = records.concat([latest_by_date[d] for d in dates if d in latest_by_date])
+    last_update = time.strftime("%Y-%m-%d %H:%M:%S")
+    with metrics.span("api_snapshot"):
+        snapshot_cache.publish(latest_data, last_update, sorted(stale_dates))
+    with metrics.span("slot_index"):
+        slots.update(df, dates)
+    save_snapshot(df)
+    if snapshot_publisher is not None:
+        snapshot_publisher.publish(latest_data, [play_date], stale_dates)
+
+def on_snapshot(frame, info):
+    # 데몬이 발행한 스냅샷 반영 (수집/저장은 데몬이 하고 여기서는 읽기만)
+    global latest_data, last_update
+    latest_data = frame
+    last_update = info['published_at']
+    stale_dates.clear()
+    stale_dates.update(info['stale'])
+    with metrics.span("api_snapshot"):
+        snapshot_cache.publish(frame, last_update, info['stale'])
+    changed = snapshot_feed.select_dates(frame, info['updated'])
+    with metrics.span("slot_index"):
+        slots.update(changed, info['dates'])
+    # /api/changes용 변경 이벤트는 갱신된 날짜만 비교해서 만듦
+    with metrics.span("diff"):
+        change_detector.update(records.to_records(changed))
+
+def background_scraping():
+    # 고정 300초 대기 대신 날짜별 적응형 주기 (실패 시 백오프는 스케줄러가 처리)
+    refresh = RefreshScheduler()
+    change_bus.subscribe(refresh.observe_events)
+    while True:
+        try:
+            print("\n데이터 수집 시작")
+            # 재시도는 스케줄러 백오프에 맡김 (retries=0, 요청 예산 밖에서 다시 받지 않도록)
+            run_scheduler(lambda d: scrape_golf_data(workers=1, dates=[d], retries=0), publish_date, target_dates,
+                          scheduler=refresh)
+        except Exception as e:
+            print(f"스크래핑 오류: {str(e)}")
+            time.sleep(60)
+
+@app.route('/')
+def home():
+    return render_template('index.html', last_update=last_update)
+
+@app.route('/api/golf-data')
+def get_golf_data():
+    # 필터: play_date, location(지역 또는 전체 위치), min_price, max_price, min_teams, page, per_page
+    return flask_response(snapshot_cache, request)
+
+@app.route('/api/slots')
+def get_slots():
+    # 예: /api/slots?weekday=sat&start=06:00&end=08:00&region=경기&max_price=150000
+    return slot_index.flask_response(slots, request)
+
+@app.route('/api/changes')
+def get_changes():
+    # 변경분만 스트리밍: format=sse(기본)|ndjson, since=마지막으로 받은 seq (SSE는 Last-Event-ID)
+    return change_feed.flask_response(feed, request)
+
+@app.route('/api/analytics/<name>')
+def get_analytics(name):
+    # 미리 집계된 분석 뷰: sales(시간대별 판매), sellout(매진 시간), price(남은 일수별 가격 변경), heatmap(지역 수요)
+    return analytics.flask_response(analytics.get_views(), request, name)
+
+@app.route('/metrics')
+def get_metrics():
+    # 단계별 소요 시간 히스토그램과 카운터 (Prometheus 수집용)
+    return metrics.flask_response(request)
+
+@app.route('/debug/profile', methods=['GET', 'POST'])
+def profile():
+    # POST action=start|stop|reset 으로 샘플링 프로파일러 토글, GET은 접힌 스택 (flamegraph 입력)
+    # 외부에 열린 포트라서 기본은 로컬 요청만 허용 (TEETIME_PROFILE_REMOTE=1이면 모두)
+    return metrics.profiler_response(request, allow_remote=config.PROFILE_REMOTE)
+
+if __name__ == '__main__':
+    if config.PROFILE_ON_START:
+        metrics.profiler.start(config.PROFILE_INTERVAL)
+
+    version = warm_start()
+    if config.SNAPSHOT_SOURCE == 'daemon':
+        # scrape_daemon.py가 발행하는 스냅샷 구독 (브라우저를 따로 띄우지 않음)
+        snapshot_feed.SnapshotSubscriber(on_snapshot, version=version).start()
+    else:
+        snapshot_publisher = snapshot_feed.SnapshotPublisher()
+        # 스크래핑 스레드 시작
+        scraper_thread = threading.Thread(target=background_scraping, daemon=True)
+        scraper_thread.start()
+    
+    # Flask 앱 실행
+    app.run(host='0.0.0.0', port=5000, threaded=True)
@@ -0,0 +1,137 @@
+"""목록 파서 마이크로 벤치마크
+
+저장된 목록 HTML(없으면 합성 페이지)을 백엔드별로 반복 파싱해서 초당 골프장 수를
+측정한다. 모든 백엔드 결과를 기존 BeautifulSoup 방식 결과와 비교하므로 사이트
+마크업이 바뀌어 필드가 비거나 달라지면 바로 드러난다.
+
+    python benchmarks/bench_parser.py fixtures/pages/*.html
+    python benchmarks/bench_parser.py --courses 2000 --json result.json
+    python benchmarks/bench_parser.py --baseline result.json   # 20% 이상 느려지면 실패
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import listing_parser  # noqa: E402
+from synthetic import synthetic_listing  # noqa: E402
+
+
+def legacy_parse(html, play_date, scraping_date):
+    """기존 스크래퍼의 파싱 방식 (필드마다 find를 두 번 호출)"""
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, 'html.parser')
+    data_list = []
+    for div in soup.find_all('div', class_='golf-inner-info'):
+        time_spans = div.find_all('span', class_='time')
+        play_times = [span.text.strip() for span in time_spans] if time_spans else []
+        data_list.append({
+            'scraping_date': scraping_date,
+            'play_date': play_date,
+            'golf_course': div.find('strong').text.strip() if div.find('strong') else '정보없음',
+            'location': div.find('p', class_='location').text.strip() if div.find('p', class_='location') else '정보없음',
+            'price': div.find('span', class_='price').text.strip() if div.find('span', class_='price') else '정보없음',
+            'rating': div.find('a', class_='star-score').text.strip() if div.find('a', class_='star-score') else '정보없음',
+            'remaining_teams': div.find('button', class_='btn').text.strip() if div.find('button', class_='btn') else '정보없음',
+            'play_time': play_times
+        })
+    return data_list
+
+
+def load_pages(paths, courses):
+    if paths:
+        pages = []
+        for path in paths:
+            with open(path, encoding='utf-8') as f:
+                pages.append((os.path.basename(path), f.read()))
+        return pages
+    return [(f"synthetic-{courses}", synthetic_listing(courses))]
+
+
+def bench(parse, pages, repeat):
+    """가장 빠른 반복 기준 초당 골프장 수"""
+    best = None
+    parsed = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        parsed = sum(len(parse(html, '2024-01-01', '2024-01-01 00:00:00')) for _, html in pages)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return parsed, best
+
+
+def missing_ratio(records):
+    """'정보없음' 필드 비율 (마크업 변경 감지용)"""
+    fields = [name for name, _, _ in listing_parser.FIELDS]
+    total = len(records) * len(fields)
+    if not total:
+        return 1.0
+    return sum(record[name] == listing_parser.MISSING for record in records for name in fields) / total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="목록 파서 벤치마크")
+    parser.add_argument("pages", nargs="*", help="저장된 목록 HTML 파일")
+    parser.add_argument("--courses", type=int, default=1000, help="합성 페이지의 골프장 수")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    parser.add_argument("--baseline", help="이전 JSON 결과와 비교 (20%% 이상 느려지면 실패)")
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages, args.courses)
+    reference = [legacy_parse(html, '2024-01-01', '2024-01-01 00:00:00') for _, html in pages]
+
+    results = {}
+    failed = False
+
+    parsed, seconds = bench(legacy_parse, pages, args.repeat)
+    results['legacy'] = {'courses': parsed, 'seconds': seconds, 'courses_per_sec': parsed / seconds}
+
+    for backend in listing_parser.available_backends():
+        def parse(html, play_date, scraping_date, backend=backend):
+            return listing_parser.parse_listing(html, play_date, scraping_date, backend=backend)
+
+        output = [parse(html, '2024-01-01', '2024-01-01 00:00:00') for _, html in pages]
+        matches = output == reference
+        parsed, seconds = bench(parse, pages, args.repeat)
+        results[backend] = {
+            'courses': parsed,
+            'seconds': seconds,
+            'courses_per_sec': parsed / seconds,
+            'matches_legacy': matches,
+            'missing_ratio': missing_ratio([record for records in output for record in records]),
+        }
+        if not matches:
+            print(f"[경고] {backend} 결과가 기존 파서와 다릅니다")
+            failed = True
+
+    legacy_rate = results['legacy']['courses_per_sec']
+    for name, result in results.items():
+        speedup = result['courses_per_sec'] / legacy_rate
+        print(f"{name:>10}: {result['courses']}개, {result['seconds'] * 1000:.1f}ms, "
+              f"{result['courses_per_sec']:,.0f}개/초 (x{speedup:.1f})")
+        if result.get('missing_ratio', 0) > 0.5:
+            print(f"[경고] {name}: 필드의 {result['missing_ratio']:.0%}가 비어 있습니다. 마크업 변경을 확인하세요")
+            failed = True
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        for name, result in results.items():
+            previous = baseline.get(name)
+            if previous and result['courses_per_sec'] < previous['courses_per_sec'] * 0.8:
+                print(f"[회귀] {name}: {previous['courses_per_sec']:,.0f} → {result['courses_per_sec']:,.0f}개/초")
+                failed = True
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+"""전체 파이프라인 오프라인 벤치마크
+
+녹화 페이지(record_pages.py) 또는 합성 페이지를 stub_site.py로 제공하고, 실제 사이트에
+접속하지 않고 수집 → (스크롤) → 파싱 → 데이터프레임 → 저장(저장소/이력/비교) →
+GUI 카드 갱신 → Flask 직렬화까지 단계별 시간을 잰다. 규모마다 별도 프로세스에서
+실행해서 최대 RSS를 따로 측정하고, 결과는 커밋끼리 비교할 수 있도록 JSON으로 남긴다.
+
+    python benchmarks/bench_pipeline.py                          # 합성 100/1,000/10,000개
+    python benchmarks/bench_pipeline.py --scales 1000 --json result.json
+    python benchmarks/bench_pipeline.py --pages fixtures/pages  # 녹화 페이지
+    python benchmarks/bench_pipeline.py --fetcher selenium       # 브라우저 + 무한 스크롤 재현
+    python benchmarks/bench_pipeline.py --baseline result.json  # 20% 이상 느려지면 실패
+
+GUI 단계는 화면 없이 카드 목록 조정(VirtualCardList.set_rows)만 측정한다.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_SCALES = [100, 1000, 10000]
+UI_SCRIPT = "teescaner_scraping_ui_mo(20241206) - 버그 수정 완료.py"
+
+
+def peak_rss_mb():
+    """현재 프로세스의 최대 RSS(MB)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 if sys.platform != "darwin" else peak / (1024 * 1024)
+
+
+class Stages:
+    """단계별 소요 시간 기록"""
+
+    def __init__(self):
+        self.seconds = {}
+
+    def run(self, name, func, *args, **kwargs):
+        started = time.perf_counter()
+        result = func(*args, **kwargs)
+        self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - started
+        return result
+
+
+def _load_card_list():
+    """데스크톱 UI의 VirtualCardList (customtkinter가 없으면 None)"""
+    try:
+        spec = importlib.util.spec_from_file_location("teetime_ui", os.path.join(ROOT, UI_SCRIPT))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module.VirtualCardList
+    except Exception as e:
+        print(f"GUI 단계 생략: {str(e)}", file=sys.stderr)
+        return None
+
+
+def _mutate(frame, every=20):
+    """다음 사이클 흉내: every개마다 한 골프장의 잔여 팀을 하나 줄임"""
+    frame = frame.copy()
+    teams = frame["remaining_teams"]
+    frame["remaining_teams"] = teams.where(frame.index % every != 0, (teams - 1).clip(lower=0))
+    frame["scraping_date"] = "2024-01-01 00:05:00"
+    return frame.astype({"scraping_date": "category"})
+
+
+def run_scale(courses, pages_dir, fetcher_name, cycles=2):
+    """한 규모의 파이프라인을 실행하고 결과 딕셔너리 반환 (자식 프로세스에서 호출)"""
+    import config
+    import fetchers
+    import history
+    import records
+    import slot_index
+    import store
+    import stub_site
+    from api_snapshot import SnapshotCache
+    from diff_engine import DiffEngine
+    from listing_parser import parse_listing
+    from synthetic import write_site
+
+    work = tempfile.mkdtemp(prefix="teetime-bench-")
+    dates = [f"2024-01-{day:02d}" for day in range(1, config.DAYS_AHEAD + 1)]
+    if pages_dir is None:
+        pages_dir = os.path.join(work, "pages")
+        write_site(pages_dir, dates, courses)
+    else:
+        dates = sorted(name for name in os.listdir(pages_dir) if os.path.isdir(os.path.join(pages_dir, name)))
+
+    server, base_url = stub_site.serve(pages_dir, infinite_scroll=fetcher_name == "selenium")
+    stages = Stages()
+    card_list_class = _load_card_list()
+    card_list = SimpleNamespace(keys=[], rows={}, bound={}, pool=[],
+                                _update_scrollregion=lambda: None, _render=lambda force=False: None)
+    tee_store = store.TeeTimeStore(os.path.join(work, "bench.db"))
+    writer = history.HistoryWriter(os.path.join(work, "history"), flush_cycles=cycles)
+    diff = DiffEngine()
+    cache = SnapshotCache()
+    slots = slot_index.SlotIndex()
+    scroll_seconds = None
+
+    if fetcher_name == "selenium":
+        from browser import BrowserSession
+        session = BrowserSession()
+        fetcher = fetchers.SeleniumFetcher(session=session, base_url=base_url)
+    else:
+        session = None
+        fetcher = fetchers.HttpFetcher(base_url=base_url, max_pages=10_000)
+
+    try:
+        htmls = stages.run("fetch", fetcher.fetch_many, dates)
+        if fetcher_name == "selenium":
+            scroll_seconds = sum(stats.seconds for stats in fetcher.scroll_stats.values())
+        parsed = stages.run("parse", lambda: [
+            record for play_date in dates for record in parse_listing(htmls[play_date], play_date, "2024-01-01 00:00:00")
+        ])
+        frame = stages.run("frame", lambda: records.to_frame(records.normalize(parsed)))
+
+        frames = [frame] + [_mutate(frame) for _ in range(cycles - 1)]
+        for cycle_frame in frames:
+            rows = stages.run("to_records", records.to_records, cycle_frame)
+            stages.run("store", tee_store.upsert, rows)
+            stages.run("history", writer.append, rows)
+            stages.run("diff", diff.update, rows)
+            if card_list_class is not None:
+                stages.run("gui_cards", card_list_class.set_rows, card_list, rows)
+            stages.run("api_snapshot", cache.publish, cycle_frame)
+            stages.run("slot_index", slots.update, cycle_frame)
+        stages.run("history_flush", writer.flush)
+    finally:
+        fetcher.close()
+        if session is not None:
+            session.close()
+        server.shutdown()
+        tee_store.close()
+        shutil.rmtree(work, ignore_errors=True)
+
+    total_courses = len(parsed)
+    pipeline_seconds = sum(stages.seconds.values())
+    return {
+        "courses_per_date": courses,
+        "dates": len(dates),
+        "courses": total_courses,
+        "cycles": cycles,
+        "fetcher": fetcher_name,
+        "stages": stages.seconds,
+        "scroll_seconds": scroll_seconds,
+        "seconds": pipeline_seconds,
+        "courses_per_sec": total_courses / pipeline_seconds if pipeline_seconds else None,
+        "peak_rss_mb": peak_rss_mb(),
+        "snapshot_bytes": len(cache.snapshot.full.raw),
+        "snapshot_gzip_bytes": len(cache.snapshot.full.gzip),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="전체 파이프라인 오프라인 벤치마크")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES, help="날짜당 합성 골프장 수")
+    parser.add_argument("--pages", help="녹화 페이지 디렉터리 (주면 합성 페이지 대신 사용)")
+    parser.add_argument("--fetcher", choices=["http", "selenium"], default="http")
+    parser.add_argument("--cycles", type=int, default=2, help="저장 단계 반복 사이클 수 (2번째부터 일부 변경)")
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    parser.add_argument("--baseline", help="이전 JSON 결과와 비교 (20%% 이상 느려지면 실패)")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        result = run_scale(args.child, args.pages, args.fetcher, args.cycles)
+        print("\n" + json.dumps(result))
+        return 0
+
+    scales = [0] if args.pages else args.scales
+    results = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scales": {},
+    }
+    for courses in scales:
+        # 규모마다 새 프로세스에서 실행해야 최대 RSS가 섞이지 않음
+        command = [sys.executable, os.path.abspath(__file__), "--child", str(courses),
+                   "--fetcher", args.fetcher, "--cycles", str(args.cycles)]
+        if args.pages:
+            command += ["--pages", args.pages]
+        output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        key = "recorded" if args.pages else str(courses)
+        results["scales"][key] = result
+
+        stage_text = ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in result["stages"].items())
+        print(f"{key:>8}: {result['courses']}개, {result['seconds']:.2f}초, {result['courses_per_sec']:,.0f}개/초, "
+              f"최대 RSS {result['peak_rss_mb']:.0f}MB")
+        print(f"          {stage_text}")
+
+    failed = False
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        for key, result in results["scales"].items():
+            previous = baseline.get("scales", {}).get(key)
+            if previous and result["seconds"] > previous["seconds"] * 1.2:
+                print(f"[회귀] {key}: {previous['seconds']:.2f}초 → {result['seconds']:.2f}초")
+                failed = True
+            for name, seconds in result["stages"].items():
+                old = (previous or {}).get("stages", {}).get(name)
+                if old and seconds > old * 1.2 and seconds - old > 0.01:
+                    print(f"[회귀] {key} {name}: {old * 1000:.0f}ms → {seconds * 1000:.0f}ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""실제 사이트의 목록 페이지를 무한 스크롤 단위로 녹화
+
+날짜마다 첫 화면과 스크롤 한 번마다 새로 붙은 골프장 블록을
+{out}/{날짜}/page-N.html로 저장한다. stub_site.py가 이 구조를 그대로 제공하므로
+녹화 후에는 사이트에 접속하지 않고 bench_pipeline.py로 전체 과정을 재현할 수 있다.
+
+    python benchmarks/record_pages.py fixtures/pages
+    python benchmarks/record_pages.py fixtures/pages --days 3
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config  # noqa: E402
+from browser import BrowserSession  # noqa: E402
+from listing_parser import ITEM_CLASS  # noqa: E402
+from scraper import target_dates  # noqa: E402
+from scroll import INSTALL_HOOKS_JS, SCROLL_AND_WAIT_JS  # noqa: E402
+
+# index 번째 이후 골프장 블록의 outerHTML 목록
+ITEMS_FROM_JS = """
+var items = document.getElementsByClassName(arguments[0]);
+var html = [];
+for (var i = arguments[1]; i < items.length; i++) html.push(items[i].outerHTML);
+return html;
+"""
+
+PAGE_TEMPLATE = "<html><head><title>티스캐너</title></head><body><div class=\"golf-list\">\n{body}\n</div></body></html>"
+
+
+def write_page(out_dir, round_day, page, blocks):
+    os.makedirs(os.path.join(out_dir, round_day), exist_ok=True)
+    path = os.path.join(out_dir, round_day, f"page-{page}.html")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(PAGE_TEMPLATE.format(body="\n".join(blocks)))
+    return path
+
+
+def record_date(session, out_dir, round_day, timeout_ms=4000, quiet_ms=300, max_rounds=200):
+    """날짜 하나를 녹화하고 페이지별 골프장 수 목록 반환"""
+    driver = session.load(config.listing_url(round_day))
+    driver.set_script_timeout(timeout_ms / 1000 + 5)
+    deadline = time.monotonic() + 10
+    count = driver.execute_script(INSTALL_HOOKS_JS, ITEM_CLASS)
+    while not count and time.monotonic() < deadline:
+        time.sleep(0.2)
+        count = driver.execute_script(INSTALL_HOOKS_JS, ITEM_CLASS)
+
+    pages = []
+    blocks = driver.execute_script(ITEMS_FROM_JS, ITEM_CLASS, 0)
+    write_page(out_dir, round_day, 1, blocks)
+    pages.append(len(blocks))
+    count = len(blocks)
+
+    for _ in range(max_rounds):
+        result = driver.execute_async_script(SCROLL_AND_WAIT_JS, ITEM_CLASS, count, timeout_ms, quiet_ms)
+        if not result["grew"]:
+            break
+        blocks = driver.execute_script(ITEMS_FROM_JS, ITEM_CLASS, count)
+        write_page(out_dir, round_day, len(pages) + 1, blocks)
+        pages.append(len(blocks))
+        count = result["count"]
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="목록 페이지 녹화 (무한 스크롤 단위)")
+    parser.add_argument("out", help="녹화 페이지를 저장할 디렉터리")
+    parser.add_argument("--days", type=int, default=config.DAYS_AHEAD)
+    args = parser.parse_args()
+
+    session = BrowserSession()
+    manifest = {"base_url": config.BASE_URL, "recorded_at": time.strftime("%Y-%m-%d %H:%M:%S"), "dates": {}}
+    try:
+        for round_day in target_dates(args.days):
+            pages = record_date(session, args.out, round_day)
+            manifest["dates"][round_day] = pages
+            print(f"{round_day}: {len(pages)}페이지, 골프장 {sum(pages)}개")
+    finally:
+        session.close()
+
+    with open(os.path.join(args.out, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""벤치마크용 합성 목록 페이지 생성기
+
+실제 티스캐너 목록과 같은 마크업 구조(golf-inner-info 블록)로 원하는 수의
+골프장을 만든다. 녹화된 페이지가 없을 때 기본 입력으로 쓴다.
+"""
+import random
+
+REGIONS = ['경기', '강원', '충북', '충남', '경북', '경남', '전북', '전남', '제주']
+
+COURSE_TEMPLATE = """<div class="golf-inner-info">
+  <div class="title"><strong>{name}</strong><a class="star-score" href="#">{rating}</a></div>
+  <p class="location">{location}</p>
+  <div class="price-box"><span class="label">그린피</span><span class="price">{price:,}원</span></div>
+  <div class="times">{times}</div>
+  <button class="btn btn-primary" type="button">{teams}팀</button>
+</div>"""
+
+
+def synthetic_course(index, rng):
+    """골프장 블록 하나의 HTML"""
+    slots = sorted(rng.sample(range(5 * 60, 16 * 60, 7), rng.randint(1, 12)))
+    times = "".join(f'<span class="time">{minute // 60:02d}:{minute % 60:02d}</span>' for minute in slots)
+    region = REGIONS[index % len(REGIONS)]
+    return COURSE_TEMPLATE.format(
+        name=f"테스트CC {index:05d}",
+        rating=f"{rng.uniform(3, 5):.1f}",
+        location=f"{region} 테스트시 {index % 37}동",
+        price=rng.randrange(50_000, 300_000, 5_000),
+        times=times,
+        teams=len(slots),
+    )
+
+
+def synthetic_listing(courses, seed=0):
+    """골프장 courses개가 담긴 목록 페이지 HTML"""
+    rng = random.Random(seed)
+    body = "\n".join(synthetic_course(index, rng) for index in range(courses))
+    return f"<html><head><title>티스캐너</title></head><body><div class=\"golf-list\">\n{body}\n</div></body></html>"
+
+
+def write_site(root, dates, courses, per_page=None, seed=0):
+    """stub_site.py 구조로 합성 녹화 페이지 기록
+
+    날짜마다 골프장 courses개를 per_page개씩 {root}/{날짜}/page-N.html로 나눈다
+    (무한 스크롤 한 번에 붙는 단위). 기록한 페이지 수를 반환한다.
+    """
+    import os
+
+    per_page = per_page or max(20, -(-courses // 40))
+    written = 0
+    for offset, play_date in enumerate(dates):
+        rng = random.Random(seed * 1000 + offset)
+        blocks = [synthetic_course(index, rng) for index in range(courses)]
+        os.makedirs(os.path.join(root, play_date), exist_ok=True)
+        for page, start in enumerate(range(0, courses, per_page), start=1):
+            body = "\n".join(blocks[start:start + per_page])
+            html = f"<html><head><title>티스캐너</title></head><body><div class=\"golf-list\">\n{body}\n</div></body></html>"
+            with open(os.path.join(root, play_date, f"page-{page}.html"), "w", encoding="utf-8") as f:
+                f.write(html)
+            written += 1
+    return written
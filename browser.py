@@ -0,0 +1,324 @@
+import argparse
+import json
+import os
+import threading
+import time
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+
+import config
+import metrics
+
+try:
+    import psutil
+except ImportError:  # psutil이 없으면 메모리 기준 재시작은 건너뜀
+    psutil = None
+
+_driver_path_lock = threading.Lock()
+
+
+def resolve_driver_path(cache_file=None):
+    """크롬드라이버 경로를 한 번만 찾아 디스크에 캐시
+
+    캐시된 경로가 아직 존재하면 네트워크 없이 바로 반환하므로 오프라인에서도
+    브라우저를 띄울 수 있다.
+    """
+    cache_file = cache_file or config.DRIVER_CACHE_FILE
+    with _driver_path_lock:
+        override = os.environ.get("TEETIME_CHROMEDRIVER")
+        if override:
+            return override
+
+        try:
+            with open(cache_file, encoding="utf-8") as f:
+                cached = json.load(f).get("path")
+            if cached and os.path.exists(cached):
+                return cached
+        except (OSError, ValueError):
+            pass
+
+        from webdriver_manager.chrome import ChromeDriverManager
+        path = ChromeDriverManager().install()
+
+        os.makedirs(os.path.dirname(cache_file) or ".", exist_ok=True)
+        tmp_file = cache_file + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump({"path": path}, f)
+        os.replace(tmp_file, cache_file)
+        return path
+
+
+# 파싱에 쓰지 않는 리소스 (lean 모드에서 DevTools로 요청 자체를 막음)
+DEFAULT_BLOCK_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.bmp",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*facebook.net*", "*facebook.com/tr*",
+    "*analytics.naver.com*", "*wcs.naver.net*", "*kakao.com/*pixel*", "*hotjar.com*",
+]
+CSS_BLOCK_PATTERNS = ["*.css", "*.css?*"]
+
+# 필요 없는 백그라운드 기능
+LEAN_ARGUMENTS = [
+    "--blink-settings=imagesEnabled=false",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-translate",
+    "--disable-features=Translate,MediaRouter,OptimizationHints,AutofillServerCommunication",
+    "--metrics-recording-only",
+    "--mute-audio",
+    "--no-first-run",
+    "--no-default-browser-check",
+]
+
+
+def block_patterns():
+    """lean 모드에서 차단할 URL 패턴 목록"""
+    patterns = list(config.BROWSER_BLOCK_PATTERNS or DEFAULT_BLOCK_PATTERNS)
+    if config.BROWSER_BLOCK_CSS:
+        patterns += CSS_BLOCK_PATTERNS
+    return patterns
+
+
+def chrome_options(lean=None):
+    """헤드리스 크롬 옵션
+
+    lean이면 eager 로딩(DOMContentLoaded까지만 기다림)과 이미지/백그라운드 기능 끄기,
+    요청 통계용 performance 로그를 켠다.
+    """
+    lean = config.BROWSER_LEAN if lean is None else lean
+    options = Options()
+    options.add_argument("--headless")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    if lean:
+        options.page_load_strategy = "eager"
+        for argument in LEAN_ARGUMENTS:
+            options.add_argument(argument)
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        })
+    # 요청 통계용 (네트워크 이벤트만)
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+    return options
+
+
+def create_driver(lean=None):
+    """헤드리스 크롬 드라이버 생성 (lean이면 DevTools로 차단 패턴 적용)"""
+    lean = config.BROWSER_LEAN if lean is None else lean
+    driver = webdriver.Chrome(
+        service=Service(resolve_driver_path()),
+        options=chrome_options(lean)
+    )
+    driver.execute_cdp_cmd("Network.enable", {})
+    if lean:
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": block_patterns()})
+    return driver
+
+
+class NetworkStats:
+    """페이지 하나를 여는 동안의 요청 수, 받은 바이트, 차단한 요청 수"""
+
+    __slots__ = ("requests", "bytes", "blocked", "blocked_types")
+
+    def __init__(self):
+        self.requests = 0
+        self.bytes = 0
+        self.blocked = 0
+        self.blocked_types = {}
+
+    def as_dict(self):
+        return {"requests": self.requests, "bytes": self.bytes, "blocked": self.blocked,
+                "blocked_types": dict(self.blocked_types)}
+
+    def __repr__(self):
+        return f"NetworkStats(요청 {self.requests}개, {self.bytes / 1024:.0f}KB, 차단 {self.blocked}개)"
+
+
+def network_stats(driver):
+    """performance 로그를 비우면서 그동안의 네트워크 통계를 집계"""
+    stats = NetworkStats()
+    types = {}
+    try:
+        entries = driver.get_log("performance")
+    except Exception:
+        return stats
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+        method = message.get("method")
+        params = message.get("params", {})
+        if method == "Network.requestWillBeSent":
+            stats.requests += 1
+            types[params.get("requestId")] = params.get("type", "Other")
+        elif method == "Network.loadingFinished":
+            stats.bytes += int(params.get("encodedDataLength") or 0)
+        elif method == "Network.loadingFailed" and params.get("blockedReason"):
+            stats.blocked += 1
+            resource_type = params.get("type") or types.get(params.get("requestId"), "Other")
+            stats.blocked_types[resource_type] = stats.blocked_types.get(resource_type, 0) + 1
+    return stats
+
+
+class BrowserSession:
+    """사이클 사이에 유지되는 웜 브라우저 세션
+
+    get_driver()는 재사용 전에 브라우저 상태를 확인하고, 방문한 페이지 수나
+    브라우저 프로세스 전체의 RSS가 한도를 넘으면 브라우저를 새로 띄운다.
+    """
+
+    def __init__(self, max_pages=None, max_rss_mb=None, lean=None):
+        self.max_pages = config.BROWSER_MAX_PAGES if max_pages is None else max_pages
+        self.max_rss_mb = config.BROWSER_MAX_RSS_MB if max_rss_mb is None else max_rss_mb
+        self.lean = config.BROWSER_LEAN if lean is None else lean
+        self.driver = None
+        self.page_count = 0
+        self.restarts = 0
+
+    def get_driver(self):
+        """건강한 드라이버 반환 (필요하면 재시작)"""
+        if self.driver is not None:
+            reason = self._recycle_reason()
+            if reason:
+                print(f"브라우저 재시작: {reason}")
+                self.close()
+                self.restarts += 1
+                metrics.counter("teetime_browser_restarts_total", "브라우저 재시작 수").inc()
+
+        if self.driver is None:
+            with metrics.span("driver_start"):
+                self.driver = create_driver(self.lean)
+            self.page_count = 0
+        return self.driver
+
+    def load(self, url):
+        """URL 로드 후 페이지 수 집계"""
+        driver = self.get_driver()
+        with metrics.span("page_load"):
+            driver.get(url)
+        self.page_count += 1
+        return driver
+
+    def network_stats(self):
+        """직전 network_stats() 호출 이후의 네트워크 통계 (계측 카운터에도 반영)"""
+        stats = network_stats(self.driver)
+        metrics.counter("teetime_browser_requests_total", "브라우저가 보낸 요청 수").inc(stats.requests)
+        metrics.counter("teetime_browser_bytes_total", "브라우저가 받은 바이트 수").inc(stats.bytes)
+        for resource_type, count in stats.blocked_types.items():
+            metrics.counter("teetime_browser_blocked_total", "lean 모드에서 차단한 요청 수", type=resource_type).inc(count)
+        return stats
+
+    def is_healthy(self):
+        """브라우저가 응답하는지 확인"""
+        try:
+            self.driver.execute_script("return 1")
+            return len(self.driver.window_handles) > 0
+        except Exception:
+            return False
+
+    def rss_mb(self):
+        """크롬드라이버와 하위 브라우저 프로세스의 RSS 합계(MB)"""
+        if psutil is None or self.driver is None:
+            return None
+        try:
+            root = psutil.Process(self.driver.service.process.pid)
+            processes = [root] + root.children(recursive=True)
+        except (AttributeError, psutil.Error):
+            return None
+
+        total = 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                pass
+        return total / (1024 * 1024)
+
+    def _recycle_reason(self):
+        if not self.is_healthy():
+            return "응답 없음"
+        if self.max_pages and self.page_count >= self.max_pages:
+            return f"페이지 수 {self.page_count}개 초과"
+        rss = self.rss_mb()
+        if rss is not None and self.max_rss_mb and rss > self.max_rss_mb:
+            return f"메모리 {rss:.0f}MB 초과"
+        return None
+
+    def close(self):
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            self.driver = None
+
+
+_local = threading.local()
+_sessions = []
+_sessions_lock = threading.Lock()
+
+
+def local_session():
+    """현재 스레드(프로세스 워커라면 프로세스)에 묶인 웜 세션"""
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = BrowserSession()
+        _local.session = session
+        with _sessions_lock:
+            _sessions.append(session)
+    return session
+
+
+def close_all_sessions():
+    """이 프로세스에서 만든 모든 세션 종료"""
+    with _sessions_lock:
+        sessions = list(_sessions)
+        _sessions.clear()
+    for session in sessions:
+        session.close()
+
+
+def compare(round_day, base_url=None):
+    """같은 날짜 페이지를 기본 프로필과 lean 프로필로 한 번씩 열어 절약량 비교"""
+    from fetchers import SeleniumFetcher
+
+    results = {}
+    for lean in (False, True):
+        session = BrowserSession(lean=lean)
+        fetcher = SeleniumFetcher(session=session, base_url=base_url)
+        try:
+            started = time.perf_counter()
+            html = fetcher.fetch(round_day)
+            results[lean] = (fetcher.network_stats[round_day], time.perf_counter() - started, len(html))
+        finally:
+            session.close()
+
+    (full, full_seconds, full_size), (lean, lean_seconds, lean_size) = results[False], results[True]
+    print(f"기본: {full}, {full_seconds:.1f}초, HTML {full_size:,}자")
+    print(f"lean: {lean}, {lean_seconds:.1f}초, HTML {lean_size:,}자")
+    print(f"페이지당 절약: 요청 {full.requests - lean.requests}개, {(full.bytes - lean.bytes) / 1024:.0f}KB, "
+          f"{full_seconds - lean_seconds:.1f}초 (차단 유형: {lean.blocked_types})")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="헤드리스 브라우저 도구")
+    parser.add_argument("command", choices=["compare"])
+    parser.add_argument("--date", help="비교할 플레이 날짜 (YYYY-MM-DD, 기본 오늘)")
+    parser.add_argument("--base-url", help="사이트 주소 (기본 TEETIME_BASE_URL)")
+    args = parser.parse_args()
+
+    compare(args.date or time.strftime("%Y-%m-%d"), args.base_url)
+
+
+if __name__ == "__main__":
+    main()
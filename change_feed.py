@@ -0,0 +1,170 @@
+"""스트리밍 변경 피드 (/api/changes)
+
+DiffEngine이 발행한 변경 이벤트에 순번(seq)을 붙여 한 번만 직렬화하고, 연결된
+클라이언트마다 크기가 정해진 버퍼로 밀어 넣는다. 클라이언트는 SSE(text/event-stream)
+또는 NDJSON으로 받으며, 마지막으로 받은 순번(since 또는 Last-Event-ID)부터 이어 받을
+수 있다. 보관 범위를 벗어났거나 버퍼가 넘친 클라이언트에는 reset 이벤트를 보내고,
+클라이언트는 /api/golf-data를 다시 받은 뒤 reset의 seq부터 이어 받으면 된다.
+"""
+import threading
+import time
+from collections import deque
+
+import config
+from api_snapshot import dumps
+
+
+def event_payload(seq, event):
+    """변경 이벤트(namedtuple) → 전송용 딕셔너리"""
+    payload = {"seq": seq, "type": type(event).__name__}
+    payload.update(event._asdict())
+    return payload
+
+
+class FeedClient:
+    """클라이언트 한 명의 미전송 이벤트 버퍼 (가득 차면 reset으로 전환)"""
+
+    def __init__(self, feed, buffer_size):
+        self.feed = feed
+        self.buffer_size = buffer_size
+        self._pending = deque()
+        self._cond = threading.Condition()
+        self._reset = False
+        self.closed = False
+
+    def push(self, entries):
+        with self._cond:
+            if self._reset:
+                return
+            self._pending.extend(entries)
+            if len(self._pending) > self.buffer_size:
+                # 느린 클라이언트 때문에 메모리가 늘지 않도록 버리고 reset 예약
+                self._pending.clear()
+                self._reset = True
+            self._cond.notify()
+
+    def request_reset(self):
+        with self._cond:
+            self._pending.clear()
+            self._reset = True
+            self._cond.notify()
+
+    def next_batch(self, timeout):
+        """새 이벤트를 기다렸다가 (reset 여부, [(seq, 종류, 본문)]) 반환 (timeout이면 빈 목록)"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._pending or self._reset or self.closed, timeout)
+            reset, self._reset = self._reset, False
+            entries = list(self._pending)
+            self._pending.clear()
+            return reset, entries
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify()
+        self.feed.unsubscribe(self)
+
+
+class ChangeFeed:
+    """순번이 붙은 변경 이벤트 로그와 구독 클라이언트 관리"""
+
+    def __init__(self, history_size=None, client_buffer=None):
+        self.history_size = config.FEED_HISTORY_SIZE if history_size is None else history_size
+        self.client_buffer = config.FEED_CLIENT_BUFFER if client_buffer is None else client_buffer
+        self._lock = threading.Lock()
+        self._history = deque(maxlen=self.history_size)  # (seq, 이벤트 종류, 직렬화된 JSON)
+        self._seq = 0
+        self._clients = set()
+
+    @property
+    def last_seq(self):
+        return self._seq
+
+    def publish(self, events):
+        """변경 이벤트 목록을 로그에 추가하고 모든 클라이언트에 전달 (ChangeBus 콜백)"""
+        with self._lock:
+            entries = []
+            for event in events:
+                self._seq += 1
+                entries.append((self._seq, type(event).__name__, dumps(event_payload(self._seq, event))))
+            self._history.extend(entries)
+            clients = list(self._clients)
+        for client in clients:
+            client.push(entries)
+
+    def subscribe(self, since=None):
+        """클라이언트 등록. since 이후의 보관된 이벤트를 먼저 채워 둔다."""
+        client = FeedClient(self, self.client_buffer)
+        with self._lock:
+            if since is not None and since != self._seq:
+                oldest = self._history[0][0] if self._history else self._seq + 1
+                # 서버 재시작 등으로 순번이 앞서 있거나 보관 범위를 벗어나면 처음부터 다시 받도록
+                if since > self._seq or since + 1 < oldest:
+                    client.request_reset()
+                else:
+                    client.push([entry for entry in self._history if entry[0] > since])
+            self._clients.add(client)
+        return client
+
+    def unsubscribe(self, client):
+        with self._lock:
+            self._clients.discard(client)
+
+    @property
+    def client_count(self):
+        return len(self._clients)
+
+
+def _format_sse(seq, event_type, body):
+    return b"id: %d\nevent: %s\ndata: %s\n\n" % (seq, event_type.encode(), body)
+
+
+def stream(feed, since=None, fmt="sse", heartbeat=None, max_seconds=None):
+    """클라이언트 하나에 보낼 바이트 청크 생성기
+
+    reset 이벤트의 seq는 그 시점의 마지막 순번이다. 하트비트는 SSE 주석 또는
+    NDJSON heartbeat 줄로 보낸다.
+    """
+    heartbeat = config.FEED_HEARTBEAT if heartbeat is None else heartbeat
+    client = feed.subscribe(since)
+    deadline = None if max_seconds is None else time.monotonic() + max_seconds
+    try:
+        while not client.closed:
+            timeout = heartbeat if deadline is None else min(heartbeat, deadline - time.monotonic())
+            if timeout <= 0:
+                return
+            reset, entries = client.next_batch(timeout)
+            chunks = []
+            if reset:
+                body = dumps({"seq": feed.last_seq, "type": "reset"})
+                chunks.append(_format_sse(feed.last_seq, "reset", body) if fmt == "sse" else body + b"\n")
+            for seq, event_type, body in entries:
+                if fmt == "sse":
+                    chunks.append(_format_sse(seq, event_type, body))
+                else:
+                    chunks.append(body + b"\n")
+            if not chunks:
+                chunks.append(b": keepalive\n\n" if fmt == "sse" else b'{"type":"heartbeat"}\n')
+            yield b"".join(chunks)
+    finally:
+        client.close()
+
+
+def flask_response(feed, request):
+    """Flask 요청에 대한 스트리밍 응답 (format=sse|ndjson, since 또는 Last-Event-ID)"""
+    from flask import Response
+
+    fmt = request.args.get("format")
+    if fmt is None:
+        fmt = "ndjson" if "application/x-ndjson" in request.headers.get("Accept", "") else "sse"
+    since = request.args.get("since") or request.headers.get("Last-Event-ID")
+    try:
+        since = int(since) if since not in (None, "") else None
+    except ValueError:
+        return Response(b'{"error":"invalid since"}', status=400, mimetype="application/json")
+    if fmt not in ("sse", "ndjson"):
+        return Response(b'{"error":"invalid format"}', status=400, mimetype="application/json")
+
+    mimetype = "text/event-stream" if fmt == "sse" else "application/x-ndjson"
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "X-Last-Seq": str(feed.last_seq)}
+    return Response(stream(feed, since, fmt), mimetype=mimetype, headers=headers)
@@ -0,0 +1,109 @@
+import os
+
+# 스크래핑 설정 (환경 변수로 덮어쓸 수 있음)
+BASE_URL = os.environ.get("TEETIME_BASE_URL", "https://www.teescanner.com")
+LISTING_PATH = "/booking/list?tab=golfcourse&roundDay={round_day}"
+DAYS_AHEAD = int(os.environ.get("TEETIME_DAYS_AHEAD", "8"))  # 오늘 포함 8일
+
+# 동시 스크래핑 설정
+SCRAPE_WORKERS = int(os.environ.get("TEETIME_WORKERS", "4"))
+SCRAPE_POOL_MODE = os.environ.get("TEETIME_POOL_MODE", "thread")  # thread 또는 process
+WORKER_MIN_INTERVAL = float(os.environ.get("TEETIME_WORKER_MIN_INTERVAL", "1.0"))  # 워커별 요청 간 최소 간격(초)
+SCRAPE_DATE_RETRIES = int(os.environ.get("TEETIME_DATE_RETRIES", "2"))  # 사이클 안에서 실패한 날짜만 다시 수집할 횟수
+SCRAPE_RETRY_BACKOFF = float(os.environ.get("TEETIME_RETRY_BACKOFF", "2"))  # 첫 재시도 대기(초), 매번 두 배
+SCRAPE_RETRY_BACKOFF_MAX = float(os.environ.get("TEETIME_RETRY_BACKOFF_MAX", "30"))
+
+# 브라우저 세션 설정
+DRIVER_CACHE_FILE = os.environ.get(
+    "TEETIME_DRIVER_CACHE", os.path.join(os.path.expanduser("~"), ".teetime", "chromedriver.json")
+)
+BROWSER_MAX_PAGES = int(os.environ.get("TEETIME_BROWSER_MAX_PAGES", "200"))  # 이 페이지 수를 넘으면 브라우저 재시작
+BROWSER_MAX_RSS_MB = float(os.environ.get("TEETIME_BROWSER_MAX_RSS_MB", "1024"))  # 브라우저 전체 메모리 한도(MB)
+BROWSER_LEAN = os.environ.get("TEETIME_BROWSER_LEAN", "1") == "1"  # 이미지/폰트/광고 차단, eager 로딩
+# 차단할 URL 패턴 (쉼표 구분, '*' 와일드카드). 비우면 기본 목록 (이미지, 폰트, 미디어, 분석/광고)
+BROWSER_BLOCK_PATTERNS = [p.strip() for p in os.environ.get("TEETIME_BROWSER_BLOCK", "").split(",") if p.strip()]
+BROWSER_BLOCK_CSS = os.environ.get("TEETIME_BROWSER_BLOCK_CSS", "0") == "1"  # 스타일시트도 차단 (레이아웃이 바뀔 수 있음)
+
+# 수집 방식 설정: selenium(브라우저) 또는 http(브라우저 없이 직접 요청)
+FETCHER = os.environ.get("TEETIME_FETCHER", "selenium")
+HTTP_PAGE_PARAM = os.environ.get("TEETIME_HTTP_PAGE_PARAM", "page")
+HTTP_MAX_PAGES = int(os.environ.get("TEETIME_HTTP_MAX_PAGES", "50"))
+HTTP_CONCURRENCY = int(os.environ.get("TEETIME_HTTP_CONCURRENCY", "4"))  # 동시 연결 수
+HTTP_TIMEOUT = float(os.environ.get("TEETIME_HTTP_TIMEOUT", "10"))
+
+# 무한 스크롤 설정 (초 단위, quiet는 ms)
+SCROLL_ROUND_TIMEOUT = float(os.environ.get("TEETIME_SCROLL_ROUND_TIMEOUT", "1.5"))  # 첫 라운드 대기 한도
+SCROLL_MIN_TIMEOUT = float(os.environ.get("TEETIME_SCROLL_MIN_TIMEOUT", "0.3"))
+SCROLL_MAX_TIMEOUT = float(os.environ.get("TEETIME_SCROLL_MAX_TIMEOUT", "4"))
+SCROLL_QUIET_MS = int(os.environ.get("TEETIME_SCROLL_QUIET_MS", "150"))  # DOM 변경이 멈춘 것으로 보는 시간
+SCROLL_MAX_SECONDS = float(os.environ.get("TEETIME_SCROLL_MAX_SECONDS", "60"))  # 날짜별 스크롤 전체 상한
+SCROLL_MAX_ROUNDS = int(os.environ.get("TEETIME_SCROLL_MAX_ROUNDS", "200"))
+
+# 저장소 설정
+STORE_PATH = os.environ.get("TEETIME_STORE", "golf_tee_times.db")
+EXCEL_PATH = os.environ.get("TEETIME_EXCEL", "golf_tee_times.xlsx")
+
+# 관측 이력 설정
+HISTORY_DIR = os.environ.get("TEETIME_HISTORY_DIR", "history")
+HISTORY_FLUSH_CYCLES = int(os.environ.get("TEETIME_HISTORY_FLUSH_CYCLES", "12"))  # 몇 사이클마다 파일로 기록할지
+
+# 수집 데몬과 공유 스냅샷 설정 (scrape_daemon.py)
+SNAPSHOT_PATH = os.environ.get("TEETIME_SNAPSHOT", "snapshot.arrow")
+SNAPSHOT_SOURCE = os.environ.get("TEETIME_SNAPSHOT_SOURCE", "daemon")  # daemon(데몬 구독) 또는 local(직접 수집)
+SNAPSHOT_POLL_INTERVAL = float(os.environ.get("TEETIME_SNAPSHOT_POLL_INTERVAL", "0.5"))  # 구독자가 파일을 확인하는 간격(초)
+
+# 알람 규칙 (alarm_rules.py)
+ALARM_RULES_PATH = os.environ.get("TEETIME_ALARM_RULES", "alarm_rules.json")
+
+# 여러 프로세스/호스트로 나눠 수집하는 작업 큐 (work_queue.py)
+QUEUE_PATH = os.environ.get("TEETIME_QUEUE", "")  # 지정하면 데몬이 직접 수집하지 않고 작업 큐에 넣음
+# 날짜마다 수집할 목록 파라미터 변형 (쉼표 구분, 빈 값은 기본 목록). 예: ",sort=price,region=gyeonggi"
+QUEUE_LISTING_PARAMS = [p.strip() for p in os.environ.get("TEETIME_QUEUE_PARAMS", "").split(",")]
+QUEUE_LEASE_SECONDS = float(os.environ.get("TEETIME_QUEUE_LEASE", "120"))  # 하트비트가 끊기면 이 시간 뒤에 다시 큐로
+QUEUE_MAX_ATTEMPTS = int(os.environ.get("TEETIME_QUEUE_MAX_ATTEMPTS", "3"))  # 작업 하나의 최대 시도 횟수
+QUEUE_POLL_INTERVAL = float(os.environ.get("TEETIME_QUEUE_POLL", "0.5"))  # 빈 큐/결과 확인 간격(초)
+QUEUE_WAIT_TIMEOUT = float(os.environ.get("TEETIME_QUEUE_WAIT", "600"))  # 날짜 하나의 모든 작업을 기다리는 한도(초)
+# 여러 호스트가 네트워크 디렉터리의 큐 파일을 함께 쓸 때는 DELETE (WAL은 같은 호스트에서만 동작)
+QUEUE_JOURNAL_MODE = os.environ.get("TEETIME_QUEUE_JOURNAL", "WAL")
+
+# 수요 분석 뷰 (analytics.py)
+ANALYTICS_PATH = os.environ.get("TEETIME_ANALYTICS", "analytics.db")
+
+# 알림 발송 설정 (notifier.py)
+NOTIFY_SINKS = [s.strip() for s in os.environ.get("TEETIME_NOTIFY_SINKS", "desktop").split(",") if s.strip()]
+NOTIFY_WEBHOOK_URL = os.environ.get("TEETIME_NOTIFY_WEBHOOK", "")
+NOTIFY_FILE = os.environ.get("TEETIME_NOTIFY_FILE", "notifications.jsonl")
+NOTIFY_WINDOW = float(os.environ.get("TEETIME_NOTIFY_WINDOW", "10"))  # 같은 골프장/날짜 알림을 묶는 시간(초)
+NOTIFY_QUEUE_SIZE = int(os.environ.get("TEETIME_NOTIFY_QUEUE", "1000"))  # 입력 큐와 싱크별 큐 크기
+NOTIFY_RATE_PER_MINUTE = float(os.environ.get("TEETIME_NOTIFY_RATE", "30"))  # 싱크별 분당 발송 수 (0이면 제한 없음)
+NOTIFY_BURST = int(os.environ.get("TEETIME_NOTIFY_BURST", "10"))
+NOTIFY_RETRIES = int(os.environ.get("TEETIME_NOTIFY_RETRIES", "3"))
+NOTIFY_TIMEOUT = float(os.environ.get("TEETIME_NOTIFY_TIMEOUT", "10"))  # 발송 한 번의 제한 시간(초)
+NOTIFY_BACKOFF = float(os.environ.get("TEETIME_NOTIFY_BACKOFF", "1"))  # 첫 재시도 대기(초), 매번 두 배
+NOTIFY_BACKOFF_MAX = float(os.environ.get("TEETIME_NOTIFY_BACKOFF_MAX", "60"))
+
+# 변경 피드 설정 (/api/changes)
+FEED_HISTORY_SIZE = int(os.environ.get("TEETIME_FEED_HISTORY", "20000"))  # 재개용으로 보관할 최근 이벤트 수
+FEED_CLIENT_BUFFER = int(os.environ.get("TEETIME_FEED_CLIENT_BUFFER", "2000"))  # 클라이언트별 미전송 이벤트 한도
+FEED_HEARTBEAT = float(os.environ.get("TEETIME_FEED_HEARTBEAT", "15"))  # 연결 유지용 하트비트 간격(초)
+
+# 계측 (/metrics)과 샘플링 프로파일러
+PROFILE_ON_START = os.environ.get("TEETIME_PROFILE", "0") == "1"  # 시작하자마자 프로파일러 켜기
+PROFILE_INTERVAL = float(os.environ.get("TEETIME_PROFILE_INTERVAL", "0.01"))  # 스택 샘플링 간격(초)
+PROFILE_REMOTE = os.environ.get("TEETIME_PROFILE_REMOTE", "0") == "1"  # /debug/profile을 다른 호스트에도 열기
+
+# 갱신 스케줄러 설정 (초 단위)
+REFRESH_MIN_INTERVAL = float(os.environ.get("TEETIME_REFRESH_MIN_INTERVAL", "60"))  # 변경이 잦아도 이보다 자주 받지 않음
+REFRESH_NEAR_INTERVAL = float(os.environ.get("TEETIME_REFRESH_NEAR_INTERVAL", "120"))  # 오늘 날짜의 주기 상한
+REFRESH_FAR_INTERVAL = float(os.environ.get("TEETIME_REFRESH_FAR_INTERVAL", "1800"))  # 마지막 날짜의 주기 상한
+REFRESH_TARGET_CHANGES = float(os.environ.get("TEETIME_REFRESH_TARGET_CHANGES", "5"))  # 한 번 갱신에 잡을 변경 수
+REFRESH_BUDGET_PER_MINUTE = float(os.environ.get("TEETIME_REFRESH_BUDGET", "1.6"))  # 분당 페이지 요청 예산 (기존 300초마다 8페이지)
+REFRESH_BURST = int(os.environ.get("TEETIME_REFRESH_BURST", str(DAYS_AHEAD)))  # 예산을 몰아 쓸 수 있는 최대 페이지 수
+REFRESH_BACKOFF_BASE = float(os.environ.get("TEETIME_REFRESH_BACKOFF_BASE", "60"))  # 실패 후 첫 재시도 대기
+REFRESH_BACKOFF_MAX = float(os.environ.get("TEETIME_REFRESH_BACKOFF_MAX", "900"))
+
+
+def listing_url(round_day, base_url=None, params=None):
+    """날짜별 골프장 목록 URL 생성 (params는 덧붙일 목록 파라미터, 예: 'sort=price')"""
+    url = (base_url or BASE_URL) + LISTING_PATH.format(round_day=round_day)
+    return url + "&" + params if params else url
@@ -0,0 +1,142 @@
+"""스냅샷 비교 엔진
+
+스냅샷을 (골프장, 플레이 날짜) → (잔여 팀, 가격, 티타임 집합)으로 색인해 직전
+스냅샷과 한 번씩만 비교(O(n))하고, 변경 사항을 이벤트로 발행한다. UI 없이 동작하며
+GUI, Flask 앱, 알람은 ChangeBus를 구독해서 이벤트를 받는다.
+"""
+import threading
+from collections import namedtuple
+
+from records import parse_count, parse_minutes
+
+# 변경 이벤트 (previous/current가 None이면 정보 없음, tee_time은 자정 기준 분)
+CourseListed = namedtuple('CourseListed', 'golf_course play_date remaining_teams price')
+CourseDelisted = namedtuple('CourseDelisted', 'golf_course play_date')
+TeeTimeAdded = namedtuple('TeeTimeAdded', 'golf_course play_date tee_time')
+TeeTimeRemoved = namedtuple('TeeTimeRemoved', 'golf_course play_date tee_time')
+TeamsChanged = namedtuple('TeamsChanged', 'golf_course play_date previous current')
+PriceChanged = namedtuple('PriceChanged', 'golf_course play_date previous current')
+
+EVENT_TYPES = (CourseListed, CourseDelisted, TeeTimeAdded, TeeTimeRemoved, TeamsChanged, PriceChanged)
+
+
+def _rows(records):
+    """레코드 목록 또는 데이터프레임 → (play_date, golf_course, 잔여 팀, 가격, play_time) 행"""
+    if hasattr(records, 'columns'):
+        # 데이터프레임은 행마다 딕셔너리를 만들지 않고 열 단위로 꺼냄
+        columns = [records[name] for name in ('remaining_teams', 'price')]
+        teams, prices = [column.astype(object).where(column.notna(), None).tolist() for column in columns]
+        return zip(records['play_date'].tolist(), records['golf_course'].tolist(), teams, prices,
+                   records['play_time'].tolist())
+    return (
+        (record['play_date'], record['golf_course'], record.get('remaining_teams'), record.get('price'),
+         record.get('play_time'))
+        for record in records
+    )
+
+
+def index_snapshot(records):
+    """레코드 목록(또는 records.to_frame 데이터프레임)을
+    {play_date: {golf_course: (잔여 팀, 가격, 티타임 frozenset)}}로 색인"""
+    index = {}
+    date_keys = {}
+    for play_date, golf_course, teams, price, play_times in _rows(records):
+        bucket = date_keys.get(play_date)
+        if bucket is None:
+            bucket = date_keys[play_date] = index.setdefault(str(play_date)[:10], {})
+        bucket[golf_course] = (parse_count(teams), parse_count(price), frozenset(parse_minutes(play_times)))
+    return index
+
+
+def diff_date(play_date, previous, current):
+    """한 플레이 날짜의 두 색인을 비교해 이벤트 목록 반환"""
+    events = []
+    for course, (teams, price, times) in current.items():
+        old = previous.get(course)
+        if old is None:
+            events.append(CourseListed(course, play_date, teams, price))
+            events.extend(TeeTimeAdded(course, play_date, tee_time) for tee_time in sorted(times))
+            continue
+
+        old_teams, old_price, old_times = old
+        if old_teams != teams:
+            events.append(TeamsChanged(course, play_date, old_teams, teams))
+        if old_price != price:
+            events.append(PriceChanged(course, play_date, old_price, price))
+        if old_times != times:
+            events.extend(TeeTimeRemoved(course, play_date, tee_time) for tee_time in sorted(old_times - times))
+            events.extend(TeeTimeAdded(course, play_date, tee_time) for tee_time in sorted(times - old_times))
+
+    for course in previous.keys() - current.keys():
+        events.append(CourseDelisted(course, play_date))
+    return events
+
+
+class ChangeBus:
+    """변경 이벤트 발행/구독"""
+
+    def __init__(self):
+        self._subscribers = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback, event_types=None):
+        """callback(events)를 등록하고 구독 해제 함수 반환
+
+        event_types를 주면 해당 종류의 이벤트만 걸러서 전달한다.
+        """
+        entry = (callback, tuple(event_types) if event_types else None)
+        with self._lock:
+            self._subscribers.append(entry)
+
+        def unsubscribe():
+            with self._lock:
+                if entry in self._subscribers:
+                    self._subscribers.remove(entry)
+        return unsubscribe
+
+    def publish(self, events):
+        if not events:
+            return
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback, event_types in subscribers:
+            selected = events if event_types is None else [e for e in events if isinstance(e, event_types)]
+            if not selected:
+                continue
+            try:
+                callback(selected)
+            except Exception as e:
+                print(f"변경 이벤트 처리 중 오류 발생: {str(e)}")
+
+
+class DiffEngine:
+    """직전 스냅샷을 기억하고 새 스냅샷과의 차이를 이벤트로 발행
+
+    스냅샷에 들어 있는 플레이 날짜만 비교하므로 하루치만 스크래핑하는
+    UI에서도 그대로 쓸 수 있다. 처음 보는 날짜는 기준점으로만 기록하고
+    이벤트를 만들지 않는다.
+    """
+
+    def __init__(self, bus=None):
+        self.bus = bus or ChangeBus()
+        self._index = {}
+        self._lock = threading.Lock()
+
+    def update(self, records):
+        """새 스냅샷을 반영하고 발생한 이벤트 목록 반환"""
+        snapshot = index_snapshot(records)
+        events = []
+        with self._lock:
+            for play_date, current in snapshot.items():
+                previous = self._index.get(play_date)
+                if previous is not None:
+                    events.extend(diff_date(play_date, previous, current))
+                self._index[play_date] = current
+        self.bus.publish(events)
+        return events
+
+    def forget_before(self, play_date):
+        """지난 플레이 날짜의 색인 제거"""
+        with self._lock:
+            for old_date in [d for d in self._index if d < play_date]:
+                del self._index[old_date]
@@ -0,0 +1,203 @@
+import asyncio
+import re
+import threading
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+import browser
+import config
+import metrics
+from scroll import AdaptiveScroller
+
+ITEM_PATTERN = re.compile(r'class="[^"]*\bgolf-inner-info\b')
+
+
+class Fetcher:
+    """날짜별 골프장 목록 HTML을 가져오는 인터페이스
+
+    fetch()는 해당 날짜의 모든 골프장이 포함된 HTML을 반환한다. 파서와 저장
+    코드는 어떤 구현이 쓰였는지 알 필요가 없다.
+    """
+
+    name = None
+
+    def fetch(self, round_day, params=None):
+        """params: 목록 URL에 덧붙일 파라미터 (정렬/지역 등, 없으면 기본 목록)"""
+        raise NotImplementedError
+
+    def fetch_many(self, round_days, return_exceptions=False):
+        """여러 날짜를 가져와 {날짜: HTML} 반환 (기본 구현은 순차 처리)
+
+        return_exceptions면 실패한 날짜는 HTML 대신 예외 객체를 담고 나머지는 계속 받는다.
+        """
+        htmls = {}
+        for round_day in round_days:
+            try:
+                htmls[round_day] = self.fetch(round_day)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                htmls[round_day] = e
+        return htmls
+
+    def close(self):
+        pass
+
+
+class SeleniumFetcher(Fetcher):
+    """헤드리스 크롬으로 페이지를 열고 무한 스크롤을 끝까지 내린 뒤 HTML 반환"""
+
+    name = "selenium"
+
+    def __init__(self, session=None, base_url=None, scroller=None):
+        self.session = session
+        self.base_url = base_url
+        self.scroller = scroller or AdaptiveScroller()
+        self.scroll_stats = {}  # 날짜별 마지막 스크롤 결과
+        self.network_stats = {}  # 날짜별 마지막 네트워크 통계 (요청 수, 바이트, 차단 수)
+
+    def fetch(self, round_day, params=None):
+        session = self.session or browser.local_session()
+        url = config.listing_url(round_day, self.base_url, params)
+
+        print(f"스크래핑 시작: {url}")
+        driver = session.load(url)
+
+        with metrics.span("wait"):
+            WebDriverWait(driver, 10).until(
+                EC.presence_of_element_located((By.CLASS_NAME, 'golf-inner-info'))
+            )
+
+        # 무한 스크롤 (실제 로딩 신호 기반)
+        with metrics.span("scroll"):
+            stats = self.scroller.scroll(driver, round_day)
+        self.scroll_stats[round_day] = stats
+        metrics.histogram("teetime_scroll_rounds", "날짜별 스크롤 라운드 수", buckets=metrics.COUNT_BUCKETS).observe(stats.rounds)
+        print(f"스크롤 완료: {stats}")
+
+        with metrics.span("page_source"):
+            html = driver.page_source
+        metrics.counter("teetime_fetch_chars_total", "받은 HTML 크기(문자 수)", fetcher=self.name).inc(len(html))
+
+        network = session.network_stats()
+        self.network_stats[round_day] = network
+        print(f"네트워크: {network}")
+        return html
+
+
+class HttpFetcher(Fetcher):
+    """브라우저 없이 페이지 단위 목록을 HTTP로 직접 받아오는 구현
+
+    aiohttp 세션 하나를 백그라운드 이벤트 루프에서 계속 유지하므로 연결이
+    keep-alive로 재사용된다. page 파라미터를 1부터 올려가며 골프장이 더 이상
+    나오지 않을 때까지 받아 HTML을 이어 붙인다.
+
+    실제 사이트는 무한 스크롤이라 '&page=N' 페이지 방식(TEETIME_HTTP_PAGE_PARAM)은 확인된
+    API가 아니라 가정이다. 서버가 파라미터를 무시하면 같은 페이지가 반복되므로 그때 멈추고,
+    어느 경우든 max_pages를 넘지 않는다 (tests/test_http_fetcher.py에서 stub_site로 확인).
+    """
+
+    name = "http"
+
+    def __init__(self, base_url=None, page_param=None, max_pages=None,
+                 concurrency=None, timeout=None):
+        self.base_url = base_url
+        self.page_param = page_param or config.HTTP_PAGE_PARAM
+        self.max_pages = max_pages or config.HTTP_MAX_PAGES
+        self.concurrency = concurrency or config.HTTP_CONCURRENCY
+        self.timeout = timeout or config.HTTP_TIMEOUT
+        self._loop = None
+        self._thread = None
+        self._session = None
+        self._semaphore = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever,
+                                                name="http-fetcher", daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop()).result()
+
+    async def _get_session(self):
+        if self._session is None:
+            import aiohttp
+            connector = aiohttp.TCPConnector(limit=self.concurrency, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={"User-Agent": "Mozilla/5.0 (teetime-monitor)"},
+            )
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._session
+
+    async def _get_page(self, round_day, page, params=None):
+        session = await self._get_session()
+        url = config.listing_url(round_day, self.base_url, params) + f"&{self.page_param}={page}"
+        async with self._semaphore:
+            with metrics.span("http_page"):
+                async with session.get(url) as response:
+                    response.raise_for_status()
+                    html = await response.text()
+            metrics.counter("teetime_fetch_chars_total", "받은 HTML 크기(문자 수)", fetcher=self.name).inc(len(html))
+            return html
+
+    async def _fetch_async(self, round_day, params=None):
+        pages = []
+        for page in range(1, self.max_pages + 1):
+            html = await self._get_page(round_day, page, params)
+            if not ITEM_PATTERN.search(html):
+                break
+            # 페이지 파라미터를 무시하는 서버라면 같은 내용이 반복되므로 중단
+            if pages and html == pages[-1]:
+                break
+            pages.append(html)
+        metrics.histogram("teetime_http_pages", "날짜별 HTTP 페이지 수", buckets=metrics.COUNT_BUCKETS).observe(len(pages))
+        print(f"HTTP 수집 완료: {round_day} ({len(pages)}페이지)")
+        return "\n".join(pages)
+
+    async def _fetch_many_async(self, round_days, return_exceptions=False):
+        htmls = await asyncio.gather(*(self._fetch_async(round_day) for round_day in round_days),
+                                     return_exceptions=return_exceptions)
+        return dict(zip(round_days, htmls))
+
+    def fetch(self, round_day, params=None):
+        return self._run(self._fetch_async(round_day, params))
+
+    def fetch_many(self, round_days, return_exceptions=False):
+        """모든 날짜를 하나의 연결 풀에서 동시에 가져옴"""
+        return self._run(self._fetch_many_async(list(round_days), return_exceptions))
+
+    def close(self):
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        if self._session is not None:
+            asyncio.run_coroutine_threadsafe(self._session.close(), loop).result()
+            self._session = None
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join()
+        loop.close()
+
+
+FETCHERS = {
+    SeleniumFetcher.name: SeleniumFetcher,
+    HttpFetcher.name: HttpFetcher,
+}
+
+
+def get_fetcher(name=None, **kwargs):
+    """설정(TEETIME_FETCHER)에 따라 fetcher 생성"""
+    name = name or config.FETCHER
+    try:
+        fetcher_class = FETCHERS[name]
+    except KeyError:
+        raise ValueError(f"알 수 없는 fetcher: {name} (가능한 값: {', '.join(FETCHERS)})")
+    return fetcher_class(**kwargs)
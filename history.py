@@ -0,0 +1,313 @@
+"""스크래핑 관측 이력 (플레이 날짜별로 파티션된 Parquet)
+
+매 사이클의 관측값(remaining_teams, price, play_time)을 전부 쌓되, 골프장/날짜별로
+직전 값과 같으면 행을 만들지 않는다(런 길이 인코딩). 어느 시점의 상태는 그 시점
+이전의 마지막 변경 행으로 복원되고, 사이클 시각 목록은 파일 메타데이터에 남는다.
+
+    history/play_date=2024-12-06/part-20241206T034050.parquet
+
+골프장/지역/가격/잔여팀은 딕셔너리 인코딩, 스크래핑 시각은 델타 인코딩,
+play_time은 자정 기준 분(uint16) 배열로 저장한다. 범위 조회는 필요한
+play_date 파티션 디렉터리만 읽는다.
+
+    python history.py compact     # 파티션별 작은 파일들을 하나로 합치기
+"""
+import argparse
+import glob
+import json
+import os
+import threading
+from datetime import datetime
+
+import config
+import metrics
+from records import parse_count, parse_minutes, parse_text
+
+PARTITION_PREFIX = "play_date="
+CYCLES_METADATA_KEY = b"teetime.scraping_dates"
+DICTIONARY_COLUMNS = ["golf_course", "location", "price", "remaining_teams"]
+
+
+def _pa():
+    import pyarrow as pa
+    return pa
+
+
+def history_schema():
+    pa = _pa()
+    return pa.schema([
+        ("scraping_date", pa.timestamp("s")),
+        ("golf_course", pa.string()),
+        ("location", pa.string()),
+        ("remaining_teams", pa.int16()),
+        ("price", pa.int32()),
+        ("play_time", pa.list_(pa.uint16())),
+        ("listed", pa.bool_()),
+    ])
+
+
+def _partition_dir(root, play_date):
+    return os.path.join(root, f"{PARTITION_PREFIX}{play_date}")
+
+
+def _partition_dates(root):
+    dates = []
+    for path in glob.glob(os.path.join(root, f"{PARTITION_PREFIX}*")):
+        dates.append(os.path.basename(path)[len(PARTITION_PREFIX):])
+    return sorted(dates)
+
+
+def play_dates(root=None):
+    """이력이 있는 플레이 날짜 목록"""
+    return _partition_dates(root or config.HISTORY_DIR)
+
+
+def _write_part(path, table, scraping_dates):
+    import pyarrow.parquet as pq
+
+    metadata = dict(table.schema.metadata or {})
+    metadata[CYCLES_METADATA_KEY] = json.dumps(sorted(set(scraping_dates))).encode()
+    table = table.replace_schema_metadata(metadata)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    pq.write_table(
+        table, tmp_path,
+        compression="zstd",
+        use_dictionary=DICTIONARY_COLUMNS,
+        column_encoding={"scraping_date": "DELTA_BINARY_PACKED"},
+    )
+    metrics.counter("teetime_bytes_written_total", "파일에 쓴 바이트 수", target="history").inc(os.path.getsize(tmp_path))
+    os.replace(tmp_path, path)
+
+
+def _read_partition(root, play_date, courses=None):
+    """파티션 하나를 읽어 (테이블, 사이클 시각 목록) 반환"""
+    import pyarrow.parquet as pq
+    pa = _pa()
+
+    tables = []
+    cycles = set()
+    for path in sorted(glob.glob(os.path.join(_partition_dir(root, play_date), "*.parquet"))):
+        parquet_file = pq.ParquetFile(path)
+        metadata = parquet_file.schema_arrow.metadata or {}
+        cycles.update(json.loads(metadata.get(CYCLES_METADATA_KEY, b"[]")))
+        table = parquet_file.read()
+        if courses is not None:
+            import pyarrow.compute as pc
+            table = table.filter(pc.is_in(table["golf_course"], value_set=pa.array(sorted(courses))))
+        tables.append(table.replace_schema_metadata(None))
+
+    if not tables:
+        return history_schema().empty_table(), []
+    return pa.concat_tables(tables), sorted(cycles)
+
+
+class HistoryWriter:
+    """변경된 관측값만 모아 두었다가 파티션별 Parquet 파일로 기록
+
+    flush_cycles 사이클마다(기본 12회, 약 1시간) 한 번 파일을 쓰므로 파일 수가
+    사이클 수만큼 늘지 않는다. 남은 버퍼는 close() 때 기록된다.
+    """
+
+    def __init__(self, root=None, flush_cycles=None):
+        self.root = root or config.HISTORY_DIR
+        self.flush_cycles = config.HISTORY_FLUSH_CYCLES if flush_cycles is None else flush_cycles
+        self._lock = threading.Lock()
+        self._last = {}       # play_date → {golf_course: 마지막으로 기록한 (location, teams, price, play_time, listed)}
+        self._loaded = set()  # 마지막 값을 불러온 파티션
+        self._buffer = {}     # play_date → 행 목록
+        self._cycles = {}     # play_date → 버퍼에 담긴 사이클 시각
+        self._pending_cycles = 0
+
+    def _load_partition_state(self, play_date):
+        """기존 파티션의 골프장별 마지막 값 복원 (처음 보는 날짜일 때 한 번)"""
+        if play_date in self._loaded:
+            return
+        self._loaded.add(play_date)
+        last = self._last.setdefault(play_date, {})
+        table, _ = _read_partition(self.root, play_date)
+        for row in table.sort_by("scraping_date").to_pylist():
+            last[row["golf_course"]] = (
+                row["location"], row["remaining_teams"], row["price"],
+                tuple(row["play_time"] or ()), row["listed"],
+            )
+
+    def append(self, records):
+        """한 사이클의 스크래핑 결과를 추가하고 새로 생긴 변경 행 수 반환"""
+        with self._lock:
+            by_date = {}
+            for record in records:
+                by_date.setdefault(str(record["play_date"])[:10], []).append(record)
+
+            changed = 0
+            for play_date, date_records in by_date.items():
+                self._load_partition_state(play_date)
+                scraping_date = datetime.strptime(str(date_records[0]["scraping_date"])[:19], "%Y-%m-%d %H:%M:%S")
+                last = self._last[play_date]
+                rows = self._buffer.setdefault(play_date, [])
+                self._cycles.setdefault(play_date, []).append(scraping_date.strftime("%Y-%m-%d %H:%M:%S"))
+
+                seen = set()
+                for record in date_records:
+                    course = record["golf_course"]
+                    seen.add(course)
+                    value = (
+                        parse_text(record.get("location")), parse_count(record.get("remaining_teams")),
+                        parse_count(record.get("price")), tuple(parse_minutes(record.get("play_time"))), True,
+                    )
+                    if last.get(course) != value:
+                        last[course] = value
+                        rows.append((scraping_date, course) + value)
+                        changed += 1
+
+                # 목록에서 사라진 골프장은 listed=False 행 하나로 기록
+                for course, value in last.items():
+                    if course not in seen and value[4]:
+                        gone = value[:4] + (False,)
+                        last[course] = gone
+                        rows.append((scraping_date, course) + gone)
+                        changed += 1
+
+            self._pending_cycles += 1
+            if self._pending_cycles >= self.flush_cycles:
+                self._flush_locked()
+            return changed
+
+    def _flush_locked(self):
+        pa = _pa()
+        schema = history_schema()
+        stamp = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+        for play_date, rows in self._buffer.items():
+            columns = list(zip(*rows)) if rows else [[] for _ in schema]
+            table = pa.Table.from_arrays(
+                [pa.array(list(column), type=field.type) for column, field in zip(columns, schema)],
+                schema=schema,
+            )
+            path = os.path.join(_partition_dir(self.root, play_date), f"part-{stamp}.parquet")
+            _write_part(path, table, self._cycles.get(play_date, []))
+        self._buffer.clear()
+        self._cycles.clear()
+        self._pending_cycles = 0
+
+        # 지난 플레이 날짜는 더 이상 스크래핑되지 않으므로 메모리에서 제거
+        today = datetime.now().strftime("%Y-%m-%d")
+        for play_date in [play_date for play_date in self._last if play_date < today]:
+            del self._last[play_date]
+            self._loaded.discard(play_date)
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        self.flush()
+
+
+def read_history(courses=None, start=None, end=None, root=None, expand=False):
+    """골프장/플레이 날짜 범위의 이력을 데이터프레임으로 조회
+
+    start/end는 'YYYY-MM-DD' 플레이 날짜(포함). 해당 범위의 파티션만 읽는다.
+    기본은 변경 행만 반환하고, expand=True면 모든 사이클 시각으로 펼쳐서
+    (사이클 시각, 골프장)마다 그 시점의 값을 채운 행을 반환한다.
+    """
+    import pandas as pd
+
+    root = root or config.HISTORY_DIR
+    if isinstance(courses, str):
+        courses = [courses]
+    frames = []
+    for play_date in _partition_dates(root):
+        if (start and play_date < start) or (end and play_date > end):
+            continue
+        table, cycles = _read_partition(root, play_date, courses)
+        if table.num_rows == 0:
+            continue
+        frame = table.to_pandas()
+        frame.insert(1, "play_date", play_date)
+        if expand:
+            frame = _expand(frame, cycles)
+        frames.append(frame)
+
+    if not frames:
+        empty = history_schema().empty_table().to_pandas()
+        empty.insert(1, "play_date", pd.Series(dtype=str))
+        return empty
+    result = pd.concat(frames, ignore_index=True)
+    for column in ("golf_course", "location"):
+        result[column] = result[column].astype("category")
+    return result
+
+
+def _expand(frame, cycles):
+    """변경 행을 사이클 시각마다 앞 값으로 채운 전체 관측값으로 펼침"""
+    import pandas as pd
+
+    times = pd.Series(pd.to_datetime(cycles)).astype(frame["scraping_date"].dtype)
+    courses = frame["golf_course"].unique()
+    grid = pd.DataFrame({
+        "scraping_date": times.repeat(len(courses)).to_numpy(),
+        "golf_course": list(courses) * len(times),
+    })
+    merged = pd.merge_asof(
+        grid, frame.sort_values("scraping_date"), on="scraping_date", by="golf_course", direction="backward",
+    )
+    merged = merged[merged["listed"].fillna(False).astype(bool)]
+    return merged[frame.columns].reset_index(drop=True)
+
+
+def compact(root=None, before=None):
+    """파티션별 작은 Parquet 파일들을 정렬된 파일 하나로 합침
+
+    before('YYYY-MM-DD')를 주면 그 이전 플레이 날짜 파티션만 합친다.
+    """
+    root = root or config.HISTORY_DIR
+    compacted = 0
+    for play_date in _partition_dates(root):
+        if before and play_date >= before:
+            continue
+        parts = sorted(glob.glob(os.path.join(_partition_dir(root, play_date), "*.parquet")))
+        if len(parts) <= 1:
+            continue
+        table, cycles = _read_partition(root, play_date)
+        table = table.sort_by([("golf_course", "ascending"), ("scraping_date", "ascending")])
+        stamp = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+        _write_part(os.path.join(_partition_dir(root, play_date), f"part-{stamp}-compacted.parquet"), table, cycles)
+        for path in parts:
+            os.remove(path)
+        compacted += 1
+    return compacted
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_writer():
+    """프로세스에서 공유하는 이력 기록기 (종료 시 버퍼를 기록)"""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            import atexit
+            _writer = HistoryWriter()
+            atexit.register(_writer.close)
+        return _writer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스크래핑 이력 관리")
+    parser.add_argument("command", choices=["compact", "show"])
+    parser.add_argument("--course", action="append", help="골프장 이름 (여러 번 지정 가능)")
+    parser.add_argument("--start", help="플레이 날짜 시작 (YYYY-MM-DD)")
+    parser.add_argument("--end", help="플레이 날짜 끝 (YYYY-MM-DD)")
+    parser.add_argument("--before", help="compact: 이 날짜 이전 파티션만")
+    args = parser.parse_args()
+
+    if args.command == "compact":
+        print(f"파티션 {compact(before=args.before)}개를 합쳤습니다")
+    else:
+        print(read_history(args.course, args.start, args.end).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""골프장 목록 HTML 파서
+
+golf-inner-info 블록마다 하위 요소를 한 번만 훑으면서 모든 필드를 뽑는다.
+selectolax, lxml 순서로 빠른 백엔드를 쓰고, 둘 다 없으면 BeautifulSoup을 쓴다.
+"""
+MISSING = '정보없음'
+ITEM_CLASS = 'golf-inner-info'
+
+# (필드, 태그, 클래스) - 각 필드는 블록 안에서 처음 나오는 요소의 텍스트
+FIELDS = (
+    ('golf_course', 'strong', None),
+    ('location', 'p', 'location'),
+    ('price', 'span', 'price'),
+    ('rating', 'a', 'star-score'),
+    ('remaining_teams', 'button', 'btn'),
+)
+FIELD_TAGS = ('strong', 'p', 'span', 'a', 'button')
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as _SelectolaxParser
+except ImportError:
+    try:  # lexbor 백엔드가 없는 예전 selectolax
+        from selectolax.parser import HTMLParser as _SelectolaxParser
+    except ImportError:
+        _SelectolaxParser = None
+
+try:
+    import lxml.html as _lxml_html
+except ImportError:
+    _lxml_html = None
+
+
+def available_backends():
+    """사용 가능한 백엔드 이름 목록 (빠른 순서)"""
+    backends = []
+    if _SelectolaxParser is not None:
+        backends.append('selectolax')
+    if _lxml_html is not None:
+        backends.append('lxml')
+    backends.append('bs4')
+    return backends
+
+
+DEFAULT_BACKEND = available_backends()[0]
+
+
+def _build_record(elements, text_of, scraping_date, play_date):
+    """(태그, 클래스 목록, 요소) 순회 결과로 레코드 하나 생성"""
+    values = {}
+    play_times = []
+    for tag, classes, element in elements:
+        if tag == 'span' and 'time' in classes:
+            play_times.append(text_of(element))
+        for field, field_tag, field_class in FIELDS:
+            if tag == field_tag and field not in values and (field_class is None or field_class in classes):
+                values[field] = text_of(element)
+
+    return {
+        'scraping_date': scraping_date,
+        'play_date': play_date,
+        'golf_course': values.get('golf_course', MISSING),
+        'location': values.get('location', MISSING),
+        'price': values.get('price', MISSING),
+        'rating': values.get('rating', MISSING),
+        'remaining_teams': values.get('remaining_teams', MISSING),
+        'play_time': play_times
+    }
+
+
+def _iter_selectolax(node):
+    for child in node.traverse(include_text=False):
+        tag = child.tag
+        if tag in FIELD_TAGS:
+            classes = (child.attributes.get('class') or '').split()
+            yield tag, classes, child
+
+
+def _text_selectolax(node):
+    return node.text(deep=True).strip()
+
+
+def _parse_selectolax(html, play_date, scraping_date):
+    tree = _SelectolaxParser(html)
+    return [
+        _build_record(_iter_selectolax(div), _text_selectolax, scraping_date, play_date)
+        for div in tree.css(f'div.{ITEM_CLASS}')
+    ]
+
+
+def _iter_lxml(element):
+    for child in element.iterdescendants(*FIELD_TAGS):
+        classes = (child.get('class') or '').split()
+        yield child.tag, classes, child
+
+
+def _text_lxml(element):
+    return element.text_content().strip()
+
+
+def _parse_lxml(html, play_date, scraping_date):
+    if not html.strip():
+        return []
+    root = _lxml_html.fromstring(html)
+    divs = root.xpath(f"//div[contains(concat(' ', normalize-space(@class), ' '), ' {ITEM_CLASS} ')]")
+    return [_build_record(_iter_lxml(div), _text_lxml, scraping_date, play_date) for div in divs]
+
+
+def _iter_bs4(div):
+    for child in div.find_all(FIELD_TAGS):
+        yield child.name, child.get('class') or [], child
+
+
+def _text_bs4(tag):
+    return tag.text.strip()
+
+
+def _parse_bs4(html, play_date, scraping_date):
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, 'html.parser')
+    return [
+        _build_record(_iter_bs4(div), _text_bs4, scraping_date, play_date)
+        for div in soup.find_all('div', class_=ITEM_CLASS)
+    ]
+
+
+_PARSERS = {
+    'selectolax': _parse_selectolax,
+    'lxml': _parse_lxml,
+    'bs4': _parse_bs4,
+}
+
+
+def parse_listing(html, play_date, scraping_date, backend=None):
+    """목록 HTML에서 골프장 데이터 목록 추출
+
+    play_time은 해당 골프장의 모든 span.time 텍스트 목록이다.
+    """
+    return _PARSERS[backend or DEFAULT_BACKEND](html, play_date, scraping_date)
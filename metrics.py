@@ -0,0 +1,300 @@
+"""단계별 계측 (히스토그램/카운터)과 샘플링 프로파일러
+
+수집 사이클의 각 단계(드라이버 시작, 페이지 로드, 대기, 스크롤, 파싱, 저장 등)를
+span()으로 감싸면 소요 시간이 고정 버킷 히스토그램에 쌓이고, render()가 Prometheus
+텍스트 형식으로 내보낸다 (app.py의 /metrics). 관측 한 번은 잠금 한 번과 버킷 탐색
+(bisect) 한 번이라 수집 경로에 두어도 부담이 없다.
+
+    with metrics.span("parse"):
+        ...
+    metrics.counter("teetime_rows_parsed_total", "파싱한 골프장 수").inc(len(rows))
+
+process 모드 워커에서 잰 값은 부모 프로세스의 /metrics에 나타나지 않는다.
+"""
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter as _StackCounter
+from contextlib import contextmanager
+
+# 초 단위 기본 버킷 (1ms ~ 2분)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+# 개수 단위 버킷 (스크롤 라운드, 행 수)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 5000, 10000)
+
+
+def _label_text(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """증가만 하는 값"""
+
+    kind = "counter"
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def samples(self, name, labels):
+        yield name, labels, self.value
+
+
+class Gauge:
+    """현재 값"""
+
+    kind = "gauge"
+
+    def __init__(self):
+        self.value = 0
+
+    def set(self, value):
+        self.value = value
+
+    def samples(self, name, labels):
+        yield name, labels, self.value
+
+
+class Histogram:
+    """고정 버킷 히스토그램 (누적 개수는 내보낼 때 계산)"""
+
+    kind = "histogram"
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def samples(self, name, labels):
+        with self._lock:
+            counts = list(self.counts)
+            total, count = self.sum, self.count
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += bucket_count
+            yield name + "_bucket", labels + (("le", _number(bound)),), cumulative
+        yield name + "_sum", labels, total
+        yield name + "_count", labels, count
+
+
+class Registry:
+    """이름+라벨별 계측 값 모음"""
+
+    def __init__(self):
+        self._metrics = {}  # name → (종류, 설명, {labels: 값})
+        self._lock = threading.Lock()
+
+    def _get(self, name, help_text, factory, labels):
+        key = tuple(sorted(labels.items()))
+        family = self._metrics.get(name)
+        if family is None or key not in family[2]:
+            with self._lock:
+                family = self._metrics.setdefault(name, (factory, help_text, {}))
+                family[2].setdefault(key, factory())
+        return family[2][key]
+
+    def counter(self, name, help_text="", **labels):
+        return self._get(name, help_text, Counter, labels)
+
+    def gauge(self, name, help_text="", **labels):
+        return self._get(name, help_text, Gauge, labels)
+
+    def histogram(self, name, help_text="", buckets=DEFAULT_BUCKETS, **labels):
+        return self._get(name, help_text, lambda: Histogram(buckets), labels)
+
+    def render(self):
+        """Prometheus 텍스트 형식 (version 0.0.4)"""
+        lines = []
+        with self._lock:
+            families = sorted((name, help_text, dict(values)) for name, (_, help_text, values) in self._metrics.items())
+        for name, help_text, values in families:
+            if not values:
+                continue
+            kind = next(iter(values.values())).kind
+            if help_text:
+                lines.append(f"# HELP {name} {_escape(help_text)}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, metric in sorted(values.items()):
+                for sample_name, sample_labels, value in metric.samples(name, labels):
+                    lines.append(f"{sample_name}{_label_text(sample_labels)} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+counter = REGISTRY.counter
+gauge = REGISTRY.gauge
+histogram = REGISTRY.histogram
+render = REGISTRY.render
+
+STAGE_METRIC = "teetime_stage_seconds"
+
+
+@contextmanager
+def span(stage, **labels):
+    """단계 소요 시간을 teetime_stage_seconds{stage=...}에 기록 (예외가 나면 errors 카운터도 증가)"""
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        counter("teetime_stage_errors_total", "단계별 오류 수", stage=stage, **labels).inc()
+        raise
+    finally:
+        histogram(STAGE_METRIC, "단계별 소요 시간(초)", stage=stage, **labels).observe(time.perf_counter() - started)
+
+
+class SamplingProfiler:
+    """모든 스레드의 스택을 주기적으로 찍어 접힌 스택(collapsed stack)별 횟수를 모음
+
+    켜져 있는 동안만 샘플링 스레드가 돈다. report()는 flamegraph.pl이나 speedscope에
+    바로 넣을 수 있는 '프레임;프레임 횟수' 형식이다. 서로 다른 스택이 max_stacks개를 넘으면
+    새 스택은 OVERFLOW_STACK 하나로 모아 메모리가 계속 늘지 않게 한다.
+    """
+
+    OVERFLOW_STACK = "(기타 스택)"
+
+    def __init__(self, interval=0.01, max_stacks=5000):
+        self.interval = interval
+        self.max_stacks = max_stacks
+        self.samples = _StackCounter()
+        self.sample_count = 0
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def start(self, interval=None):
+        if interval is not None and interval <= 0:
+            raise ValueError(f"샘플링 간격은 0보다 커야 합니다: {interval}")
+        with self._lock:
+            if self._thread is not None:
+                return False
+            if interval is not None:
+                self.interval = interval
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+            self._thread.start()
+            return True
+
+    def stop(self):
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return False
+        self._stop.set()
+        thread.join()
+        return True
+
+    def reset(self):
+        with self._lock:
+            self.samples.clear()
+            self.sample_count = 0
+
+    def _run(self):
+        own = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+            stacks = []
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{frame.f_lineno})")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                stacks.append(";".join(reversed(stack)))
+            with self._lock:
+                for stack in stacks:
+                    if stack not in self.samples and len(self.samples) >= self.max_stacks:
+                        stack = self.OVERFLOW_STACK
+                    self.samples[stack] += 1
+                self.sample_count += 1
+
+    def report(self, top=None):
+        with self._lock:
+            items = self.samples.most_common(top)
+        return "\n".join(f"{stack} {count}" for stack, count in items) + ("\n" if items else "")
+
+
+profiler = SamplingProfiler()
+
+
+def flask_response(request):
+    """/metrics 응답 (Prometheus 텍스트 형식)"""
+    from flask import Response
+    return Response(render(), mimetype="text/plain; version=0.0.4")
+
+
+LOCAL_ADDRESSES = ("127.0.0.1", "::1")
+
+
+def profiler_response(request, allow_remote=False):
+    """/debug/profile 응답
+
+    GET은 지금까지 모은 접힌 스택(top=N으로 상위만), POST action=start|stop|reset은
+    실행 중 프로파일러 켜기/끄기 (interval=초로 샘플링 간격 지정). allow_remote가 아니면
+    같은 호스트에서 온 요청만 받는다.
+    """
+    from flask import Response
+
+    if not allow_remote and request.remote_addr not in LOCAL_ADDRESSES:
+        return Response("로컬에서만 사용할 수 있습니다\n", status=403, mimetype="text/plain")
+    if request.method == "POST":
+        action = request.values.get("action", "")
+        try:
+            interval = float(request.values["interval"]) if request.values.get("interval") else None
+        except ValueError:
+            return Response("잘못된 interval\n", status=400, mimetype="text/plain")
+        if interval is not None and not interval > 0:
+            return Response("interval은 0보다 커야 합니다\n", status=400, mimetype="text/plain")
+        if action == "start":
+            profiler.start(interval)
+        elif action == "stop":
+            profiler.stop()
+        elif action == "reset":
+            profiler.reset()
+        else:
+            return Response("action은 start, stop, reset 중 하나\n", status=400, mimetype="text/plain")
+        state = "running" if profiler.running else "stopped"
+        return Response(f"{state} (샘플 {profiler.sample_count}회)\n", mimetype="text/plain")
+
+    try:
+        top = int(request.args["top"]) if request.args.get("top") else None
+    except ValueError:
+        return Response("잘못된 top\n", status=400, mimetype="text/plain")
+    response = Response(profiler.report(top), mimetype="text/plain")
+    response.headers["X-Profiler-Running"] = "1" if profiler.running else "0"
+    response.headers["X-Profiler-Samples"] = str(profiler.sample_count)
+    return response
@@ -0,0 +1,413 @@
+"""알림 발송기: 알람 규칙 알림을 묶어서 여러 채널(싱크)로 보냄
+
+수집 스레드나 UI 스레드는 submit()으로 알림을 넣기만 하고 바로 돌아간다. 발송은
+별도 스레드의 asyncio 이벤트 루프에서 한다.
+
+- 입력 큐는 크기가 정해져 있고 가득 차면 새 알림을 버린다 (호출한 쪽은 절대 기다리지 않음)
+- 같은 (플레이 날짜, 골프장)의 알림은 NOTIFY_WINDOW초 동안 모아 한 건으로 묶는다
+  (처음 팀 수 → 마지막 팀 수, 걸린 규칙 이름 합침)
+- 싱크마다 큐와 작업(task)이 따로 있어 느리거나 실패하는 싱크가 다른 싱크를 막지 않고,
+  싱크마다 분당 발송 수를 제한한다 (토큰 버킷). 싱크 큐가 차면 가장 오래된 알림을 버린다
+- 실패하거나 시간 초과된 발송은 지수 백오프로 다시 시도한다
+
+    dispatcher = NotificationDispatcher(build_sinks())
+    engine.bus.subscribe(dispatcher.submit)
+    ...
+    dispatcher.close()
+
+싱크: desktop(콜백 또는 plyer 데스크톱 알림, 없으면 콘솔), webhook(JSON POST, aiohttp 필요),
+file(JSON Lines), sound(Windows는 winsound, 그 밖에는 터미널 벨).
+"""
+import asyncio
+import json
+import queue
+import sys
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import config
+import metrics
+import records
+from scheduler import TokenBucket
+
+# 묶인 알림 한 건 (previous_teams는 묶음의 처음, current_teams는 마지막 값)
+Message = namedtuple('Message', 'play_date golf_course location previous_teams current_teams price tee_times '
+                                'labels count first_at last_at')
+
+
+class SinkError(Exception):
+    """싱크 발송 실패 (retry=False면 다시 시도하지 않음)"""
+
+    def __init__(self, message, retry=True):
+        super().__init__(message)
+        self.retry = retry
+
+
+def format_message(message):
+    """묶인 알림을 사람이 읽는 문자열로"""
+    text = f"{message.play_date} {message.golf_course}"
+    if message.previous_teams != message.current_teams:
+        text += f" 팀 수 {records.format_teams(message.previous_teams)} → {records.format_teams(message.current_teams)}"
+    else:
+        text += f" 남은 팀 {records.format_teams(message.current_teams)}"
+    text += f", {records.format_price(message.price)}"
+    if message.tee_times:
+        text += f", 티타임 {', '.join(records.format_minutes(message.tee_times[:5]))}"
+    if message.count > 1:
+        text += f" ({message.count}건 묶음)"
+    labels = [label for label in message.labels if label]
+    if labels:
+        text = f"[{', '.join(labels)}] " + text
+    return text
+
+
+def message_dict(message):
+    """JSON으로 보낼 딕셔너리"""
+    data = message._asdict()
+    data["tee_times"] = records.format_minutes(message.tee_times)
+    data["labels"] = list(message.labels)
+    data["text"] = format_message(message)
+    return data
+
+
+def _merge(message, alert, now):
+    """묶는 중인 알림에 새 알림 반영"""
+    labels = message.labels if alert.label in message.labels else message.labels + (alert.label,)
+    return message._replace(
+        location=alert.location, current_teams=alert.current_teams, price=alert.price,
+        tee_times=tuple(alert.tee_times) or message.tee_times, labels=labels,
+        count=message.count + 1, last_at=now,
+    )
+
+
+def _new_message(alert, now):
+    return Message(alert.play_date, alert.golf_course, alert.location, alert.previous_teams, alert.current_teams,
+                   alert.price, tuple(alert.tee_times), (alert.label,), 1, now, now)
+
+
+class Sink:
+    """알림 채널 기본 클래스
+
+    deliver(message)는 싱크 전용 스레드(threads개)에서 실행되므로 블로킹 호출이어도 된다.
+    시간 초과로 기다림을 포기해도 deliver는 끝날 때까지 스레드를 잡고 있으므로, 멈춘 싱크는
+    자기 스레드만 차지하고 스레드가 모두 사용 중이면 새 발송은 바로 실패(재시도 대상)한다.
+    비동기로 보내는 싱크는 send()를 재정의한다.
+    """
+
+    name = "sink"
+
+    def __init__(self, per_minute=None, burst=None, retries=None, timeout=None, threads=1):
+        self.per_minute = config.NOTIFY_RATE_PER_MINUTE if per_minute is None else per_minute
+        self.burst = config.NOTIFY_BURST if burst is None else burst
+        self.retries = config.NOTIFY_RETRIES if retries is None else retries
+        self.timeout = config.NOTIFY_TIMEOUT if timeout is None else timeout
+        self.threads = threads
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(threads)
+
+    async def send(self, message):
+        if not self._slots.acquire(blocking=False):
+            raise SinkError("이전 발송이 아직 끝나지 않았습니다", retry=True)
+        try:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.threads, thread_name_prefix=f"notify-{self.name}")
+            future = self._executor.submit(self._deliver_in_slot, message)
+        except BaseException:
+            self._slots.release()
+            raise
+        await asyncio.wrap_future(future)
+
+    def _deliver_in_slot(self, message):
+        try:
+            self.deliver(message)
+        finally:
+            self._slots.release()
+
+    def deliver(self, message):
+        raise NotImplementedError
+
+    async def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+class DesktopSink(Sink):
+    """데스크톱 알림 (callback을 주면 그쪽으로, 아니면 plyer, 그것도 없으면 콘솔)"""
+
+    name = "desktop"
+
+    def __init__(self, callback=None, **kwargs):
+        super().__init__(**kwargs)
+        self.callback = callback
+
+    def deliver(self, message):
+        if self.callback is not None:
+            self.callback(message)
+            return
+        try:
+            from plyer import notification
+        except ImportError:
+            print(f"[알림] {format_message(message)}")
+            return
+        notification.notify(title=f"티타임 알림: {message.golf_course}", message=format_message(message), timeout=10)
+
+
+class WebhookSink(Sink):
+    """JSON POST 웹훅 (aiohttp, 연결은 싱크 수명 동안 재사용)"""
+
+    name = "webhook"
+
+    def __init__(self, url=None, **kwargs):
+        super().__init__(**kwargs)
+        self.url = url or config.NOTIFY_WEBHOOK_URL
+        if not self.url:
+            raise ValueError("웹훅 주소가 없습니다 (TEETIME_NOTIFY_WEBHOOK)")
+        self._session = None
+
+    async def send(self, message):
+        import aiohttp
+
+        if self._session is None:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout))
+        async with self._session.post(self.url, json=message_dict(message)) as response:
+            if response.status >= 400:
+                # 429와 5xx는 일시적인 오류로 보고 다시 시도
+                retry = response.status == 429 or response.status >= 500
+                raise SinkError(f"웹훅 응답 {response.status}", retry=retry)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        await super().close()
+
+
+class FileSink(Sink):
+    """JSON Lines 파일에 한 줄씩 추가"""
+
+    name = "file"
+
+    def __init__(self, path=None, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path or config.NOTIFY_FILE
+
+    def deliver(self, message):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(message_dict(message), ensure_ascii=False) + "\n")
+
+
+class SoundSink(Sink):
+    """알림음 (enabled가 False를 돌려주면 건너뜀)"""
+
+    name = "sound"
+
+    def __init__(self, enabled=None, **kwargs):
+        super().__init__(**kwargs)
+        self.enabled = enabled
+
+    def deliver(self, message):
+        if self.enabled is not None and not self.enabled():
+            return
+        try:
+            import winsound
+        except ImportError:
+            sys.stdout.write("\a")
+            sys.stdout.flush()
+            return
+        winsound.MessageBeep(winsound.MB_ICONEXCLAMATION)
+
+
+SINKS = {
+    DesktopSink.name: DesktopSink,
+    WebhookSink.name: WebhookSink,
+    FileSink.name: FileSink,
+    SoundSink.name: SoundSink,
+}
+
+
+def build_sinks(names=None, **options):
+    """설정(TEETIME_NOTIFY_SINKS)에 따라 싱크 생성
+
+    options는 싱크 이름별 생성 인자 (예: desktop={'callback': ...}).
+    """
+    names = config.NOTIFY_SINKS if names is None else names
+    sinks = []
+    for name in names:
+        try:
+            sink_class = SINKS[name]
+        except KeyError:
+            raise ValueError(f"알 수 없는 알림 싱크: {name} (가능한 값: {', '.join(SINKS)})")
+        sinks.append(sink_class(**options.get(name, {})))
+    return sinks
+
+
+class NotificationDispatcher:
+    """알림을 묶어 싱크별로 비동기 발송 (백그라운드 이벤트 루프 하나)"""
+
+    def __init__(self, sinks, window=None, queue_size=None, backoff=None, backoff_max=None):
+        self.sinks = list(sinks)
+        self.window = config.NOTIFY_WINDOW if window is None else window
+        self.queue_size = config.NOTIFY_QUEUE_SIZE if queue_size is None else queue_size
+        self.backoff = config.NOTIFY_BACKOFF if backoff is None else backoff
+        self.backoff_max = config.NOTIFY_BACKOFF_MAX if backoff_max is None else backoff_max
+        self._inbox = queue.Queue(self.queue_size)
+        self._pending = {}       # (play_date, golf_course) → 묶는 중인 Message
+        self._flush_handles = {}
+        self._queues = {}        # 싱크 → asyncio.Queue
+        self._tasks = []
+        self._loop = None
+        self._thread = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+    # 어느 스레드에서나 호출
+
+    def start(self):
+        """발송 루프 시작 (close() 뒤에는 다시 시작하지 않음)"""
+        with self._lock:
+            self._start()
+        return self
+
+    def _start(self):
+        if self._loop is None and not self._closed:
+            self._loop = asyncio.new_event_loop()
+            ready = threading.Event()
+            self._thread = threading.Thread(target=self._run_loop, args=(ready,),
+                                            name="notifier", daemon=True)
+            self._thread.start()
+            ready.wait()
+
+    def submit(self, alerts):
+        """알림(alarm_rules.Alert) 목록을 넣음 (기다리지 않음, 넣은 개수 반환)
+
+        close() 뒤에 들어온 알림(늦게 도착한 ChangeBus 콜백 등)은 버린다.
+        """
+        alerts = list(alerts)
+        with self._lock:
+            if self._closed:
+                if alerts:
+                    metrics.counter("teetime_notify_dropped_total", "버린 알림 수", reason="closed").inc(len(alerts))
+                return 0
+            self._start()
+            accepted = 0
+            for alert in alerts:
+                try:
+                    self._inbox.put_nowait(alert)
+                    accepted += 1
+                except queue.Full:
+                    metrics.counter("teetime_notify_dropped_total", "버린 알림 수", reason="inbox_full").inc()
+            if accepted:
+                self._loop.call_soon_threadsafe(self._drain_inbox)
+        return accepted
+
+    def close(self, timeout=10):
+        """묶는 중인 알림을 바로 보내고 싱크 큐가 빌 때까지(timeout초까지) 기다린 뒤 종료"""
+        with self._lock:
+            self._closed = True
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        future = asyncio.run_coroutine_threadsafe(self._shutdown(timeout), loop)
+        try:
+            future.result(timeout + 5)
+        except Exception as e:
+            print(f"알림 발송기 종료 중 오류 발생: {str(e)}")
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join()
+        loop.close()
+
+    # 이벤트 루프 안
+
+    def _run_loop(self, ready):
+        asyncio.set_event_loop(self._loop)
+        for sink in self.sinks:
+            self._queues[sink] = asyncio.Queue(self.queue_size)
+            self._tasks.append(self._loop.create_task(self._sink_worker(sink)))
+        self._loop.call_soon(ready.set)
+        self._loop.run_forever()
+
+    def _drain_inbox(self):
+        now = time.strftime("%Y-%m-%d %H:%M:%S")
+        while True:
+            try:
+                alert = self._inbox.get_nowait()
+            except queue.Empty:
+                break
+            key = (alert.play_date, alert.golf_course)
+            message = self._pending.get(key)
+            if message is None:
+                self._pending[key] = _new_message(alert, now)
+                self._flush_handles[key] = self._loop.call_later(self.window, self._flush, key)
+            else:
+                self._pending[key] = _merge(message, alert, now)
+                metrics.counter("teetime_notify_coalesced_total", "묶인 알림 수").inc()
+
+    def _flush(self, key):
+        self._flush_handles.pop(key, None)
+        message = self._pending.pop(key, None)
+        if message is None:
+            return
+        for sink, sink_queue in self._queues.items():
+            if sink_queue.full():
+                sink_queue.get_nowait()
+                sink_queue.task_done()
+                metrics.counter("teetime_notify_dropped_total", "버린 알림 수", reason=sink.name).inc()
+            sink_queue.put_nowait(message)
+
+    async def _sink_worker(self, sink):
+        bucket = TokenBucket(sink.per_minute, sink.burst) if sink.per_minute > 0 else None
+        sink_queue = self._queues[sink]
+        while True:
+            message = await sink_queue.get()
+            try:
+                if bucket is not None:
+                    while not bucket.try_take(time.monotonic()):
+                        await asyncio.sleep(bucket.wait_time(time.monotonic()))
+                await self._deliver(sink, message)
+            finally:
+                sink_queue.task_done()
+
+    async def _deliver(self, sink, message):
+        delay = self.backoff
+        for attempt in range(sink.retries + 1):
+            try:
+                with metrics.span("notify", sink=sink.name):
+                    await asyncio.wait_for(sink.send(message), sink.timeout)
+                metrics.counter("teetime_notifications_total", "보낸 알림 수", sink=sink.name).inc()
+                return True
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                retry = getattr(e, "retry", True) and attempt < sink.retries
+                error = str(e) or type(e).__name__
+                if not retry:
+                    metrics.counter("teetime_notify_failures_total", "발송 실패한 알림 수", sink=sink.name).inc()
+                    print(f"알림 발송 실패 ({sink.name}): {error}")
+                    return False
+                metrics.counter("teetime_notify_retries_total", "알림 재시도 수", sink=sink.name).inc()
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.backoff_max)
+        return False
+
+    async def _shutdown(self, timeout):
+        self._drain_inbox()
+        for key in list(self._pending):
+            handle = self._flush_handles.pop(key, None)
+            if handle is not None:
+                handle.cancel()
+            self._flush(key)
+        try:
+            await asyncio.wait_for(asyncio.gather(*(q.join() for q in self._queues.values())), timeout)
+        except asyncio.TimeoutError:
+            print("알림 발송이 끝나지 않아 남은 알림을 버립니다")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for sink in self.sinks:
+            try:
+                await sink.close()
+            except Exception as e:
+                print(f"알림 싱크 종료 중 오류 발생 ({sink.name}): {str(e)}")
@@ -0,0 +1,199 @@
+"""수집 레코드 정규화
+
+파서가 만든 문자열 레코드('150,000원', '3팀', '정보없음', ['06:30', ...])를 수집할 때
+한 번만 해석해서 타입이 있는 값으로 바꾼다. 이후 저장소, 이력, 비교 엔진, API, UI는
+숫자를 다시 해석하지 않는다.
+
+- price, remaining_teams: 정수 (없으면 None)
+- rating: 실수 (없으면 None)
+- location: 문자열 (없으면 None), 데이터프레임에서는 category
+- golf_course: 키라서 None 대신 '정보없음'을 그대로 둔다 (category)
+- play_time: 자정 기준 분 배열 (array('H'))
+
+데이터프레임은 to_frame()으로 만들고(정수 열은 nullable Int32/Int16), 레코드 목록이
+필요하면 to_records()로 꺼낸다 (결측값은 None).
+"""
+import re
+from array import array
+from functools import lru_cache
+
+from listing_parser import MISSING
+
+FIELDS = ('scraping_date', 'play_date', 'golf_course', 'location', 'price',
+          'rating', 'remaining_teams', 'play_time')
+
+FRAME_DTYPES = {
+    'scraping_date': 'category',
+    'play_date': 'category',
+    'golf_course': 'category',
+    'location': 'category',
+    'price': 'Int32',
+    'rating': 'Float64',
+    'remaining_teams': 'Int16',
+}
+
+_RATING_RE = re.compile(r'\d+(?:\.\d+)?')
+
+
+def _is_missing(value):
+    if value is None:
+        return True
+    if isinstance(value, str):
+        return value == MISSING or not value.strip()
+    try:
+        return bool(value != value)  # NaN
+    except TypeError:  # pd.NA
+        return True
+
+
+def parse_count(value):
+    """'150,000원', '3팀' 같은 문자열에서 숫자만 추출 (없으면 None)"""
+    if isinstance(value, int):
+        return value
+    if _is_missing(value):
+        return None
+    if isinstance(value, float):
+        return int(value)
+    return _count_text(str(value))
+
+
+@lru_cache(maxsize=4096)
+def _count_text(text):
+    # 가격/팀 문자열은 종류가 적어서 캐시 적중률이 높음
+    digits = ''.join(filter(str.isdigit, text))
+    return int(digits) if digits else None
+
+
+def parse_rating(value):
+    """'4.5', '평점 4.5' → 4.5 (없으면 None)"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return None if value != value else float(value)
+    if _is_missing(value):
+        return None
+    match = _RATING_RE.search(str(value))
+    return float(match.group()) if match else None
+
+
+def parse_text(value):
+    """'정보없음'과 결측값을 None으로"""
+    return None if _is_missing(value) else str(value)
+
+
+def parse_minutes(play_times):
+    """['06:30', '07:10'] → array('H', [390, 430]) (이미 분 단위면 그대로)"""
+    if isinstance(play_times, array):
+        return play_times
+    if play_times is None or isinstance(play_times, float):
+        return array('H')
+    if isinstance(play_times, (str, int)):
+        play_times = (play_times,)
+    minutes = array('H')
+    for value in play_times:
+        if isinstance(value, int):
+            minutes.append(value)
+            continue
+        hour, _, minute = str(value).strip().partition(':')
+        if hour.isdigit() and minute[:2].isdigit():
+            minutes.append(int(hour) * 60 + int(minute[:2]))
+    return minutes
+
+
+def format_minutes(minutes):
+    """array('H', [390, 430]) → ['06:30', '07:10']"""
+    return [f"{value // 60:02d}:{value % 60:02d}" for value in parse_minutes(minutes)]
+
+
+def region_of(location):
+    """'경기남부 > 여주269km' → '경기남부' (없으면 None)"""
+    if location is None:
+        return None
+    return str(location).split('>')[0].strip()
+
+
+def format_price(price):
+    return MISSING if price is None else f"{price:,}원"
+
+
+def format_teams(teams):
+    return MISSING if teams is None else f"{teams}팀"
+
+
+class TeeTime:
+    """정규화된 골프장 레코드 하나"""
+
+    __slots__ = FIELDS
+
+    def __init__(self, scraping_date, play_date, golf_course, location=None, price=None,
+                 rating=None, remaining_teams=None, play_time=None):
+        self.scraping_date = scraping_date
+        self.play_date = play_date
+        self.golf_course = golf_course
+        self.location = location
+        self.price = price
+        self.rating = rating
+        self.remaining_teams = remaining_teams
+        self.play_time = play_time if play_time is not None else array('H')
+
+    @classmethod
+    def from_raw(cls, raw):
+        """파서/엑셀의 문자열 레코드(또는 이미 정규화된 레코드)를 해석"""
+        scraping_date = raw.get('scraping_date')
+        return cls(
+            None if scraping_date is None else str(scraping_date)[:19],
+            str(raw['play_date'])[:10],
+            parse_text(raw.get('golf_course')) or MISSING,
+            parse_text(raw.get('location')),
+            parse_count(raw.get('price')),
+            parse_rating(raw.get('rating')),
+            parse_count(raw.get('remaining_teams')),
+            parse_minutes(raw.get('play_time')),
+        )
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in FIELDS}
+
+    def __eq__(self, other):
+        return isinstance(other, TeeTime) and all(getattr(self, f) == getattr(other, f) for f in FIELDS)
+
+    def __repr__(self):
+        return f"TeeTime({self.golf_course!r}, {self.play_date!r}, price={self.price}, teams={self.remaining_teams})"
+
+
+def normalize(raw_records):
+    """문자열 레코드 목록 → TeeTime 목록"""
+    return [TeeTime.from_raw(raw) for raw in raw_records]
+
+
+def to_frame(items):
+    """TeeTime(또는 레코드 딕셔너리) 목록 → 타입이 있는 데이터프레임"""
+    import pandas as pd
+
+    items = [item if isinstance(item, TeeTime) else TeeTime.from_raw(item) for item in items]
+    columns = {field: [getattr(item, field) for item in items] for field in FIELDS}
+    frame = pd.DataFrame({
+        field: pd.Series(columns[field], dtype=FRAME_DTYPES.get(field, object))
+        for field in FIELDS
+    })
+    return frame
+
+
+def concat(frames):
+    """날짜별 데이터프레임을 합치고 category 열을 다시 맞춤"""
+    import pandas as pd
+
+    frames = [frame for frame in frames if frame is not None and len(frame)]
+    if not frames:
+        return to_frame([])
+    return pd.concat(frames, ignore_index=True).astype(FRAME_DTYPES)
+
+
+def to_records(frame):
+    """데이터프레임 → 레코드 딕셔너리 목록 (결측값은 None, 정수는 int)"""
+    if not hasattr(frame, 'columns'):
+        return [item.as_dict() if isinstance(item, TeeTime) else item for item in frame]
+    columns = []
+    for field in frame.columns:
+        series = frame[field]
+        values = series.astype(object).where(series.notna(), None).tolist() if field != 'play_time' else series.tolist()
+        columns.append(values)
+    return [dict(zip(frame.columns, row)) for row in zip(*columns)]
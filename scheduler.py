@@ -0,0 +1,247 @@
+"""날짜별 적응형 갱신 스케줄러
+
+모든 날짜를 300초마다 한꺼번에 다시 받는 대신 날짜마다 갱신 주기를 따로 둔다.
+
+- 주기 상한은 플레이 날짜가 가까울수록 짧다 (오늘 REFRESH_NEAR_INTERVAL에서
+  마지막 날 REFRESH_FAR_INTERVAL까지 등비로 늘어남)
+- 최근 변경 속도(시간당 이벤트 수)가 빠르면 한 번 갱신에 약 REFRESH_TARGET_CHANGES건의
+  변경이 잡히도록 주기를 줄인다 (REFRESH_MIN_INTERVAL 이상)
+- 실패하면 지터를 섞은 지수 백오프로 다시 시도한다
+- 전체 요청은 분당 REFRESH_BUDGET_PER_MINUTE 페이지로 제한한다 (토큰 버킷)
+- 마감 시각(다음 갱신 예정 시각)이 이른 날짜부터 비어 있는 워커에 하나씩 맡기므로
+  오래 걸리는 날짜가 워커 하나를 잡고 있어도 가까운 날짜는 다른 워커에서 계속 갱신된다
+
+기본값에서 8일치 부하는 시간당 약 90페이지로 기존(300초마다 8페이지, 시간당 96페이지)보다
+적고, 오늘/내일은 2~3분마다 갱신된다.
+"""
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+
+import config
+import metrics
+
+
+class DateState:
+    """날짜 하나의 갱신 상태"""
+
+    __slots__ = ("play_date", "due", "interval", "change_rate", "failures",
+                 "last_success", "pending_changes", "duration", "running")
+
+    def __init__(self, play_date, due):
+        self.play_date = play_date
+        self.due = due                  # 다음 갱신 예정 시각 (monotonic)
+        self.interval = None            # 마지막으로 정한 갱신 주기(초)
+        self.change_rate = None         # 시간당 변경 이벤트 수 (EWMA)
+        self.failures = 0
+        self.last_success = None
+        self.pending_changes = 0        # 마지막 성공 이후 받은 변경 이벤트 수
+        self.duration = None            # 스크래핑 소요 시간(초, EWMA)
+        self.running = False
+
+
+def _start_at(state):
+    """마감 시각에 맞춰 끝나도록 평소 소요 시간만큼 앞당긴 시작 시각"""
+    return state.due - (state.duration or 0.0)
+
+
+class TokenBucket:
+    """분당 요청 예산"""
+
+    def __init__(self, per_minute, burst):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, float(burst))
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_take(self, now):
+        self._refill(now)
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+    def wait_time(self, now):
+        """토큰 하나가 찰 때까지 남은 시간(초)"""
+        self._refill(now)
+        if self.tokens >= 1.0 or self.rate <= 0:
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+
+class RefreshScheduler:
+    """날짜별 갱신 주기와 마감 시각, 요청 예산을 관리"""
+
+    def __init__(self, min_interval=None, near_interval=None, far_interval=None, target_changes=None,
+                 budget_per_minute=None, burst=None, backoff_base=None, backoff_max=None, rng=None):
+        self.min_interval = config.REFRESH_MIN_INTERVAL if min_interval is None else min_interval
+        self.near_interval = config.REFRESH_NEAR_INTERVAL if near_interval is None else near_interval
+        self.far_interval = config.REFRESH_FAR_INTERVAL if far_interval is None else far_interval
+        self.target_changes = config.REFRESH_TARGET_CHANGES if target_changes is None else target_changes
+        self.backoff_base = config.REFRESH_BACKOFF_BASE if backoff_base is None else backoff_base
+        self.backoff_max = config.REFRESH_BACKOFF_MAX if backoff_max is None else backoff_max
+        self.budget = TokenBucket(
+            config.REFRESH_BUDGET_PER_MINUTE if budget_per_minute is None else budget_per_minute,
+            config.REFRESH_BURST if burst is None else burst,
+        )
+        self.rng = rng or random.Random()
+        self.states = {}
+        self._lock = threading.Lock()
+
+    def max_interval(self, play_date, today=None):
+        """플레이 날짜까지 남은 일수에 따른 주기 상한"""
+        today = today or datetime.now().strftime("%Y-%m-%d")
+        days = (datetime.strptime(play_date, "%Y-%m-%d") - datetime.strptime(today, "%Y-%m-%d")).days
+        span = max(1, config.DAYS_AHEAD - 1)
+        ratio = min(1.0, max(0.0, days / span))
+        return self.near_interval * (self.far_interval / self.near_interval) ** ratio
+
+    def interval_for(self, state, today=None):
+        ceiling = self.max_interval(state.play_date, today)
+        if not state.change_rate:
+            return ceiling
+        return min(ceiling, max(self.min_interval, self.target_changes / state.change_rate * 3600.0))
+
+    def sync_dates(self, dates, now=None):
+        """대상 날짜 목록 반영 (새 날짜는 바로 갱신 대상, 빠진 날짜는 제거)"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            for play_date in dates:
+                if play_date not in self.states:
+                    self.states[play_date] = DateState(play_date, now)
+            for play_date in [d for d in self.states if d not in dates and not self.states[d].running]:
+                del self.states[play_date]
+
+    def observe_events(self, events):
+        """변경 이벤트를 날짜별로 세기 (ChangeBus 콜백)"""
+        with self._lock:
+            for event in events:
+                state = self.states.get(str(event.play_date)[:10])
+                if state is not None:
+                    state.pending_changes += 1
+
+    def take_due(self, now=None, limit=1):
+        """시작할 때가 된 날짜를 마감이 이른 순서로 최대 limit개 꺼냄 (예산이 허락하는 만큼)"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            ready = sorted(
+                (state for state in self.states.values() if not state.running and _start_at(state) <= now),
+                key=_start_at,
+            )
+            taken = []
+            for state in ready[:limit]:
+                if not self.budget.try_take(now):
+                    break
+                state.running = True
+                taken.append(state.play_date)
+            return taken
+
+    def next_wakeup(self, now=None):
+        """다음에 꺼낼 날짜가 생기기까지 남은 시간(초)"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            dues = [_start_at(state) for state in self.states.values() if not state.running]
+            if not dues:
+                return None
+            return max(min(dues) - now, self.budget.wait_time(now), 0.0)
+
+    def record_success(self, play_date, now=None, duration=None, today=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            state = self.states.get(play_date)
+            if state is None:
+                return None
+            if state.last_success is not None and now > state.last_success:
+                sample = state.pending_changes / (now - state.last_success) * 3600.0
+                state.change_rate = sample if state.change_rate is None else 0.3 * sample + 0.7 * state.change_rate
+            if duration is not None:
+                state.duration = duration if state.duration is None else 0.3 * duration + 0.7 * state.duration
+            state.pending_changes = 0
+            state.failures = 0
+            state.last_success = now
+            state.running = False
+            state.interval = self.interval_for(state, today)
+            state.due = now + state.interval
+            return state.interval
+
+    def record_failure(self, play_date, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            state = self.states.get(play_date)
+            if state is None:
+                return None
+            state.failures += 1
+            state.running = False
+            metrics.counter("teetime_refresh_failures_total", "날짜별 갱신 실패(재시도 예약) 수").inc()
+            delay = min(self.backoff_max, self.backoff_base * 2 ** (state.failures - 1))
+            delay *= self.rng.uniform(0.5, 1.5)
+            state.due = now + delay
+            return delay
+
+    def summary(self):
+        """날짜별 (주기, 변경 속도, 연속 실패 수)"""
+        with self._lock:
+            return {
+                play_date: (state.interval, state.change_rate, state.failures)
+                for play_date, state in sorted(self.states.items())
+            }
+
+
+def run_scheduler(scrape, on_result, dates_fn, workers=None, scheduler=None, should_stop=None, on_error=None):
+    """스케줄러에 따라 날짜별로 스크래핑을 반복
+
+    scrape(날짜)는 데이터프레임(실패하면 None, 비어 있거나 그 날짜가 stale이면 실패로 보고 백오프)을, on_result(날짜, 데이터프레임)는 결과
+    반영을 맡는다. 변경 속도를 반영하려면 scheduler.observe_events를 ChangeBus에
+    구독시켜 둔다. 스크래핑은 workers개의 스레드에서 날짜 하나씩 실행되고 결과 반영은
+    이 함수를 부른 스레드에서 한다. should_stop()이 참이 되면 진행 중인 작업을 마치고
+    돌아온다.
+    """
+    workers = max(1, config.SCRAPE_WORKERS if workers is None else workers)
+    scheduler = scheduler or RefreshScheduler()
+    should_stop = should_stop or (lambda: False)
+
+    def timed_scrape(play_date):
+        started = time.monotonic()
+        return scrape(play_date), time.monotonic() - started
+
+    running = {}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="refresh-worker") as executor:
+        while not should_stop() or running:
+            if not should_stop():
+                scheduler.sync_dates(dates_fn())
+                for play_date in scheduler.take_due(limit=workers - len(running)):
+                    running[executor.submit(timed_scrape, play_date)] = play_date
+
+            timeout = scheduler.next_wakeup() if len(running) < workers else None
+            timeout = 1.0 if timeout is None else min(max(timeout, 0.05), 1.0)
+            if running:
+                done, _ = wait(list(running), timeout=timeout, return_when=FIRST_COMPLETED)
+            else:
+                time.sleep(timeout)
+                done = ()
+
+            for future in done:
+                play_date = running.pop(future)
+                try:
+                    df, duration = future.result()
+                    if df is None or df.empty:
+                        raise RuntimeError("수집된 데이터가 없습니다")
+                    if play_date in getattr(df, "attrs", {}).get("stale_dates", ()):
+                        raise RuntimeError("새로 받지 못하고 이전 결과만 남았습니다")
+                    on_result(play_date, df)
+                    interval = scheduler.record_success(play_date, duration=duration)
+                    if interval is not None:
+                        print(f"{play_date} 갱신 완료: {len(df)}건, {duration:.1f}초, 다음 갱신까지 {interval:.0f}초")
+                except Exception as e:
+                    delay = scheduler.record_failure(play_date)
+                    if on_error is not None:
+                        on_error(play_date, e)
+                    if delay is not None:
+                        print(f"{play_date} 갱신 실패: {str(e)} ({delay:.0f}초 후 재시도)")
+    return scheduler
@@ -0,0 +1,155 @@
+"""모든 소비자가 함께 쓰는 단일 스크래핑 데몬
+
+브라우저를 띄워 사이트를 수집하는 곳은 이 프로세스 하나뿐이다. 날짜별로 갱신할 때마다
+저장소/이력/변경 감지(save_snapshot)를 거친 뒤 전체 스냅샷을 snapshot_feed로 새 버전으로
+발행하고, 데스크톱 GUI, Flask 서버(app.py), 엑셀 내보내기(store.py export --follow)는
+그 파일을 읽기만 한다. 한 번 수집으로 모든 소비자가 갱신된다. 알람 규칙(alarm_rules.py)도
+화면 없이 여기서 수집할 때마다 평가하고, 알림은 notifier로 묶어서 발송한다.
+
+    python scrape_daemon.py
+    python scrape_daemon.py --queue work_queue.db --spawn 4   # 수집은 작업 큐 워커들이
+
+--queue를 주면 데몬은 직접 수집하지 않고 날짜별 작업을 work_queue에 넣은 뒤 워커 결과를
+합쳐서 반영한다. 갱신 주기와 요청 예산은 그대로 이 데몬의 스케줄러가 정한다.
+
+같은 스냅샷 경로로 데몬을 두 개 띄우면 두 번째는 바로 종료한다.
+"""
+import argparse
+import os
+import sys
+
+import alarm_rules
+import analytics
+import config
+import notifier
+import records
+import snapshot_feed
+import work_queue
+from scheduler import RefreshScheduler, run_scheduler
+from scraper import scrape_golf_data, save_snapshot, target_dates, change_bus
+
+
+def acquire_lock(snapshot_path=None):
+    """스냅샷 경로별 데몬 단일 실행 잠금 (이미 실행 중이면 RuntimeError)
+
+    반환한 파일 객체를 닫거나 프로세스가 끝나면 잠금이 풀린다.
+    """
+    path = (snapshot_path or config.SNAPSHOT_PATH) + ".lock"
+    handle = open(path, "a+")
+    try:
+        try:
+            import fcntl
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except ImportError:  # Windows
+            import msvcrt
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        handle.close()
+        raise RuntimeError(f"스크래핑 데몬이 이미 실행 중입니다 ({path})")
+    handle.seek(0)
+    handle.truncate()
+    handle.write(str(os.getpid()))
+    handle.flush()
+    return handle
+
+
+class ScrapeDaemon:
+    """날짜별 적응형 주기로 수집하고 갱신될 때마다 전체 스냅샷을 발행"""
+
+    def __init__(self, publisher=None, scheduler=None, rules=None, dispatcher=None, queue=None):
+        self.queue = queue
+        # 수집 방식: 큐 모드면 워커들에게 맡기고, 아니면 이 프로세스의 웜 브라우저로
+        self._scrape = work_queue.QueueScraper(queue) if queue is not None else self._scrape_local
+        self.publisher = publisher or snapshot_feed.SnapshotPublisher()
+        self.scheduler = scheduler or RefreshScheduler()
+        change_bus.subscribe(self.scheduler.observe_events)
+        self.rules = rules or alarm_rules.RuleEngine()
+        self.notifier = dispatcher or notifier.NotificationDispatcher(notifier.build_sinks())
+        self.rules.bus.subscribe(self.notifier.submit)
+        self.latest_by_date = {}
+        self.stale = set()  # 이전 스냅샷에서 이어 쓰고 있는 (아직 다시 받지 못한) 날짜
+
+        # 재시작해도 아직 갱신하지 않은 날짜가 스냅샷에서 빠지지 않도록 마지막 스냅샷에서 이어감
+        previous = snapshot_feed.warm_start(self.publisher.path)
+        if previous is not None:
+            frame, _ = previous
+            for play_date in target_dates():
+                rows = snapshot_feed.select_dates(frame, [play_date])
+                if len(rows):
+                    self.latest_by_date[play_date] = rows
+                    self.stale.add(play_date)
+            # 알람 규칙은 이어 쓴 데이터로 기준점을 잡지 않음 (꺼져 있던 동안의 변화로 알림이 쏟아지지 않도록)
+
+    def scrape_one(self, play_date):
+        return self._scrape(play_date)
+
+    def _scrape_local(self, play_date):
+        # 날짜마다 갱신 주기가 달라서 한 번에 한 날짜씩 수집 (워커 스레드마다 웜 브라우저 사용)
+        # 실패한 날짜의 재시도는 요청 예산을 쓰는 스케줄러 백오프에 맡김 (여기서 다시 받지 않음)
+        return scrape_golf_data(workers=1, dates=[play_date], retries=0)
+
+    def on_result(self, play_date, df):
+        print(f"\n{play_date} 수집된 데이터 수: {len(df)}")
+        if not save_snapshot(df):
+            raise RuntimeError("데이터 업데이트 실패")
+
+        self.rules.evaluate(df)
+
+        self.latest_by_date[play_date] = df
+        self.stale.discard(play_date)
+        dates = target_dates()
+        for old_date in [d for d in self.latest_by_date if d not in dates]:
+            del self.latest_by_date[old_date]
+            self.stale.discard(old_date)
+        self.rules.forget_before(dates[0])
+        analytics.get_views().forget_before(dates[0])
+        if self.queue is not None:
+            self.queue.prune(dates[0])
+        frame = records.concat([self.latest_by_date[d] for d in dates if d in self.latest_by_date])
+        version = self.publisher.publish(frame, [play_date], self.stale)
+        print(f"스냅샷 v{version} 발행: {self.publisher.path} ({len(frame)}건)")
+
+    def run(self, should_stop=None):
+        print("\n데이터 수집 시작")
+        try:
+            # 큐 모드에서 스레드는 결과를 기다리기만 하므로 모든 날짜를 동시에 넣어 둠
+            workers = len(target_dates()) if self.queue is not None else None
+            run_scheduler(self.scrape_one, self.on_result, target_dates, workers=workers,
+                          scheduler=self.scheduler, should_stop=should_stop)
+        finally:
+            self.notifier.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스크래핑 데몬 (스냅샷을 발행하고 다른 프로그램은 구독)")
+    parser.add_argument("--snapshot", default=config.SNAPSHOT_PATH, help="발행할 스냅샷 파일 경로")
+    parser.add_argument("--queue", default=config.QUEUE_PATH or None,
+                        help="작업 큐 파일 경로 (지정하면 워커들이 수집)")
+    parser.add_argument("--spawn", type=int, default=0, help="같은 호스트에 띄울 큐 워커 프로세스 수")
+    args = parser.parse_args()
+    if args.spawn and not args.queue:
+        args.queue = "work_queue.db"
+
+    try:
+        lock = acquire_lock(args.snapshot)
+    except RuntimeError as e:
+        print(str(e))
+        return 1
+    queue = work_queue.WorkQueue(args.queue) if args.queue else None
+    workers = work_queue.spawn_workers(args.spawn, queue.path) if args.spawn else []
+    try:
+        ScrapeDaemon(snapshot_feed.SnapshotPublisher(args.snapshot), queue=queue).run()
+    except KeyboardInterrupt:
+        print("\n프로그램을 종료합니다.")
+    finally:
+        for process in workers:
+            process.terminate()
+        for process in workers:
+            process.wait()
+        lock.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,324 @@
+import atexit
+import time
+import threading
+import multiprocessing.util
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+import analytics
+import browser
+import config
+import fetchers
+import history
+import metrics
+import records
+import store
+from diff_engine import ChangeBus, DiffEngine
+from listing_parser import parse_listing
+
+
+class RateLimiter:
+    """워커별 요청 간 최소 간격을 보장하는 레이트 리미터"""
+
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self._last = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            delay = self._last + self.min_interval - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self._last = time.monotonic()
+
+
+def target_dates(days=None, start=None):
+    """오늘부터 days일간의 날짜 문자열 목록"""
+    current_date = start or datetime.now()
+    days = config.DAYS_AHEAD if days is None else days
+    return [(current_date + timedelta(days=offset)).strftime("%Y-%m-%d") for offset in range(days)]
+
+
+def parse_date(html, formatted_date, scraping_date):
+    """날짜 하나의 HTML을 정규화된 골프장 레코드(TeeTime) 목록으로 변환"""
+    with metrics.span("parse"):
+        rows = records.normalize(parse_listing(html, formatted_date, scraping_date))
+    metrics.counter("teetime_rows_parsed_total", "파싱한 골프장 수").inc(len(rows))
+    return rows
+
+
+def scrape_date(fetcher, formatted_date, scraping_date):
+    """하나의 날짜 페이지를 스크래핑해 정규화된 골프장 레코드(TeeTime) 목록 반환"""
+    with metrics.span("fetch", fetcher=fetcher.name):
+        html = fetcher.fetch(formatted_date)
+    return parse_date(html, formatted_date, scraping_date)
+
+
+_worker_local = threading.local()
+
+# 스냅샷 변경 이벤트 (구독: change_bus.subscribe(callback, [diff_engine.TeamsChanged, ...]))
+change_bus = ChangeBus()
+change_detector = DiffEngine(change_bus)
+
+# 날짜별 마지막 스크롤 결과 (라운드 수, 로드된 항목 수, 소요 시간)
+scroll_telemetry = {}
+
+# 날짜별 마지막으로 성공한 수집 결과 (실패한 날짜는 이 값을 stale로 표시해 돌려줌)
+_checkpoints = {}
+_checkpoints_lock = threading.Lock()
+
+
+def _local_fetcher():
+    """워커에 묶인 SeleniumFetcher (스크롤 적응 상태를 사이클 사이에 유지)"""
+    fetcher = getattr(_worker_local, "fetcher", None)
+    if fetcher is None:
+        fetcher = fetchers.SeleniumFetcher(session=browser.local_session())
+        _worker_local.fetcher = fetcher
+    return fetcher
+
+
+def _local_limiter(min_interval):
+    """워커에 묶인 RateLimiter (날짜 하나씩 호출해도 마지막 요청 시각이 이어짐)"""
+    limiter = getattr(_worker_local, "limiter", None)
+    if limiter is None:
+        limiter = _worker_local.limiter = RateLimiter(min_interval)
+    limiter.min_interval = min_interval
+    return limiter
+
+
+def scrape_dates_worker(dates, scraping_date, min_interval):
+    """워커 하나가 자신의 웜 브라우저로 할당된 날짜들을 순서대로 스크래핑
+
+    스레드/프로세스 풀 모두에서 쓸 수 있도록 모듈 최상위 함수로 둔다.
+    브라우저와 요청 간격 제한은 워커에 묶여 사이클 사이에 재사용된다.
+    한 날짜가 실패해도 나머지 날짜는 계속 수집한다.
+    반환값은 ({날짜: 데이터 목록}, {날짜: 스크롤 결과 딕셔너리}, {날짜: 오류 메시지}).
+    """
+    limiter = _local_limiter(min_interval)
+    fetcher = _local_fetcher()
+    results = {}
+    scroll_stats = {}
+    errors = {}
+    for formatted_date in dates:
+        limiter.wait()
+        try:
+            results[formatted_date] = scrape_date(fetcher, formatted_date, scraping_date)
+        except Exception as e:
+            errors[formatted_date] = f"{type(e).__name__}: {str(e)}"
+            continue
+        if formatted_date in fetcher.scroll_stats:
+            scroll_stats[formatted_date] = fetcher.scroll_stats[formatted_date].as_dict()
+    return results, scroll_stats, errors
+
+
+def _init_process_worker():
+    """프로세스 워커 종료 시 브라우저도 함께 종료되도록 등록"""
+    multiprocessing.util.Finalize(None, browser.close_all_sessions, exitpriority=10)
+
+
+_executor = None
+_executor_key = None
+_executor_lock = threading.Lock()
+_http_fetcher = None
+
+
+def _get_executor(mode, workers):
+    """사이클 사이에 유지되는 워커 풀 (워커별 브라우저를 웜 상태로 유지하기 위함)"""
+    global _executor, _executor_key
+    with _executor_lock:
+        if _executor is not None and _executor_key != (mode, workers):
+            _executor.shutdown(wait=True)
+            _executor = None
+        if _executor is None:
+            if mode == "process":
+                _executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_process_worker)
+            else:
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scrape-worker")
+            _executor_key = (mode, workers)
+        return _executor
+
+
+def _get_http_fetcher():
+    """사이클 사이에 연결 풀을 유지하는 HTTP fetcher"""
+    global _http_fetcher
+    with _executor_lock:
+        if _http_fetcher is None:
+            _http_fetcher = fetchers.HttpFetcher()
+        return _http_fetcher
+
+
+def shutdown_workers():
+    """워커 풀과 모든 웜 브라우저, HTTP 연결 종료"""
+    global _executor, _executor_key, _http_fetcher
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
+            _executor_key = None
+        if _http_fetcher is not None:
+            _http_fetcher.close()
+            _http_fetcher = None
+    browser.close_all_sessions()
+
+
+atexit.register(shutdown_workers)
+
+
+def _split_dates(dates, workers):
+    """날짜를 워커 수만큼 라운드로빈으로 분배 (가까운 날짜와 먼 날짜가 섞이도록)"""
+    chunks = [dates[i::workers] for i in range(workers)]
+    return [chunk for chunk in chunks if chunk]
+
+
+def _scrape_round(dates, fetcher, workers, mode, scraping_date, min_interval):
+    """날짜들을 한 번씩 수집해 ({날짜: 데이터 목록}, {날짜: 오류 메시지}) 반환"""
+    if fetcher == fetchers.HttpFetcher.name:
+        with metrics.span("fetch", fetcher=fetcher):
+            htmls = _get_http_fetcher().fetch_many(dates, return_exceptions=True)
+        results, errors = {}, {}
+        for formatted_date, html in htmls.items():
+            try:
+                if isinstance(html, BaseException):
+                    raise html
+                results[formatted_date] = parse_date(html, formatted_date, scraping_date)
+            except Exception as e:
+                errors[formatted_date] = f"{type(e).__name__}: {str(e)}"
+        return results, errors
+
+    chunks = _split_dates(dates, max(1, min(workers, len(dates))))
+    if len(chunks) == 1:
+        outcomes = [scrape_dates_worker(chunks[0], scraping_date, min_interval)]
+    else:
+        executor = _get_executor(mode, len(chunks))
+        futures = [
+            executor.submit(scrape_dates_worker, chunk, scraping_date, min_interval)
+            for chunk in chunks
+        ]
+        outcomes = []
+        for chunk, future in zip(chunks, futures):
+            try:
+                outcomes.append(future.result())
+            except Exception as e:  # 워커 프로세스가 죽은 경우 등
+                outcomes.append(({}, {}, {formatted_date: f"{type(e).__name__}: {str(e)}" for formatted_date in chunk}))
+
+    results, errors = {}, {}
+    for chunk_results, chunk_scroll_stats, chunk_errors in outcomes:
+        results.update(chunk_results)
+        errors.update(chunk_errors)
+        scroll_telemetry.update(chunk_scroll_stats)
+    return results, errors
+
+
+def stale_dates(df):
+    """scrape_golf_data 결과에서 이번에 새로 받지 못한 날짜 목록"""
+    return list(getattr(df, "attrs", {}).get("stale_dates", []))
+
+
+def scrape_golf_data(workers=None, mode=None, min_interval=None, dates=None, fetcher=None,
+                     retries=None, on_date=None):
+    """티스캐너의 모든 골프장 데이터를 스크래핑
+
+    fetcher가 'http'면 브라우저 없이 하나의 연결 풀로 모든 날짜를 동시에 받는다.
+    'selenium'이고 workers가 2 이상이면 날짜를 워커 브라우저 풀에 나눠서 동시에
+    수집한다(mode는 'thread' 또는 'process'). 결과는 날짜 순서대로 합쳐 타입이 있는
+    데이터프레임(records.to_frame: 가격/팀 수는 정수, 티타임은 분 배열)으로 반환한다.
+
+    날짜마다 따로 성공/실패를 판단한다. 성공한 날짜는 바로 체크포인트로 남기고
+    (on_date(날짜, 레코드 목록)도 호출), 실패한 날짜만 점점 길게 기다리며 retries번까지
+    다시 수집한다. 끝내 실패한 날짜는 마지막으로 성공한 결과로 채우고
+    df.attrs['stale_dates'](stale_dates(df))에 표시한다. 모든 날짜가 실패했고
+    채울 결과도 없으면 None. run_scheduler에서 부를 때는 retries=0으로 두어 재시도가
+    스케줄러의 요청 예산과 백오프를 거치게 한다.
+    """
+    workers = config.SCRAPE_WORKERS if workers is None else workers
+    mode = mode or config.SCRAPE_POOL_MODE
+    min_interval = config.WORKER_MIN_INTERVAL if min_interval is None else min_interval
+    fetcher = fetcher or config.FETCHER
+    retries = config.SCRAPE_DATE_RETRIES if retries is None else retries
+    dates = dates or target_dates()
+    scraping_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    with metrics.span("scrape_cycle"):
+        results = {}
+        errors = {}
+        pending = list(dates)
+        for attempt in range(retries + 1):
+            if attempt:
+                delay = min(config.SCRAPE_RETRY_BACKOFF_MAX, config.SCRAPE_RETRY_BACKOFF * 2 ** (attempt - 1))
+                print(f"실패한 날짜 재시도 ({attempt}/{retries}, {delay:.0f}초 후): {', '.join(pending)}")
+                metrics.counter("teetime_date_retries_total", "사이클 안에서 다시 수집한 날짜 수").inc(len(pending))
+                time.sleep(delay)
+            try:
+                round_results, round_errors = _scrape_round(pending, fetcher, workers, mode, scraping_date, min_interval)
+            except Exception as e:
+                round_results, round_errors = {}, {formatted_date: f"{type(e).__name__}: {str(e)}" for formatted_date in pending}
+
+            for formatted_date, rows in round_results.items():
+                results[formatted_date] = rows
+                errors.pop(formatted_date, None)
+                with _checkpoints_lock:
+                    _checkpoints[formatted_date] = rows
+                if on_date is not None:
+                    on_date(formatted_date, rows)
+            errors.update(round_errors)
+            pending = [formatted_date for formatted_date in pending if formatted_date in round_errors]
+            if not pending:
+                break
+
+        stale = []
+        data_list = []
+        for formatted_date in dates:
+            if formatted_date in results:
+                data_list.extend(results[formatted_date])
+                continue
+            stale.append(formatted_date)
+            metrics.counter("teetime_date_failures_total", "재시도 후에도 실패한 날짜 수").inc()
+            print(f"스크래핑 중 오류 발생 ({formatted_date}): {errors.get(formatted_date)}")
+            with _checkpoints_lock:
+                data_list.extend(_checkpoints.get(formatted_date, []))
+
+        if not data_list and stale:
+            metrics.counter("teetime_scrape_errors_total", "스크래핑 사이클 오류 수").inc()
+            return None
+        with metrics.span("frame"):
+            df = records.to_frame(data_list)
+        df.attrs["stale_dates"] = stale
+        if stale:
+            print(f"일부 날짜는 이전 결과를 사용합니다 (stale): {', '.join(stale)}")
+        return df
+
+
+def save_snapshot(df):
+    """스크래핑 결과를 저장소에 upsert (값이 바뀐 행만 기록)
+
+    엑셀 파일은 더 이상 매 사이클 다시 쓰지 않는다. 필요할 때
+    `python store.py export`로 저장소에서 내보낸다.
+    """
+    try:
+        started = time.perf_counter()
+        with metrics.span("to_records"):
+            rows = records.to_records(df)
+        with metrics.span("store"):
+            written = store.get_store().upsert(rows)
+        elapsed = time.perf_counter() - started
+        with metrics.span("history"):
+            observed = history.get_writer().append(rows)
+        with metrics.span("diff"):
+            events = change_detector.update(rows)
+        with metrics.span("analytics"):
+            analytics.get_views().update(rows)
+        metrics.counter("teetime_rows_written_total", "저장소에 실제로 기록된 행 수").inc(written)
+        metrics.counter("teetime_change_events_total", "발행된 변경 이벤트 수").inc(len(events))
+
+        total, courses, first, last = store.get_store().stats()
+        print(f"데이터 저장 완료: {config.STORE_PATH} (변경 {written}건, {elapsed * 1000:.0f}ms, 이력 {observed}건, 이벤트 {len(events)}건)")
+        print(f"총 레코드 수: {total}")
+        print(f"유니크 골프장 수: {courses}")
+        print(f"날짜 범위: {first} ~ {last}")
+
+        return True
+
+    except Exception as e:
+        print(f"파일 저장 중 오류 발생: {str(e)}")
+        return False
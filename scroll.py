@@ -0,0 +1,145 @@
+import time
+
+import config
+
+ITEM_CLASS = "golf-inner-info"
+
+# 페이지에 한 번만 설치되는 관찰 훅
+# - MutationObserver로 마지막 DOM 변경 시각 기록
+# - fetch/XHR을 감싸서 진행 중인 요청 수 집계 (네트워크 idle 판정용)
+INSTALL_HOOKS_JS = """
+if (!window.__teetimeHook) {
+    window.__teetimeHook = true;
+    window.__teetimePending = 0;
+    window.__teetimeLastMutation = performance.now();
+    new MutationObserver(function () {
+        window.__teetimeLastMutation = performance.now();
+    }).observe(document.body, {childList: true, subtree: true});
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function () {
+            window.__teetimePending++;
+            return originalFetch.apply(this, arguments).finally(function () {
+                window.__teetimePending--;
+            });
+        };
+    }
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        window.__teetimePending++;
+        this.addEventListener('loadend', function () { window.__teetimePending--; });
+        return originalSend.apply(this, arguments);
+    };
+}
+return document.getElementsByClassName(arguments[0]).length;
+"""
+
+# 맨 아래로 스크롤한 뒤 골프장 수가 늘고 DOM/네트워크가 잠잠해질 때까지 브라우저 안에서 대기
+SCROLL_AND_WAIT_JS = """
+var itemClass = arguments[0], previous = arguments[1], timeoutMs = arguments[2], quietMs = arguments[3];
+var done = arguments[arguments.length - 1];
+var start = performance.now();
+window.scrollTo(0, document.body.scrollHeight);
+(function poll() {
+    var count = document.getElementsByClassName(itemClass).length;
+    var now = performance.now();
+    var pending = window.__teetimePending || 0;
+    var quiet = pending === 0 && now - (window.__teetimeLastMutation || 0) >= quietMs;
+    if (count > previous && quiet) {
+        return done({count: count, grew: true, pending: pending, waited: now - start});
+    }
+    if (now - start >= timeoutMs) {
+        return done({count: count, grew: count > previous, pending: pending, waited: now - start});
+    }
+    setTimeout(poll, 30);
+})();
+"""
+
+
+class ScrollStats:
+    """날짜 하나의 스크롤 결과"""
+
+    __slots__ = ("round_day", "rounds", "items", "seconds", "hit_ceiling")
+
+    def __init__(self, round_day, rounds=0, items=0, seconds=0.0, hit_ceiling=False):
+        self.round_day = round_day
+        self.rounds = rounds
+        self.items = items
+        self.seconds = seconds
+        self.hit_ceiling = hit_ceiling
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return (f"ScrollStats({self.round_day}: {self.rounds}회, {self.items}개, "
+                f"{self.seconds:.2f}초{', 상한 도달' if self.hit_ceiling else ''})")
+
+
+class AdaptiveScroller:
+    """실제 신호(골프장 수 증가, 네트워크 idle, DOM 변경)를 기다리는 무한 스크롤 엔진
+
+    라운드마다 고정 2초를 쉬는 대신 새 항목이 로드될 때까지만 기다린다. 라운드
+    대기 한도는 지금까지 관찰한 로딩 시간의 지수 이동 평균에 맞춰 조정되고,
+    전체 시간과 라운드 수에는 하드 상한이 있다. 네트워크 요청이 남아 있는데
+    항목이 늘지 않았다면 한 번 더 기다린 후 종료한다.
+    """
+
+    def __init__(self, initial_timeout=None, min_timeout=None, max_timeout=None,
+                 quiet_ms=None, max_seconds=None, max_rounds=None):
+        self.timeout = config.SCROLL_ROUND_TIMEOUT if initial_timeout is None else initial_timeout
+        self.min_timeout = config.SCROLL_MIN_TIMEOUT if min_timeout is None else min_timeout
+        self.max_timeout = config.SCROLL_MAX_TIMEOUT if max_timeout is None else max_timeout
+        self.quiet_ms = config.SCROLL_QUIET_MS if quiet_ms is None else quiet_ms
+        self.max_seconds = config.SCROLL_MAX_SECONDS if max_seconds is None else max_seconds
+        self.max_rounds = config.SCROLL_MAX_ROUNDS if max_rounds is None else max_rounds
+        self._load_time = None  # 관찰된 로딩 시간(초)의 이동 평균
+
+    def _observe_load_time(self, seconds):
+        if self._load_time is None:
+            self._load_time = seconds
+        else:
+            self._load_time = 0.7 * self._load_time + 0.3 * seconds
+        # 평균 로딩 시간의 3배를 다음 대기 한도로 사용
+        self.timeout = min(self.max_timeout, max(self.min_timeout, self._load_time * 3))
+
+    def scroll(self, driver, round_day=None):
+        """끝까지 스크롤하고 ScrollStats 반환"""
+        started = time.monotonic()
+        deadline = started + self.max_seconds
+        driver.set_script_timeout(self.max_timeout + 5)
+
+        count = driver.execute_script(INSTALL_HOOKS_JS, ITEM_CLASS)
+        stats = ScrollStats(round_day)
+        extra_wait_used = False
+
+        while stats.rounds < self.max_rounds:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                stats.hit_ceiling = True
+                break
+
+            timeout = min(self.timeout, remaining)
+            result = driver.execute_async_script(
+                SCROLL_AND_WAIT_JS, ITEM_CLASS, count, int(timeout * 1000), self.quiet_ms
+            )
+            stats.rounds += 1
+
+            if result["grew"]:
+                self._observe_load_time(result["waited"] / 1000)
+                count = result["count"]
+                extra_wait_used = False
+                continue
+
+            # 요청이 아직 진행 중이면 한 번은 최대 한도로 더 기다림
+            if result["pending"] and not extra_wait_used:
+                extra_wait_used = True
+                self.timeout = self.max_timeout
+                continue
+            break
+        else:
+            stats.hit_ceiling = True
+
+        stats.items = count
+        stats.seconds = time.monotonic() - started
+        return stats
@@ -0,0 +1,220 @@
+"""티타임 슬롯 검색 색인
+
+스냅샷의 play_time을 슬롯 하나하나로 펼쳐 플레이 날짜별 파티션에 시각순으로 정렬해
+두고, "토요일 06:00~08:00 경기 15만원 이하" 같은 조회를 시각 범위 이진 탐색과 열 배열
+마스크로 처리한다. 사이클마다 들어온 날짜의 파티션만 다시 만들고(내용이 같으면 건너뜀)
+조회할 때는 다시 계산하지 않는다.
+
+    index = SlotIndex()
+    index.update(df)
+    index.query(weekday='sat', start='06:00', end='08:00', region='경기', max_price=150000)
+"""
+import threading
+from datetime import datetime
+
+import numpy as np
+
+import records
+
+WEEKDAYS = {
+    'mon': 0, 'tue': 1, 'wed': 2, 'thu': 3, 'fri': 4, 'sat': 5, 'sun': 6,
+    '월': 0, '화': 1, '수': 2, '목': 3, '금': 4, '토': 5, '일': 6,
+}
+MAX_LIMIT = 1000
+
+
+def parse_weekday(value):
+    """'sat', '토', '5' → 5 (월요일 0)"""
+    if value is None or isinstance(value, int):
+        return value
+    text = str(value).strip().lower()
+    if text.isdigit() and int(text) < 7:
+        return int(text)
+    if text[:3] in WEEKDAYS:
+        return WEEKDAYS[text[:3]]
+    if text[:1] in WEEKDAYS:
+        return WEEKDAYS[text[:1]]
+    raise ValueError(f"알 수 없는 요일: {value}")
+
+
+def parse_clock(value):
+    """'06:00' → 360, 정수는 분으로 간주"""
+    if value is None or isinstance(value, int):
+        return value
+    minutes = records.parse_minutes(str(value))
+    if not minutes:
+        raise ValueError(f"잘못된 시각: {value}")
+    return minutes[0]
+
+
+class DatePartition:
+    """플레이 날짜 하나의 슬롯 (시각순 정렬)과 골프장별 열 배열"""
+
+    __slots__ = ("play_date", "weekday", "fingerprint", "minutes", "slot_course",
+                 "names", "locations", "regions", "region_codes", "prices", "teams")
+
+    def __init__(self, play_date, rows, fingerprint):
+        self.play_date = play_date
+        self.weekday = datetime.strptime(play_date, "%Y-%m-%d").weekday()
+        self.fingerprint = fingerprint
+
+        self.names = [row['golf_course'] for row in rows]
+        self.locations = [row['location'] for row in rows]
+        self.prices = np.array([np.nan if row['price'] is None else row['price'] for row in rows], dtype=float)
+        self.teams = np.array([np.nan if row['remaining_teams'] is None else row['remaining_teams'] for row in rows],
+                              dtype=float)
+
+        # 지역은 정수 코드로 바꿔서 비교
+        self.regions = {}
+        codes = []
+        for location in self.locations:
+            region = records.region_of(location)
+            codes.append(self.regions.setdefault(region, len(self.regions)))
+        self.region_codes = np.array(codes, dtype=np.int32)
+
+        minutes = []
+        courses = []
+        for course, row in enumerate(rows):
+            play_time = records.parse_minutes(row['play_time'])
+            minutes.extend(play_time)
+            courses.extend([course] * len(play_time))
+        order = np.argsort(np.array(minutes, dtype=np.uint16), kind="stable")
+        self.minutes = np.array(minutes, dtype=np.uint16)[order]
+        self.slot_course = np.array(courses, dtype=np.int32)[order]
+
+    @property
+    def slot_count(self):
+        return len(self.minutes)
+
+    def query(self, start=None, end=None, region=None, min_price=None, max_price=None, min_teams=None):
+        """조건에 맞는 (분, 골프장 번호) 배열"""
+        lo = 0 if start is None else np.searchsorted(self.minutes, start, side="left")
+        hi = len(self.minutes) if end is None else np.searchsorted(self.minutes, end, side="right")
+        minutes = self.minutes[lo:hi]
+        courses = self.slot_course[lo:hi]
+        if not len(courses):
+            return minutes, courses
+
+        mask = None
+        if region is not None:
+            wanted = [code for name, code in self.regions.items() if name is not None and name.startswith(region)]
+            mask = np.isin(self.region_codes[courses], wanted)
+        for values, bound, upper in ((self.prices, min_price, False), (self.prices, max_price, True),
+                                     (self.teams, min_teams, False)):
+            if bound is None:
+                continue
+            selected = values[courses]
+            condition = selected <= bound if upper else selected >= bound
+            mask = condition if mask is None else mask & condition
+        if mask is not None:
+            minutes, courses = minutes[mask], courses[mask]
+        return minutes, courses
+
+
+def _fingerprint(rows):
+    return hash(tuple(
+        (row['golf_course'], row['location'], row['price'], row['remaining_teams'], bytes(records.parse_minutes(row['play_time'])))
+        for row in rows
+    ))
+
+
+class SlotIndex:
+    """플레이 날짜별 슬롯 파티션 모음"""
+
+    def __init__(self):
+        self._partitions = {}
+        self._lock = threading.Lock()
+
+    def update(self, snapshot, dates=None):
+        """스냅샷(데이터프레임 또는 레코드 목록)에 들어 있는 날짜의 파티션을 교체
+
+        내용이 같은 날짜는 다시 만들지 않는다. dates를 주면 그 밖의 날짜
+        파티션은 지난 것으로 보고 제거한다. 다시 만든 날짜 목록을 반환한다.
+        """
+        by_date = {}
+        for row in records.to_records(snapshot):
+            by_date.setdefault(str(row['play_date'])[:10], []).append(row)
+
+        rebuilt = []
+        for play_date, rows in by_date.items():
+            fingerprint = _fingerprint(rows)
+            current = self._partitions.get(play_date)
+            if current is not None and current.fingerprint == fingerprint:
+                continue
+            partition = DatePartition(play_date, rows, fingerprint)
+            with self._lock:
+                self._partitions[play_date] = partition
+            rebuilt.append(play_date)
+
+        if dates is not None:
+            with self._lock:
+                for play_date in [d for d in self._partitions if d not in dates]:
+                    del self._partitions[play_date]
+        return rebuilt
+
+    def dates(self):
+        return sorted(self._partitions)
+
+    @property
+    def slot_count(self):
+        return sum(partition.slot_count for partition in self._partitions.values())
+
+    def query(self, play_date=None, weekday=None, start=None, end=None, region=None,
+              min_price=None, max_price=None, min_teams=None, limit=None):
+        """조건에 맞는 티타임 슬롯 목록 (날짜, 시각순)
+
+        play_date('YYYY-MM-DD' 또는 목록), weekday('sat', '토', 0~6), start/end('HH:MM', 포함),
+        region(지역 접두어, 예: '경기'), 가격 범위(원), min_teams로 거른다.
+        """
+        weekday = parse_weekday(weekday)
+        start = parse_clock(start)
+        end = parse_clock(end)
+        if isinstance(play_date, str):
+            play_date = (play_date,)
+
+        with self._lock:
+            partitions = sorted(self._partitions.items())
+        results = []
+        for date, partition in partitions:
+            if play_date is not None and date not in play_date:
+                continue
+            if weekday is not None and partition.weekday != weekday:
+                continue
+            minutes, courses = partition.query(start, end, region, min_price, max_price, min_teams)
+            for minute, course in zip(minutes.tolist(), courses.tolist()):
+                price = partition.prices[course]
+                teams = partition.teams[course]
+                results.append({
+                    'play_date': date,
+                    'tee_time': f"{minute // 60:02d}:{minute % 60:02d}",
+                    'golf_course': partition.names[course],
+                    'location': partition.locations[course],
+                    'price': None if price != price else int(price),
+                    'remaining_teams': None if teams != teams else int(teams),
+                })
+                if limit is not None and len(results) >= limit:
+                    return results
+        return results
+
+
+QUERY_PARAMS = ("play_date", "weekday", "start", "end", "region", "min_price", "max_price", "min_teams")
+
+
+def flask_response(index, request):
+    """/api/slots 응답 (잘못된 파라미터는 400)"""
+    from flask import Response
+    from api_snapshot import dumps
+
+    args = request.args
+    try:
+        filters = {name: args.get(name) or None for name in QUERY_PARAMS}
+        if args.getlist("play_date"):
+            filters["play_date"] = args.getlist("play_date")
+        for name in ("min_price", "max_price", "min_teams"):
+            if filters[name] is not None:
+                filters[name] = int(filters[name])
+        limit = min(MAX_LIMIT, max(1, int(args.get("limit", 200))))
+        results = index.query(limit=limit, **filters)
+    except ValueError as e:
+        return Response(dumps({"error": str(e)}), status=400, mimetype="application/json")
+    return Response(dumps({"count": len(results), "slots": results}), mimetype="application/json")
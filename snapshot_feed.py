@@ -0,0 +1,238 @@
+"""수집 데몬이 쓰고 GUI/웹/엑셀 내보내기가 읽는 버전 붙은 스냅샷 파일
+
+스크래핑은 scrape_daemon.py 하나만 하고, 갱신된 전체 스냅샷을 Arrow IPC 파일
+(TEETIME_SNAPSHOT)로 통째로 교체(임시 파일 + os.replace)한다. 읽는 쪽은 반쯤 쓰인 파일을
+볼 일이 없고, 파일을 메모리 맵으로 열어 바로 타입이 있는 데이터프레임으로 바꾼다.
+
+    publisher = SnapshotPublisher()
+    publisher.publish(frame, updated=['2024-12-07'])
+
+    subscriber = SnapshotSubscriber(lambda frame, info: ...)
+    subscriber.start()
+
+구독자는 파일의 stat 값(mtime, 크기, inode)만 주기적으로 확인하다가 바뀌었을 때만 읽는다.
+"""
+import json
+import os
+import threading
+import time
+from array import array
+
+import config
+import metrics
+import records
+
+METADATA_KEY = b"teetime.snapshot"
+
+
+def _pa():
+    import pyarrow as pa
+    return pa
+
+
+def snapshot_schema():
+    pa = _pa()
+    return pa.schema([
+        ("scraping_date", pa.dictionary(pa.int32(), pa.string())),
+        ("play_date", pa.dictionary(pa.int32(), pa.string())),
+        ("golf_course", pa.dictionary(pa.int32(), pa.string())),
+        ("location", pa.dictionary(pa.int32(), pa.string())),
+        ("price", pa.int32()),
+        ("rating", pa.float64()),
+        ("remaining_teams", pa.int16()),
+        ("play_time", pa.list_(pa.uint16())),
+    ])
+
+
+def _play_time_array(values):
+    """array('H') 목록 → list<uint16> 배열 (파이썬 리스트를 거치지 않음)"""
+    import numpy as np
+    pa = _pa()
+
+    lengths = np.fromiter((len(value) for value in values), dtype=np.int32, count=len(values))
+    offsets = np.zeros(len(values) + 1, dtype=np.int32)
+    np.cumsum(lengths, out=offsets[1:])
+    flat = np.frombuffer(b"".join(bytes(records.parse_minutes(value)) for value in values), dtype=np.uint16)
+    return pa.ListArray.from_arrays(pa.array(offsets), pa.array(flat, type=pa.uint16()))
+
+
+def to_table(frame, metadata=None):
+    """타입이 있는 데이터프레임 → Arrow 테이블"""
+    pa = _pa()
+    schema = snapshot_schema()
+    arrays = []
+    for field in schema:
+        if field.name == "play_time":
+            arrays.append(_play_time_array(frame["play_time"].tolist()))
+        elif pa.types.is_dictionary(field.type):
+            values = frame[field.name].astype(object).where(frame[field.name].notna(), None)
+            arrays.append(pa.array(values.tolist(), type=pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(frame[field.name], type=field.type, from_pandas=True))
+    table = pa.Table.from_arrays(arrays, schema=schema)
+    if metadata:
+        table = table.replace_schema_metadata({METADATA_KEY: json.dumps(metadata).encode()})
+    return table
+
+
+def from_table(table):
+    """Arrow 테이블 → 타입이 있는 데이터프레임 (records.to_frame과 같은 열/타입)"""
+    import numpy as np
+
+    frame = table.drop_columns(["play_time"]).to_pandas()
+    column = table.column("play_time").combine_chunks()
+    offsets = column.offsets.to_numpy()
+    flat = column.values.to_numpy(zero_copy_only=False).astype(np.uint16).tobytes()
+    play_time = []
+    for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist()):
+        minutes = array('H')
+        minutes.frombytes(flat[start * 2:end * 2])
+        play_time.append(minutes)
+    frame["play_time"] = play_time
+    return frame[list(records.FIELDS)].astype(records.FRAME_DTYPES)
+
+
+def select_dates(frame, dates):
+    """스냅샷에서 주어진 플레이 날짜의 행만"""
+    return frame[frame["play_date"].isin(list(dates))]
+
+
+def read_snapshot(path=None):
+    """스냅샷 파일을 읽어 (데이터프레임, 정보) 반환 (없으면 None)
+
+    정보는 version, published_at, updated(이번에 갱신된 날짜), dates, stale(발행한 쪽이
+    아직 새로 받지 못하고 이전 결과를 이어 쓰는 날짜) 딕셔너리.
+    """
+    import pyarrow.ipc as ipc
+    pa = _pa()
+
+    path = path or config.SNAPSHOT_PATH
+    try:
+        with pa.memory_map(path) as source:
+            table = ipc.open_file(source).read_all()
+    except (FileNotFoundError, pa.ArrowInvalid):
+        return None
+    info = json.loads((table.schema.metadata or {}).get(METADATA_KEY, b"{}"))
+    return from_table(table), info
+
+
+def warm_start(path=None):
+    """시작할 때 마지막 스냅샷을 불러옴 (없으면 None)
+
+    다시 수집하기 전까지는 모든 날짜가 이전 데이터이므로 info['stale']을 전체 날짜로 바꿔 반환한다.
+    """
+    started = time.perf_counter()
+    snapshot = read_snapshot(path)
+    if snapshot is None:
+        return None
+    frame, info = snapshot
+    info["stale"] = list(info.get("dates", []))
+    print(f"마지막 스냅샷 v{info.get('version')} 불러옴: {len(frame)}건, {info.get('published_at')} 기준 "
+          f"({(time.perf_counter() - started) * 1000:.0f}ms)")
+    return frame, info
+
+
+def read_version(path=None):
+    """스냅샷 파일의 버전만 읽음 (없으면 0)"""
+    import pyarrow.ipc as ipc
+    pa = _pa()
+    try:
+        with pa.memory_map(path or config.SNAPSHOT_PATH) as source:
+            metadata = ipc.open_file(source).schema.metadata or {}
+    except (FileNotFoundError, pa.ArrowInvalid):
+        return 0
+    return json.loads(metadata.get(METADATA_KEY, b"{}")).get("version", 0)
+
+
+class SnapshotPublisher:
+    """스냅샷 파일을 원자적으로 교체하며 버전을 올림 (데몬 재시작 후에도 버전은 이어짐)"""
+
+    def __init__(self, path=None):
+        self.path = path or config.SNAPSHOT_PATH
+        self.version = read_version(self.path)
+        self._lock = threading.Lock()
+
+    def publish(self, frame, updated=(), stale=()):
+        """전체 스냅샷을 새 버전으로 기록하고 버전 번호 반환 (stale: 이전 결과를 이어 쓰는 날짜)"""
+        import pyarrow.ipc as ipc
+
+        with self._lock:
+            version = self.version + 1
+            info = {
+                "version": version,
+                "published_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "updated": sorted(updated),
+                "dates": sorted(str(d) for d in frame["play_date"].unique().tolist()),
+                "stale": sorted(stale),
+            }
+            with metrics.span("snapshot_publish"):
+                table = to_table(frame, info)
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                tmp_path = self.path + ".tmp"
+                with ipc.new_file(tmp_path, table.schema) as writer:
+                    writer.write_table(table)
+                metrics.counter("teetime_bytes_written_total", "파일에 쓴 바이트 수", target="snapshot").inc(os.path.getsize(tmp_path))
+                os.replace(tmp_path, self.path)
+            self.version = version
+            return version
+
+
+class SnapshotSubscriber:
+    """스냅샷 파일이 바뀔 때마다 callback(데이터프레임, 정보)을 호출하는 읽기 전용 구독자
+
+    version을 주면 그보다 새 버전부터 전달한다 (이미 불러온 스냅샷을 다시 받지 않도록).
+    """
+
+    def __init__(self, callback, path=None, interval=None, version=0):
+        self.callback = callback
+        self.path = path or config.SNAPSHOT_PATH
+        self.interval = config.SNAPSHOT_POLL_INTERVAL if interval is None else interval
+        self.version = version
+        self._stat = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def poll(self):
+        """새 버전이 있으면 읽어서 전달하고 True 반환"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        key = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        if key == self._stat:
+            return False
+        self._stat = key
+        snapshot = read_snapshot(self.path)
+        if snapshot is None:
+            return False
+        frame, info = snapshot
+        if info.get("version", 0) <= self.version:
+            return False
+        info.setdefault("stale", [])
+        if not self.version or info["version"] > self.version + 1:
+            # 처음 받았거나 중간 버전을 건너뛰었으면 어느 날짜가 바뀌었는지 모르므로 전체를 갱신된 것으로 봄
+            info["updated"] = info["dates"]
+        self.version = info["version"]
+        self.callback(frame, info)
+        return True
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"스냅샷 읽기 중 오류 발생: {str(e)}")
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="snapshot-subscriber", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join()
@@ -0,0 +1,319 @@
+"""골프장 예약 정보 저장소 (SQLite, WAL 모드)
+
+(golf_course, play_date)를 키로 upsert하고 값이 바뀐 행만 기록한다. 엑셀 파일은
+필요할 때 저장소에서 한 행씩 흘려보내 만든다. 값은 정규화된 형태(가격/팀 수는 숫자,
+play_time은 'HH:MM' JSON 배열)로 저장하고 읽을 때 records 형태로 돌려준다.
+
+    python store.py export golf_tee_times.xlsx
+    python store.py import golf_tee_times.xlsx
+"""
+import argparse
+import json
+import os
+import sqlite3
+import threading
+
+import config
+import metrics
+import records
+
+COLUMNS = ['scraping_date', 'play_date', 'golf_course', 'location', 'price',
+           'rating', 'remaining_teams', 'play_time']
+VALUE_COLUMNS = ['location', 'price', 'rating', 'remaining_teams', 'play_time']
+
+SCHEMA_VERSION = 1  # 1: 값을 정규화된 형태로 저장
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tee_times (
+    golf_course TEXT NOT NULL,
+    play_date TEXT NOT NULL,
+    location TEXT,
+    price TEXT,
+    rating TEXT,
+    remaining_teams TEXT,
+    play_time TEXT,                      -- JSON 배열
+    changed_at TEXT NOT NULL,            -- 값이 마지막으로 바뀐 스크래핑 시각
+    listed INTEGER NOT NULL DEFAULT 1,   -- 해당 날짜의 마지막 스크래핑 결과에 있었는지
+    PRIMARY KEY (golf_course, play_date)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tee_times_play_date ON tee_times (play_date, listed);
+CREATE TABLE IF NOT EXISTS scrapes (
+    play_date TEXT PRIMARY KEY,
+    scraping_date TEXT NOT NULL          -- 해당 날짜를 마지막으로 스크래핑한 시각
+);
+"""
+
+UPSERT_SQL = f"""
+INSERT INTO tee_times (golf_course, play_date, {', '.join(VALUE_COLUMNS)}, changed_at, listed)
+VALUES (?, ?, {', '.join('?' for _ in VALUE_COLUMNS)}, ?, 1)
+ON CONFLICT (golf_course, play_date) DO UPDATE SET
+    {', '.join(f'{column} = excluded.{column}' for column in VALUE_COLUMNS)},
+    changed_at = excluded.changed_at,
+    listed = 1
+WHERE {' OR '.join(f'tee_times.{column} IS NOT excluded.{column}' for column in VALUE_COLUMNS)}
+    OR tee_times.listed = 0
+"""
+
+# 목록에 있는 행은 해당 날짜의 마지막 스크래핑 시각, 사라진 행은 마지막 변경 시각
+SELECT_SQL = """
+SELECT CASE WHEN t.listed THEN s.scraping_date ELSE t.changed_at END AS scraping_date,
+       t.play_date, t.golf_course, t.location, t.price, t.rating, t.remaining_teams, t.play_time
+FROM tee_times t LEFT JOIN scrapes s ON s.play_date = t.play_date
+"""
+
+
+def _encode_play_time(value):
+    return json.dumps(records.format_minutes(value))
+
+
+def _text(value):
+    if value is None or value != value:  # NaN
+        return None
+    return str(value)
+
+
+def _values(record):
+    """레코드(문자열 또는 정규화된 값) → 저장할 (location, price, rating, remaining_teams, play_time)"""
+    return (
+        records.parse_text(record.get('location')),
+        _text(records.parse_count(record.get('price'))),
+        _text(records.parse_rating(record.get('rating'))),
+        _text(records.parse_count(record.get('remaining_teams'))),
+        _encode_play_time(record.get('play_time')),
+    )
+
+
+class TeeTimeStore:
+    """(골프장, 플레이 날짜) 단위 최신 상태를 보관하는 인덱스 저장소"""
+
+    def __init__(self, path=None):
+        self.path = path or config.STORE_PATH
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        """예전 형식('150,000원', '3팀')으로 저장된 값을 정규화된 형태로 바꿈 (한 번)"""
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+        with self._conn:
+            rows = self._conn.execute(
+                "SELECT golf_course, play_date, location, price, rating, remaining_teams, play_time FROM tee_times"
+            ).fetchall()
+            updates = []
+            for golf_course, play_date, *values in rows:
+                record = dict(zip(VALUE_COLUMNS, values))
+                record['play_time'] = json.loads(record['play_time'] or '[]')
+                updates.append(_values(record) + (golf_course, play_date))
+            self._conn.executemany(
+                f"UPDATE tee_times SET {', '.join(f'{column} = ?' for column in VALUE_COLUMNS)} "
+                "WHERE golf_course = ? AND play_date = ?",
+                updates,
+            )
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def upsert(self, records, mark_missing=True):
+        """스크래핑 결과(딕셔너리 목록)를 반영하고 실제로 기록된 행 수 반환
+
+        값이 같은 행은 건드리지 않는다. mark_missing이면 스크래핑한 날짜의
+        목록에서 사라진 골프장을 listed=0으로 표시한다.
+        """
+        rows = []
+        latest = {}
+        for record in records:
+            play_date = str(record['play_date'])[:10]
+            scraping_date = str(record['scraping_date'])[:19]
+            rows.append((record['golf_course'], play_date) + _values(record) + (scraping_date,))
+            latest[play_date] = max(latest.get(play_date, ''), scraping_date)
+
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(UPSERT_SQL, rows)
+            written = self._conn.total_changes - before
+
+            if mark_missing:
+                self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS current_keys "
+                                   "(golf_course TEXT, play_date TEXT, PRIMARY KEY (golf_course, play_date))")
+                self._conn.execute("DELETE FROM current_keys")
+                self._conn.executemany("INSERT OR IGNORE INTO current_keys VALUES (?, ?)",
+                                       [(row[0], row[1]) for row in rows])
+                for play_date, scraping_date in latest.items():
+                    written += self._conn.execute(
+                        "UPDATE tee_times SET listed = 0, changed_at = ? "
+                        "WHERE play_date = ? AND listed = 1 AND NOT EXISTS ("
+                        "SELECT 1 FROM current_keys k WHERE k.golf_course = tee_times.golf_course "
+                        "AND k.play_date = tee_times.play_date)",
+                        (scraping_date, play_date),
+                    ).rowcount
+
+            self._conn.executemany(
+                "INSERT INTO scrapes (play_date, scraping_date) VALUES (?, ?) "
+                "ON CONFLICT (play_date) DO UPDATE SET scraping_date = excluded.scraping_date "
+                "WHERE excluded.scraping_date > scrapes.scraping_date",
+                latest.items(),
+            )
+        return written
+
+    def delist_stale(self):
+        """해당 날짜의 마지막 스크래핑보다 오래된 행을 목록에서 빠진 것으로 표시 (가져오기용)"""
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "UPDATE tee_times SET listed = 0 WHERE listed = 1 AND changed_at < "
+                "(SELECT scraping_date FROM scrapes s WHERE s.play_date = tee_times.play_date)"
+            ).rowcount
+
+    def iter_rows(self, play_date=None, listed_only=False):
+        """저장된 행을 정규화된 레코드 딕셔너리로 하나씩 반환 (스크래핑 시각 내림차순, 플레이 날짜 오름차순)"""
+        sql = SELECT_SQL
+        conditions = []
+        params = []
+        if play_date is not None:
+            conditions.append("t.play_date = ?")
+            params.append(play_date)
+        if listed_only:
+            conditions.append("t.listed = 1")
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY scraping_date DESC, t.play_date ASC"
+
+        # 별도 연결로 읽어서 쓰기와 잠금을 나누지 않음 (WAL)
+        reader = sqlite3.connect(self.path)
+        try:
+            for row in reader.execute(sql, params):
+                record = dict(zip(COLUMNS, row))
+                record['play_time'] = json.loads(record['play_time'] or '[]')
+                yield records.TeeTime.from_raw(record).as_dict()
+        finally:
+            reader.close()
+
+    def stats(self):
+        """총 레코드 수, 유니크 골프장 수, 날짜 범위"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT golf_course), MIN(play_date), MAX(play_date) FROM tee_times"
+            ).fetchone()
+
+    def is_empty(self):
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM tee_times LIMIT 1").fetchone() is None
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def export_excel(store, filename='golf_tee_times.xlsx'):
+    """저장소 내용을 엑셀 파일로 내보내기 (한 행씩 스트리밍, 쓰기 전용 모드)"""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(COLUMNS)
+    count = 0
+    for record in store.iter_rows():
+        record['play_time'] = str(records.format_minutes(record['play_time']))
+        sheet.append([record[column] for column in COLUMNS])
+        count += 1
+
+    tmp_file = filename + ".tmp.xlsx"
+    workbook.save(tmp_file)
+    metrics.counter("teetime_bytes_written_total", "파일에 쓴 바이트 수", target="excel").inc(os.path.getsize(tmp_file))
+    os.replace(tmp_file, filename)
+    return count
+
+
+def follow_excel(store, filename='golf_tee_times.xlsx'):
+    """scrape_daemon.py가 스냅샷을 발행할 때마다 엑셀로 다시 내보내기 (Ctrl+C로 종료)
+
+    저장소는 데몬이 이미 갱신했으므로 여기서는 읽기만 한다.
+    """
+    import time
+    from snapshot_feed import SnapshotSubscriber
+
+    def export(frame, info):
+        count = export_excel(store, filename)
+        print(f"엑셀 내보내기 완료: {filename} ({count}건, 스냅샷 v{info['version']})")
+
+    subscriber = SnapshotSubscriber(export)
+    try:
+        while True:
+            subscriber.poll()
+            time.sleep(subscriber.interval)
+    except KeyboardInterrupt:
+        pass
+
+
+def import_excel(store, filename='golf_tee_times.xlsx'):
+    """기존 엑셀 파일의 데이터를 저장소로 가져오기 (처음 전환할 때 한 번)"""
+    import ast
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(filename, read_only=True)
+    sheet_rows = workbook.active.iter_rows(values_only=True)
+    header = [str(name) for name in next(sheet_rows)]
+    rows = []
+    for values in sheet_rows:
+        record = dict(zip(header, values))
+        play_time = record.get('play_time')
+        if isinstance(play_time, str) and play_time.startswith('['):
+            try:
+                record['play_time'] = ast.literal_eval(play_time)
+            except (ValueError, SyntaxError):
+                pass
+        rows.append(record)
+    workbook.close()
+
+    # 오래된 스크래핑부터 반영해야 최신 값이 남음
+    rows.sort(key=lambda record: str(record['scraping_date']))
+    store.upsert(rows, mark_missing=False)
+    store.delist_stale()
+    return len(rows)
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_store():
+    """프로세스에서 공유하는 기본 저장소 (처음 열 때 기존 엑셀 데이터를 가져옴)"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = TeeTimeStore()
+            if _default_store.is_empty() and os.path.exists(config.EXCEL_PATH):
+                count = import_excel(_default_store, config.EXCEL_PATH)
+                print(f"기존 엑셀 데이터 {count}건을 저장소로 가져왔습니다")
+        return _default_store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="골프장 예약 정보 저장소 관리")
+    parser.add_argument("command", choices=["export", "import", "stats"])
+    parser.add_argument("filename", nargs="?", default=config.EXCEL_PATH)
+    parser.add_argument("--follow", action="store_true",
+                        help="export: 데몬이 새 스냅샷을 발행할 때마다 다시 내보내기")
+    args = parser.parse_args()
+
+    store = TeeTimeStore()
+    if args.command == "export" and args.follow:
+        follow_excel(store, args.filename)
+    elif args.command == "export":
+        count = export_excel(store, args.filename)
+        print(f"엑셀 내보내기 완료: {args.filename} ({count}건)")
+    elif args.command == "import":
+        count = import_excel(store, args.filename)
+        print(f"엑셀 가져오기 완료: {args.filename} ({count}건)")
+    else:
+        total, courses, first, last = store.stats()
+        print(f"총 레코드 수: {total}")
+        print(f"유니크 골프장 수: {courses}")
+        print(f"날짜 범위: {first} ~ {last}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""녹화된 목록 페이지를 그대로 돌려주는 로컬 티스캐너 대역 서버
+
+디렉터리 구조:
+    {root}/{roundDay}/page-1.html, page-2.html, ...  (페이지 단위 녹화)
+    {root}/{roundDay}.html                            (한 페이지짜리 녹화)
+
+POST /webhook은 받은 JSON 본문을 webhooks 목록에 쌓고 webhook_status 응답을 돌려주므로
+알림 웹훅(notifier.WebhookSink) 대역으로도 쓸 수 있다.
+
+없는 페이지는 골프장이 하나도 없는 빈 목록을 돌려주므로 HttpFetcher가
+자연스럽게 멈춘다. --infinite-scroll을 주면 첫 페이지에 스크립트를 넣어서 맨 아래로
+스크롤할 때마다 다음 페이지의 골프장을 fetch로 붙이므로, 실제 사이트처럼
+SeleniumFetcher의 무한 스크롤 과정까지 재현된다. 사용 예:
+    python stub_site.py fixtures/pages --port 8765 --infinite-scroll
+    TEETIME_FETCHER=http TEETIME_BASE_URL=http://127.0.0.1:8765 python ...
+"""
+import argparse
+import json
+import os
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+EMPTY_PAGE = "<html><body><div class=\"golf-list\"></div></body></html>"
+
+# 맨 아래로 스크롤하면 다음 페이지를 받아 golf-inner-info 블록을 목록 끝에 붙임
+INFINITE_SCROLL_JS = b"""<script>
+(function () {
+    var next = 2, busy = false, done = false;
+    window.addEventListener('scroll', function () {
+        if (busy || done || window.innerHeight + window.scrollY < document.body.scrollHeight - 50) return;
+        busy = true;
+        var url = new URL(window.location.href);
+        url.searchParams.set('%s', next);
+        fetch(url).then(function (response) { return response.text(); }).then(function (text) {
+            var page = new DOMParser().parseFromString(text, 'text/html');
+            var items = page.querySelectorAll('.golf-inner-info');
+            var list = document.querySelector('.golf-list') || document.body;
+            items.forEach(function (item) { list.appendChild(document.importNode(item, true)); });
+            done = items.length === 0;
+            next += 1;
+            busy = false;
+        });
+    });
+})();
+</script>"""
+
+
+def recorded_page_path(root, round_day, page=1):
+    """녹화된 페이지 파일 경로 (없으면 None)"""
+    candidates = [os.path.join(root, round_day, f"page-{page}.html")]
+    if page == 1:
+        candidates.append(os.path.join(root, f"{round_day}.html"))
+    for path in candidates:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive 지원
+    disable_nagle_algorithm = True  # 헤더와 본문을 따로 보낼 때 생기는 40ms 지연 방지
+    root = "."
+    page_param = "page"
+    infinite_scroll = False
+    webhooks = None        # 받은 웹훅 본문 목록 (None이면 웹훅 404)
+    webhook_status = 204   # 웹훅 응답 코드 (재시도 확인용으로 바꿀 수 있음)
+
+    def do_POST(self):
+        if urlparse(self.path).path.rstrip("/") != "/webhook" or self.webhooks is None:
+            self.send_error(404)
+            return
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        status = self.webhook_status
+        if status < 400:
+            self.webhooks.append(json.loads(body or b"null"))
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        if parsed.path.rstrip("/") != "/booking/list":
+            self.send_error(404)
+            return
+
+        query = parse_qs(parsed.query)
+        round_day = query.get("roundDay", [""])[0]
+        page = int(query.get(self.page_param, ["1"])[0] or 1)
+
+        path = recorded_page_path(self.root, round_day, page)
+        if path:
+            with open(path, "rb") as f:
+                body = f.read()
+        else:
+            body = EMPTY_PAGE.encode("utf-8")
+        if self.infinite_scroll and page == 1 and self.page_param not in query:
+            script = INFINITE_SCROLL_JS % self.page_param.encode()
+            body = body.replace(b"</body>", script + b"</body>") if b"</body>" in body else body + script
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(root, host="127.0.0.1", port=0, page_param="page", infinite_scroll=False, webhooks=None):
+    """백그라운드 스레드에서 대역 서버 시작 후 (서버, base_url) 반환
+
+    port=0이면 빈 포트를 자동으로 고른다. 종료는 server.shutdown(). webhooks에 목록을 주면
+    {base_url}/webhook으로 받은 본문이 쌓인다 (응답 코드는 server.RequestHandlerClass.webhook_status).
+    """
+    handler = type("RecordedPageHandler", (StubHandler,), {
+        "root": root, "page_param": page_param, "infinite_scroll": infinite_scroll, "webhooks": webhooks,
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="stub-site", daemon=True).start()
+    base_url = f"http://{host}:{server.server_address[1]}"
+    return server, base_url
+
+
+def main():
+    parser = argparse.ArgumentParser(description="녹화된 티스캐너 페이지를 제공하는 로컬 서버")
+    parser.add_argument("root", help="녹화 페이지 디렉터리")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--infinite-scroll", action="store_true", help="브라우저용 무한 스크롤 재현")
+    args = parser.parse_args()
+
+    handler = type("RecordedPageHandler", (StubHandler,), {
+        "root": args.root, "infinite_scroll": args.infinite_scroll, "webhooks": [],
+    })
+    server = ThreadingHTTPServer((args.host, args.port), handler)
+    print(f"대역 서버 실행 중: http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n서버를 종료합니다.")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,404 +1,606 @@
-import customtkinter as ctk
-from PIL import Image
-import os
-from datetime import datetime, timedelta
-import threading
-import time
-import pandas as pd
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
-
-class GolfCard(ctk.CTkFrame):
-    def __init__(self, master, golf_name, location, price, teams_left, play_time="", **kwargs):
-        super().__init__(master, **kwargs)
-        
-        # App 인스턴스를 찾아서 저장
-        self.app = self.find_app_instance(master)
-        
-        self.configure(fg_color="#ffffff", corner_radius=10)
-        
-        # 골프장 이름
-        self.name_label = ctk.CTkLabel(self, text=golf_name,
-                                     font=ctk.CTkFont(size=16, weight="bold"),
-                                     text_color="#333333")
-        self.name_label.grid(row=0, column=0, padx=15, pady=(15,5), sticky="w")
-        
-        # 위치 정보
-        self.location_label = ctk.CTkLabel(self, text=location,
-                                         font=ctk.CTkFont(size=12),
-                                         text_color="#666666")
-        self.location_label.grid(row=1, column=0, padx=15, pady=(0,5), sticky="w")
-        
-        # 가격 정보
-        self.price_label = ctk.CTkLabel(self, text=price,
-                                      font=ctk.CTkFont(size=14),
-                                      text_color="#009688")
-        self.price_label.grid(row=2, column=0, padx=15, pady=(0,5), sticky="w")
-        
-        # 남은 팀 수
-        self.teams_label = ctk.CTkLabel(self, text=f"남은 팀: {teams_left}",
-                                      font=ctk.CTkFont(size=14),
-                                      text_color="#666666")
-        self.teams_label.grid(row=3, column=0, padx=15, pady=(0,10), sticky="w")
-        
-        # 알람 설정 체크박스
-        self.alarm_var = ctk.BooleanVar()
-        self.alarm_checkbox = ctk.CTkCheckBox(self, text="알람 설정",
-                                            variable=self.alarm_var,
-                                            command=self.toggle_alarm)
-        self.alarm_checkbox.grid(row=4, column=0, padx=15, pady=(0,15), sticky="w")
-        self.golf_name = golf_name
-        self.teams_left = teams_left
-        self.play_time = play_time
-        self.previous_teams = teams_left
-
-    def find_app_instance(self, widget):
-        """App 인스턴스를 찾아서 반환하는 헬퍼 메서드"""
-        current = widget
-        while current is not None:
-            if isinstance(current, App):
-                return current
-            current = current.master
-        raise RuntimeError("App instance not found")
-
-    def toggle_alarm(self):
-        if self.alarm_var.get():
-            self.app.add_alarm(self.golf_name, self.teams_left, self.play_time)
-        else:
-            self.app.remove_alarm(self.golf_name)
-
-    def update_info(self, teams_left, play_time=""):
-        if hasattr(self, 'previous_teams'):
-            if self.alarm_var.get() and int(''.join(filter(str.isdigit, str(teams_left)))) < int(''.join(filter(str.isdigit, str(self.previous_teams)))):
-                current_time = datetime.now().strftime("%H:%M:%S")
-                self.app.notify_team_decrease(
-                    self.golf_name,
-                    self.previous_teams,
-                    teams_left,
-                    play_time,
-                    current_time
-                )
-        
-        self.previous_teams = self.teams_left
-        self.teams_left = teams_left
-        self.play_time = play_time
-        self.teams_label.configure(text=f"남은 팀: {teams_left}")
-
-class App(ctk.CTk):
-    def __init__(self):
-        super().__init__()
-        
-        self.title("골프장 잔여팀 모니터")
-        self.geometry("1200x800")
-        
-        self.purple_theme = {
-            "primary": "#6B46C1",
-            "secondary": "#9F7AEA",
-            "light": "#E9D8FD",
-            "bg": "#F7FAFC"
-        }
-        
-        ctk.set_appearance_mode("light")
-        self.configure(fg_color=self.purple_theme["bg"])
-        
-        self.scanning = False
-        self.golf_cards = {}  # 골프장 카드 저장용 딕셔너리
-        self.selected_date = None
-        
-        self.setup_layout()
-
-        self.active_alarms = {}  # 활성화된 알람 저장
-        
-    def setup_layout(self):
-        self.grid_rowconfigure(1, weight=1)
-        self.grid_columnconfigure(1, weight=1)
-        
-        self.create_sidebar()
-        self.create_date_tabs()  # 날짜 탭 추가
-        self.create_main_content()
-        self.create_alarm_area()
-
-    def create_date_tabs(self):
-        # 날짜 탭을 포함할 프레임
-        self.date_frame = ctk.CTkFrame(self, fg_color="transparent")
-        self.date_frame.grid(row=0, column=1, sticky="ew", padx=20, pady=(20,0))
-        
-        # 현재 날짜부터 7일간의 날짜 버튼 생성
-        self.date_buttons = []
-        current_date = datetime.now()
-        
-        for i in range(8):  # 오늘 포함 8일
-            date = current_date + timedelta(days=i)
-            date_str = date.strftime("%Y-%m-%d")
-            formatted_date = date.strftime("%m/%d")
-            
-            button = ctk.CTkButton(
-                self.date_frame,
-                text=formatted_date,
-                width=80,
-                height=30,
-                fg_color=self.purple_theme["secondary"] if i == 0 else "transparent",
-                hover_color=self.purple_theme["light"],
-                text_color="white" if i == 0 else self.purple_theme["primary"],
-                command=lambda d=date_str: self.select_date(d)
-            )
-            button.grid(row=0, column=i, padx=5, pady=5)
-            self.date_buttons.append({
-                'button': button,
-                'date': date_str
-            })
-        
-        # 초기 선택 날짜 설정
-        self.selected_date = current_date.strftime("%Y-%m-%d")
-        
-    def create_sidebar(self):
-        self.sidebar = ctk.CTkFrame(self, fg_color=self.purple_theme["primary"],
-                                  corner_radius=0, width=250)
-        self.sidebar.grid(row=0, column=0, rowspan=2, sticky="nsew")
-        
-        self.logo_label = ctk.CTkLabel(self.sidebar, text="티타임 스캐너",
-                                     font=ctk.CTkFont(size=24, weight="bold"),
-                                     text_color="white")
-        self.logo_label.pack(pady=(30, 20))
-        
-        self.scan_button = ctk.CTkButton(self.sidebar, text="스캔 시작",
-                                       command=self.toggle_scanning,
-                                       fg_color=self.purple_theme["secondary"],
-                                       hover_color=self.purple_theme["light"],
-                                       text_color="white",
-                                       height=40)
-        self.scan_button.pack(pady=20, padx=20)
-        
-    def create_main_content(self):
-        self.main_frame = ctk.CTkScrollableFrame(self, fg_color="transparent")
-        self.main_frame.grid(row=1, column=1, sticky="nsew", padx=20, pady=20)
-        
-    def create_alarm_area(self):
-        self.alarm_frame = ctk.CTkFrame(self, fg_color=self.purple_theme["light"],
-                                      corner_radius=10)
-        self.alarm_frame.grid(row=0, column=2, rowspan=2, sticky="nsew", padx=20, pady=20)
-        
-        self.alarm_title = ctk.CTkLabel(self.alarm_frame, text="알람 현황",
-                                      font=ctk.CTkFont(size=18, weight="bold"),
-                                      text_color=self.purple_theme["primary"])
-        self.alarm_title.pack(pady=15)
-        
-        # 활성 알람 요약 레이블 추가
-        self.active_alarms_label = ctk.CTkLabel(self.alarm_frame,
-                                                text="활성 알람: 0개",
-                                                font=ctk.CTkFont(size=14),
-                                                text_color=self.purple_theme["primary"])
-        self.active_alarms_label.pack(pady=(0, 10))
-        
-        self.alarm_list = ctk.CTkTextbox(self.alarm_frame, width=300, height=600)
-        self.alarm_list.pack(padx=10, pady=10, fill="both", expand=True)
-
-    def select_date(self, date):
-        self.selected_date = date
-        # 버튼 스타일 업데이트
-        for btn_info in self.date_buttons:
-            if btn_info['date'] == date:
-                btn_info['button'].configure(
-                    fg_color=self.purple_theme["secondary"],
-                    text_color="white"
-                )
-            else:
-                btn_info['button'].configure(
-                    fg_color="transparent",
-                    text_color=self.purple_theme["primary"]
-                )
-
-    def toggle_scanning(self):
-        if not self.scanning:
-            if self.selected_date:
-                self.scanning = True
-                self.scan_button.configure(text="스캔 중지")
-                self.update_alarm(f"{self.selected_date} 날짜의 스캔을 시작합니다...")
-                threading.Thread(target=self.scanning_loop, daemon=True).start()
-            else:
-                self.update_alarm("날짜를 선택해주세요.")
-        else:
-            self.scanning = False
-            self.scan_button.configure(text="스캔 시작")
-            self.update_alarm("스캔을 중지합니다...")
-
-    def scanning_loop(self):
-        while self.scanning:
-            try:
-                df = self.scrape_golf_data(self.selected_date)
-                if df is not None and not df.empty:
-                    self.update_alarm(f"데이터 수집 완료: {len(df)}개의 골프장")
-                    self.update_golf_cards(df)
-                    if self.update_excel_file(df):
-                        self.update_alarm("엑셀 파일 업데이트 완료")
-                time.sleep(300)  # 5분 대기
-            except Exception as e:
-                self.update_alarm(f"오류 발생: {str(e)}")
-                self.scanning = False
-                self.scan_button.configure(text="스캔 시작")
-                break
-
-    def update_golf_cards(self, df):
-        # 기존 카드들 제거
-        for widget in self.main_frame.winfo_children():
-            widget.destroy()
-        self.golf_cards.clear()
-        
-        # 새 카드 생성
-        for _, row in df.iterrows():
-            golf_name = row['golf_course']
-            play_time = row.get('play_time', '')
-            card = GolfCard(
-                self.main_frame,  # master로 main_frame을 전달
-                golf_name=golf_name,
-                location=row['location'],
-                price=row['price'],
-                teams_left=row['remaining_teams'],
-                play_time=play_time,
-                width=250,
-                height=150
-            )
-            card.pack(pady=10, padx=10, fill="x")
-            self.golf_cards[golf_name] = card
-            
-            # 이전에 설정된 알람 상태 복원
-            if golf_name in self.active_alarms:
-                card.alarm_var.set(True)
-
-
-    def update_alarm(self, message):
-        current_time = datetime.now().strftime("%H:%M:%S")
-        self.alarm_list.insert("end", f"[{current_time}] {message}\n")
-        self.alarm_list.see("end")
-
-    def scrape_golf_data(self, target_date):
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--disable-extensions")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--no-sandbox")
-
-        driver = webdriver.Chrome(
-            service=Service(ChromeDriverManager().install()),
-            options=chrome_options
-        )
-
-        try:
-            url = f"https://www.teescanner.com/booking/list?tab=golfcourse&roundDay={target_date}"
-            self.update_alarm(f"페이지 로딩 중: {url}")
-            
-            driver.get(url)
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CLASS_NAME, 'golf-inner-info'))
-            )
-
-            self.update_alarm("데이터 스크롤링 중...")
-            
-            # 무한 스크롤
-            last_height = driver.execute_script("return document.body.scrollHeight")
-            while True:
-                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
-                new_height = driver.execute_script("return document.body.scrollHeight")
-                if new_height == last_height:
-                    break
-                last_height = new_height
-
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-            location_divs = soup.find_all('div', class_='golf-inner-info')
-            
-            data_list = []
-            scraping_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            for div in location_divs:
-                time_element = div.find('span', class_='time')
-                play_time = time_element.text.strip() if time_element else ''
-                
-                golf_data = {
-                    'scraping_date': scraping_date,
-                    'play_date': target_date,
-                    'golf_course': div.find('strong').text.strip() if div.find('strong') else '정보없음',
-                    'location': div.find('p', class_='location').text.strip() if div.find('p', class_='location') else '정보없음',
-                    'price': div.find('span', class_='price').text.strip() if div.find('span', class_='price') else '정보없음',
-                    'rating': div.find('a', class_='star-score').text.strip() if div.find('a', class_='star-score') else '정보없음',
-                    'remaining_teams': div.find('button', class_='btn').text.strip() if div.find('button', class_='btn') else '정보없음',
-                    'play_time': play_time
-                }
-                data_list.append(golf_data)
-
-            return pd.DataFrame(data_list)
-            
-        except Exception as e:
-            self.update_alarm(f"스크래핑 중 오류 발생: {str(e)}")
-            return None
-        finally:
-            driver.quit()
-
-    def update_excel_file(self, df, filename='golf_tee_times.xlsx'):
-        try:
-            if os.path.exists(filename):
-                existing_df = pd.read_excel(filename)
-                final_df = pd.concat([existing_df, df], ignore_index=True)
-            else:
-                final_df = df
-
-            final_df = final_df.sort_values(['scraping_date', 'play_date'], ascending=[False, True])
-            final_df = final_df.drop_duplicates()
-            final_df.to_excel(filename, index=False)
-            return True
-
-        except Exception as e:
-            self.update_alarm(f"파일 저장 중 오류 발생: {str(e)}")
-            return False
-
-    def add_alarm(self, golf_name, current_teams, play_time):
-        # 문자열에서 숫자만 추출하여 정수로 변환
-        teams_count = int(''.join(filter(str.isdigit, str(current_teams))))
-        
-        self.active_alarms[golf_name] = {
-            'teams': teams_count,
-            'play_time': play_time
-        }
-        message = "[알람 설정]\n"
-        message += f"골프장: {golf_name}\n"
-        message += f"경기 시간: {play_time}\n"
-        message += f"현재 팀 수: {teams_count}팀"
-        self.update_alarm(message)
-        self.update_active_alarms_count()
-
-    def remove_alarm(self, golf_name):
-        if golf_name in self.active_alarms:
-            message = f"❌ 알람 해제: {golf_name}"
-            self.update_alarm(message)
-            del self.active_alarms[golf_name]
-            self.update_active_alarms_count()
-
-    def notify_team_decrease(self, golf_name, previous_teams, current_teams, play_time, booking_time):
-        prev_count = int(''.join(filter(str.isdigit, str(previous_teams))))
-        curr_count = int(''.join(filter(str.isdigit, str(current_teams))))
-        
-        message = "[티타임 변동 알림]\n"
-        message += f"골프장: {golf_name}\n"
-        message += f"경기 시간: {play_time}\n"
-        message += f"팀 수 변동: {prev_count}팀 → {curr_count}팀\n"
-        message += f"부킹 완료 시각: {booking_time}"
-        self.update_alarm(message)
-        
-        # 알람 소리 설정이 켜져 있는 경우 소리 재생
-        if hasattr(self, 'sound_var') and self.sound_var.get():
-            # 여기에 소리 재생 코드 추가 가능
-            pass
-
-    def update_active_alarms_count(self):
-        count = len(self.active_alarms)
-        self.active_alarms_label.configure(text=f"활성 알람: {count}개")
-
-if __name__ == "__main__":
-    app = App()
-    app.mainloop()
+import customtkinter as ctk
+import tkinter as tk
+from datetime import datetime, timedelta
+import queue
+import threading
+import time
+import alarm_rules
+from browser import BrowserSession
+import config
+import fetchers
+import notifier
+import records
+import scraper
+import snapshot_feed
+from listing_parser import parse_listing
+from scheduler import RefreshScheduler, run_scheduler
+
+GUI_ALARM_LABEL = "GUI"  # 카드 체크박스로 만든 규칙
+
+
+def format_play_time(play_time):
+    """티타임 목록(자정 기준 분 배열)을 표시용 문자열로 변환"""
+    if isinstance(play_time, str):
+        return play_time
+    return ", ".join(records.format_minutes(play_time))
+
+class GolfCard(ctk.CTkFrame):
+    def __init__(self, master, golf_name, location, price, teams_left, play_time="", **kwargs):
+        super().__init__(master, **kwargs)
+        
+        # App 인스턴스를 찾아서 저장
+        self.app = self.find_app_instance(master)
+        
+        self.configure(fg_color="#ffffff", corner_radius=10)
+        
+        # 골프장 이름
+        self.name_label = ctk.CTkLabel(self, text=golf_name,
+                                     font=ctk.CTkFont(size=16, weight="bold"),
+                                     text_color="#333333")
+        self.name_label.grid(row=0, column=0, padx=15, pady=(15,5), sticky="w")
+        
+        # 위치 정보
+        self.location_label = ctk.CTkLabel(self, text=location,
+                                         font=ctk.CTkFont(size=12),
+                                         text_color="#666666")
+        self.location_label.grid(row=1, column=0, padx=15, pady=(0,5), sticky="w")
+        
+        # 가격 정보
+        self.price_label = ctk.CTkLabel(self, text=price,
+                                      font=ctk.CTkFont(size=14),
+                                      text_color="#009688")
+        self.price_label.grid(row=2, column=0, padx=15, pady=(0,5), sticky="w")
+        
+        # 남은 팀 수
+        self.teams_label = ctk.CTkLabel(self, text=f"남은 팀: {teams_left}",
+                                      font=ctk.CTkFont(size=14),
+                                      text_color="#666666")
+        self.teams_label.grid(row=3, column=0, padx=15, pady=(0,10), sticky="w")
+        
+        # 알람 설정 체크박스
+        self.alarm_var = ctk.BooleanVar()
+        self.alarm_checkbox = ctk.CTkCheckBox(self, text="알람 설정",
+                                            variable=self.alarm_var,
+                                            command=self.toggle_alarm)
+        self.alarm_checkbox.grid(row=4, column=0, padx=15, pady=(0,15), sticky="w")
+        self.golf_name = golf_name
+        self.teams_left = teams_left
+        self.play_time = play_time
+        self.previous_teams = teams_left
+
+    def find_app_instance(self, widget):
+        """App 인스턴스를 찾아서 반환하는 헬퍼 메서드"""
+        current = widget
+        while current is not None:
+            if isinstance(current, App):
+                return current
+            current = current.master
+        raise RuntimeError("App instance not found")
+
+    def toggle_alarm(self):
+        if self.alarm_var.get():
+            self.app.add_alarm(self.golf_name, self.teams_left, self.play_time)
+        else:
+            self.app.remove_alarm(self.golf_name)
+
+    def bind_row(self, row):
+        """카드를 다른(또는 갱신된) 골프장 행에 연결. 바뀐 레이블만 다시 그림"""
+        golf_name = row['golf_course']
+        if golf_name != self.golf_name:
+            self.golf_name = golf_name
+            self.previous_teams = row['remaining_teams']
+            self.name_label.configure(text=golf_name)
+        self._set_text(self.location_label, row['location'] or records.MISSING)
+        self._set_text(self.price_label, records.format_price(row['price']))
+        self._set_text(self.teams_label, f"남은 팀: {records.format_teams(row['remaining_teams'])}")
+        self.teams_left = row['remaining_teams']
+        self.play_time = row.get('play_time', '')
+
+        # 이전에 설정된 알람 상태 복원
+        alarmed = golf_name in self.app.active_alarms
+        if self.alarm_var.get() != alarmed:
+            self.alarm_var.set(alarmed)
+
+    def _set_text(self, label, text):
+        if label.cget("text") != text:
+            label.configure(text=text)
+
+class VirtualCardList(ctk.CTkFrame):
+    """골프장 카드 목록
+
+    golf_course를 키로 새 행과 기존 행을 비교해서 바뀐 것만 반영하고, 카드
+    위젯은 화면에 보이는 만큼만 만들어 스크롤할 때 재사용한다. 갱신 비용은
+    골프장 수가 아니라 변경 수와 화면 크기에 비례한다.
+    """
+
+    ROW_HEIGHT = 170  # 카드 높이 150 + 위아래 여백
+    # 카드가 읽는 열 (scraping_date처럼 매 사이클 바뀌는 열은 비교하지 않음)
+    CARD_FIELDS = ('location', 'price', 'remaining_teams', 'play_time')
+
+    def __init__(self, master, bg_color, **kwargs):
+        super().__init__(master, **kwargs)
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.canvas = tk.Canvas(self, highlightthickness=0, bg=bg_color,
+                                yscrollincrement=self.ROW_HEIGHT // 4)
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.canvas.yview)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.canvas.configure(yscrollcommand=self._on_scroll)
+        self.canvas.bind("<Configure>", self._on_resize)
+        self.canvas.bind_all("<MouseWheel>", self._on_mousewheel, add="+")
+        self.canvas.bind_all("<Button-4>", self._on_mousewheel, add="+")
+        self.canvas.bind_all("<Button-5>", self._on_mousewheel, add="+")
+
+        self.keys = []   # 표시 순서
+        self.rows = {}   # golf_course → 행 데이터
+        self.pool = []   # (카드, 캔버스 window id)
+        self.bound = {}  # 풀 슬롯 → 연결된 golf_course
+        self._first = None
+
+    def set_rows(self, rows):
+        """새 스냅샷 반영. (추가, 삭제, 변경) 수 반환"""
+        new_rows = {}
+        order = []
+        for row in rows:
+            key = row['golf_course']
+            if key not in new_rows:
+                order.append(key)
+            new_rows[key] = row
+
+        old_rows = self.rows
+        added = sum(1 for key in order if key not in old_rows)
+        removed = sum(1 for key in self.keys if key not in new_rows)
+        changed = {key for key in order if key in old_rows and self._card_changed(old_rows[key], new_rows[key])}
+        self.rows = new_rows
+
+        if order != self.keys:
+            self.keys = order
+            self._update_scrollregion()
+            self._render(force=True)
+        elif changed:
+            for slot, key in self.bound.items():
+                if key in changed:
+                    self.pool[slot][0].bind_row(new_rows[key])
+        return added, removed, len(changed)
+
+    def _card_changed(self, old, new):
+        return any(old.get(field) != new.get(field) for field in self.CARD_FIELDS)
+
+    def _update_scrollregion(self):
+        height = max(len(self.keys) * self.ROW_HEIGHT, self.canvas.winfo_height())
+        self.canvas.configure(scrollregion=(0, 0, self.canvas.winfo_width(), height))
+
+    def _ensure_pool(self, size):
+        width = max(self.canvas.winfo_width() - 20, 250)
+        while len(self.pool) < size:
+            card = GolfCard(self.canvas, golf_name="", location="", price="", teams_left="",
+                            width=250, height=150)
+            window = self.canvas.create_window(10, 0, window=card, anchor="nw",
+                                               width=width, state="hidden")
+            self.pool.append((card, window))
+
+    def _render(self, force=False):
+        """보이는 구간의 행만 풀 카드에 연결"""
+        first = max(0, int(self.canvas.canvasy(0)) // self.ROW_HEIGHT)
+        if not force and first == self._first:
+            return
+        self._first = first
+
+        visible = self.canvas.winfo_height() // self.ROW_HEIGHT + 2
+        self._ensure_pool(visible)
+        self.bound = {}
+        for slot, (card, window) in enumerate(self.pool):
+            index = first + slot
+            if slot < visible and index < len(self.keys):
+                key = self.keys[index]
+                card.bind_row(self.rows[key])
+                self.canvas.coords(window, 10, index * self.ROW_HEIGHT + 10)
+                self.canvas.itemconfigure(window, state="normal")
+                self.bound[slot] = key
+            else:
+                self.canvas.itemconfigure(window, state="hidden")
+
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self._render()
+
+    def _on_resize(self, event):
+        for _, window in self.pool:
+            self.canvas.itemconfigure(window, width=max(event.width - 20, 250))
+        self._update_scrollregion()
+        self._render(force=True)
+
+    def _on_mousewheel(self, event):
+        # 포인터가 목록 위에 있을 때만 스크롤
+        widget = self.winfo_containing(event.x_root, event.y_root)
+        while widget is not None and widget is not self:
+            widget = widget.master
+        if widget is None:
+            return
+        if event.num == 4 or event.delta > 0:
+            self.canvas.yview_scroll(-1, "units")
+        else:
+            self.canvas.yview_scroll(1, "units")
+
+class App(ctk.CTk):
+    def __init__(self):
+        super().__init__()
+        
+        self.title("골프장 잔여팀 모니터")
+        self.geometry("1200x800")
+        
+        self.purple_theme = {
+            "primary": "#6B46C1",
+            "secondary": "#9F7AEA",
+            "light": "#E9D8FD",
+            "bg": "#F7FAFC"
+        }
+        
+        ctk.set_appearance_mode("light")
+        self.configure(fg_color=self.purple_theme["bg"])
+        
+        self.scanning = False
+        self.selected_date = None
+        self.subscriber = None  # 데몬 스냅샷 구독 (TEETIME_SNAPSHOT_SOURCE=daemon)
+        self.latest_snapshot = None
+        self.snapshot_version = 0
+        self.stale_dates = set()  # 마지막 스냅샷에서 불러와 아직 새로 받지 못한 날짜
+        self.stale_since = None
+        self.snapshot_publisher = None  # 직접 수집(local) 모드에서 다음 시작용 스냅샷 기록
+
+        # 백그라운드 스레드의 UI 작업은 이 큐를 거쳐 메인 루프에서 실행
+        self.ui_queue = queue.Queue()
+        
+        self.setup_layout()
+        self.after(50, self.drain_ui_queue)
+
+        # 알람 규칙 엔진: 카드 표시 여부와 상관없이 스냅샷마다 모든 규칙을 한 번에 평가
+        # (카드의 알람 체크박스는 골프장 팀 수 감소 규칙으로 저장되어 재시작해도 유지)
+        self.alarm_rules = alarm_rules.RuleEngine()
+        # 알림은 별도 이벤트 루프에서 묶어서 발송 (데스크톱 싱크는 항상 켜고 알람 현황 창에 표시)
+        sink_names = ['desktop']
+        if config.SNAPSHOT_SOURCE != "daemon":
+            # 데몬 모드에서는 데몬이 같은 규칙으로 웹훅/파일/소리 싱크에 이미 보내므로 화면 표시만
+            sink_names += [name for name in config.NOTIFY_SINKS if name != 'desktop']
+        self.notifier = notifier.NotificationDispatcher(
+            notifier.build_sinks(sink_names, desktop={'callback': self.notify_team_decrease})).start()
+        self.alarm_rules.bus.subscribe(self.notifier.submit)
+        self.active_alarms = {}  # 골프장 → 알람 정보 (rule_id 포함)
+        for rule in self.alarm_rules.rules():
+            if rule.label == GUI_ALARM_LABEL and rule.golf_course:
+                self.active_alarms[rule.golf_course] = {'rule_id': rule.id, 'teams': None, 'play_time': ''}
+        self.update_active_alarms_count()
+
+        # 스냅샷 비교 엔진 (직접 수집할 때는 scraper.save_snapshot이 같은 엔진을 갱신)
+        self.diff_engine = scraper.change_detector
+
+        # 날짜별 갱신 주기 (변경 속도는 비교 엔진 이벤트로 추정)
+        self.refresh_scheduler = RefreshScheduler()
+        scraper.change_bus.subscribe(self.refresh_scheduler.observe_events)
+
+        # 스캔 사이에 유지되는 웜 브라우저 세션과 fetcher (TEETIME_FETCHER 설정)
+        self.browser_session = BrowserSession()
+        if config.FETCHER == fetchers.SeleniumFetcher.name:
+            self.fetcher = fetchers.SeleniumFetcher(session=self.browser_session)
+        else:
+            self.fetcher = fetchers.get_fetcher()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        # 첫 수집을 기다리지 않고 마지막 스냅샷을 바로 표시 (새로 받을 때까지 이전 데이터로 표시)
+        self.warm_start()
+
+    def warm_start(self):
+        snapshot = snapshot_feed.warm_start()
+        if snapshot is None:
+            return
+        frame, info = snapshot
+        self.latest_snapshot = frame
+        self.snapshot_version = info['version']
+        self.stale_since = info['published_at']
+        self.set_stale_dates(info['stale'])
+        self.update_golf_cards(snapshot_feed.select_dates(frame, [self.selected_date]))
+        self.update_alarm(f"마지막 스냅샷을 불러왔습니다 ({info['published_at']} 기준, 새로 수집할 때까지 이전 데이터)")
+
+    def set_stale_dates(self, dates):
+        self.stale_dates = set(dates)
+        self.update_stale_title()
+
+    def update_stale_title(self):
+        title = "골프장 잔여팀 모니터"
+        if self.selected_date in self.stale_dates:
+            title += f" - 이전 데이터 ({self.stale_since} 기준)"
+        self.run_on_ui(self.title, title)
+
+    def on_close(self):
+        self.scanning = False
+        if self.subscriber is not None:
+            self.subscriber.stop()
+        self.notifier.close(timeout=2)
+        self.fetcher.close()
+        self.browser_session.close()
+        self.destroy()
+        
+    def setup_layout(self):
+        self.grid_rowconfigure(1, weight=1)
+        self.grid_columnconfigure(1, weight=1)
+        
+        self.create_sidebar()
+        self.create_date_tabs()  # 날짜 탭 추가
+        self.create_main_content()
+        self.create_alarm_area()
+
+    def create_date_tabs(self):
+        # 날짜 탭을 포함할 프레임
+        self.date_frame = ctk.CTkFrame(self, fg_color="transparent")
+        self.date_frame.grid(row=0, column=1, sticky="ew", padx=20, pady=(20,0))
+        
+        # 현재 날짜부터 7일간의 날짜 버튼 생성
+        self.date_buttons = []
+        current_date = datetime.now()
+        
+        for i in range(8):  # 오늘 포함 8일
+            date = current_date + timedelta(days=i)
+            date_str = date.strftime("%Y-%m-%d")
+            formatted_date = date.strftime("%m/%d")
+            
+            button = ctk.CTkButton(
+                self.date_frame,
+                text=formatted_date,
+                width=80,
+                height=30,
+                fg_color=self.purple_theme["secondary"] if i == 0 else "transparent",
+                hover_color=self.purple_theme["light"],
+                text_color="white" if i == 0 else self.purple_theme["primary"],
+                command=lambda d=date_str: self.select_date(d)
+            )
+            button.grid(row=0, column=i, padx=5, pady=5)
+            self.date_buttons.append({
+                'button': button,
+                'date': date_str
+            })
+        
+        # 초기 선택 날짜 설정
+        self.selected_date = current_date.strftime("%Y-%m-%d")
+        
+    def create_sidebar(self):
+        self.sidebar = ctk.CTkFrame(self, fg_color=self.purple_theme["primary"],
+                                  corner_radius=0, width=250)
+        self.sidebar.grid(row=0, column=0, rowspan=2, sticky="nsew")
+        
+        self.logo_label = ctk.CTkLabel(self.sidebar, text="티타임 스캐너",
+                                     font=ctk.CTkFont(size=24, weight="bold"),
+                                     text_color="white")
+        self.logo_label.pack(pady=(30, 20))
+        
+        self.scan_button = ctk.CTkButton(self.sidebar, text="스캔 시작",
+                                       command=self.toggle_scanning,
+                                       fg_color=self.purple_theme["secondary"],
+                                       hover_color=self.purple_theme["light"],
+                                       text_color="white",
+                                       height=40)
+        self.scan_button.pack(pady=20, padx=20)
+        
+    def create_main_content(self):
+        self.card_list = VirtualCardList(self, bg_color=self.purple_theme["bg"], fg_color="transparent")
+        self.card_list.grid(row=1, column=1, sticky="nsew", padx=20, pady=20)
+        
+    def create_alarm_area(self):
+        self.alarm_frame = ctk.CTkFrame(self, fg_color=self.purple_theme["light"],
+                                      corner_radius=10)
+        self.alarm_frame.grid(row=0, column=2, rowspan=2, sticky="nsew", padx=20, pady=20)
+        
+        self.alarm_title = ctk.CTkLabel(self.alarm_frame, text="알람 현황",
+                                      font=ctk.CTkFont(size=18, weight="bold"),
+                                      text_color=self.purple_theme["primary"])
+        self.alarm_title.pack(pady=15)
+        
+        # 활성 알람 요약 레이블 추가
+        self.active_alarms_label = ctk.CTkLabel(self.alarm_frame,
+                                                text="활성 알람: 0개",
+                                                font=ctk.CTkFont(size=14),
+                                                text_color=self.purple_theme["primary"])
+        self.active_alarms_label.pack(pady=(0, 10))
+        
+        self.alarm_list = ctk.CTkTextbox(self.alarm_frame, width=300, height=600)
+        self.alarm_list.pack(padx=10, pady=10, fill="both", expand=True)
+
+    def select_date(self, date):
+        self.selected_date = date
+        # 버튼 스타일 업데이트
+        for btn_info in self.date_buttons:
+            if btn_info['date'] == date:
+                btn_info['button'].configure(
+                    fg_color=self.purple_theme["secondary"],
+                    text_color="white"
+                )
+            else:
+                btn_info['button'].configure(
+                    fg_color="transparent",
+                    text_color=self.purple_theme["primary"]
+                )
+        self.update_stale_title()
+        # 데몬 스냅샷을 받고 있으면 다시 수집하지 않고 바로 표시
+        if self.latest_snapshot is not None:
+            self.update_golf_cards(snapshot_feed.select_dates(self.latest_snapshot, [date]))
+
+    def toggle_scanning(self):
+        if not self.scanning:
+            if self.selected_date:
+                self.scanning = True
+                self.scan_button.configure(text="스캔 중지")
+                self.update_alarm(f"{self.selected_date} 날짜의 스캔을 시작합니다...")
+                if config.SNAPSHOT_SOURCE == "daemon":
+                    # 브라우저는 scrape_daemon.py 하나만 띄우고 여기서는 발행된 스냅샷을 구독
+                    self.subscriber = snapshot_feed.SnapshotSubscriber(
+                        self.on_snapshot, version=self.snapshot_version).start()
+                else:
+                    threading.Thread(target=self.scanning_loop, daemon=True).start()
+            else:
+                self.update_alarm("날짜를 선택해주세요.")
+        else:
+            self.scanning = False
+            if self.subscriber is not None:
+                self.subscriber.stop()
+                self.subscriber = None
+            self.scan_button.configure(text="스캔 시작")
+            self.update_alarm("스캔을 중지합니다...")
+
+    def scanning_loop(self):
+        # 선택한 날짜만 적응형 주기로 갱신 (가까운 날짜일수록, 변경이 잦을수록 자주; 실패 시 백오프)
+        try:
+            run_scheduler(
+                self.scrape_golf_data, self.on_scan_result, lambda: [self.selected_date],
+                workers=1, scheduler=self.refresh_scheduler, should_stop=lambda: not self.scanning,
+                on_error=lambda date, e: self.update_alarm(f"{date} 수집 실패, 잠시 후 다시 시도합니다: {str(e)}"),
+            )
+        except Exception as e:
+            self.update_alarm(f"오류 발생: {str(e)}")
+            self.scanning = False
+            self.run_on_ui(self.scan_button.configure, text="스캔 시작")
+
+    def on_scan_result(self, target_date, df):
+        self.update_alarm(f"데이터 수집 완료: {len(df)}개의 골프장")
+        if target_date == self.selected_date:
+            self.update_golf_cards(df)
+        self.save_snapshot(df)
+        self.persist_snapshot(target_date, df)
+
+    def persist_snapshot(self, target_date, df):
+        # 다음 시작 때 바로 띄울 수 있도록 날짜별 결과를 합쳐 스냅샷으로 남김
+        others = []
+        if self.latest_snapshot is not None:
+            # 날짜 탭에 있는 날짜만 유지 (지난 날짜는 버림)
+            dates = [btn_info['date'] for btn_info in self.date_buttons if btn_info['date'] != target_date]
+            others = [snapshot_feed.select_dates(self.latest_snapshot, dates)]
+        self.latest_snapshot = records.concat(others + [df])
+        self.stale_dates.discard(target_date)
+        self.update_stale_title()
+        try:
+            if self.snapshot_publisher is None:
+                self.snapshot_publisher = snapshot_feed.SnapshotPublisher()
+            self.snapshot_version = self.snapshot_publisher.publish(self.latest_snapshot, [target_date], self.stale_dates)
+        except Exception as e:
+            self.update_alarm(f"스냅샷 저장 중 오류 발생: {str(e)}")
+
+    def on_snapshot(self, frame, info):
+        self.latest_snapshot = frame
+        self.snapshot_version = info['version']
+        self.set_stale_dates(info['stale'])
+        self.update_alarm(f"스냅샷 v{info['version']} 수신 ({info['published_at']}, 갱신: {', '.join(info['updated'])})")
+        # 알람용 비교는 갱신된 날짜만
+        changed = snapshot_feed.select_dates(frame, info['updated'])
+        self.diff_engine.update(records.to_records(changed))
+        self.alarm_rules.evaluate(changed)
+        if self.selected_date in info['updated']:
+            self.update_golf_cards(snapshot_feed.select_dates(frame, [self.selected_date]))
+
+    def run_on_ui(self, callback, *args, **kwargs):
+        """메인 스레드면 바로 실행하고, 아니면 UI 큐에 넣어 메인 루프에서 실행"""
+        if threading.current_thread() is threading.main_thread():
+            callback(*args, **kwargs)
+        else:
+            self.ui_queue.put((callback, args, kwargs))
+
+    def drain_ui_queue(self):
+        # 한 번에 너무 오래 잡고 있지 않도록 시간 제한을 두고 비움
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            try:
+                callback, args, kwargs = self.ui_queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(*args, **kwargs)
+            except Exception as e:
+                print(f"UI 갱신 중 오류 발생: {str(e)}")
+        self.after(50, self.drain_ui_queue)
+
+    def update_golf_cards(self, df):
+        rows = records.to_records(df)
+        self.run_on_ui(self.card_list.set_rows, rows)
+
+    def update_alarm(self, message):
+        current_time = datetime.now().strftime("%H:%M:%S")
+        self.run_on_ui(self._append_alarm_line, f"[{current_time}] {message}\n")
+
+    def _append_alarm_line(self, line):
+        self.alarm_list.insert("end", line)
+        self.alarm_list.see("end")
+
+    def scrape_golf_data(self, target_date):
+        try:
+            url = config.listing_url(target_date)
+            self.update_alarm(f"페이지 로딩 중: {url}")
+            
+            html = self.fetcher.fetch(target_date)
+
+            scraping_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            data_list = records.normalize(parse_listing(html, target_date, scraping_date))
+
+            return records.to_frame(data_list)
+            
+        except Exception as e:
+            self.update_alarm(f"스크래핑 중 오류 발생: {str(e)}")
+            return None
+
+    def save_snapshot(self, df):
+        # 저장소/이력/변경 감지/분석 뷰 반영은 데몬과 같은 scraper.save_snapshot으로
+        if not scraper.save_snapshot(df):
+            self.update_alarm("파일 저장 중 오류 발생 (콘솔 로그 참고)")
+            return False
+        try:
+            self.alarm_rules.evaluate(df)
+        except Exception as e:
+            self.update_alarm(f"알람 규칙 평가 중 오류 발생: {str(e)}")
+        self.update_alarm("저장소 업데이트 완료")
+        return True
+
+    def add_alarm(self, golf_name, current_teams, play_time):
+        # 팀 수는 수집할 때 이미 정수로 해석됨 (없으면 None)
+        teams_count = records.parse_count(current_teams)
+
+        if golf_name in self.active_alarms:
+            return
+        rule = alarm_rules.Rule(golf_course=golf_name, direction='down', label=GUI_ALARM_LABEL)
+        self.active_alarms[golf_name] = {
+            'rule_id': self.alarm_rules.add(rule),
+            'teams': teams_count,
+            'play_time': play_time
+        }
+        message = "[알람 설정]\n"
+        message += f"골프장: {golf_name}\n"
+        message += f"경기 시간: {format_play_time(play_time)}\n"
+        message += f"현재 팀 수: {records.format_teams(teams_count)}"
+        self.update_alarm(message)
+        self.update_active_alarms_count()
+
+    def remove_alarm(self, golf_name):
+        if golf_name in self.active_alarms:
+            message = f"❌ 알람 해제: {golf_name}"
+            self.update_alarm(message)
+            self.alarm_rules.remove(self.active_alarms.pop(golf_name)['rule_id'])
+            self.update_active_alarms_count()
+
+    def notify_team_decrease(self, message):
+        # 알림 발송 스레드에서 호출됨 (update_alarm이 UI 큐로 넘김), message는 묶인 알림(notifier.Message)
+        text = "[티타임 변동 알림]\n"
+        text += f"골프장: {message.golf_course} ({message.play_date})\n"
+        text += f"경기 시간: {format_play_time(message.tee_times)}\n"
+        text += f"팀 수 변동: {records.format_teams(message.previous_teams)} → {records.format_teams(message.current_teams)}"
+        if message.count > 1:
+            text += f" ({message.count}건 묶음)"
+        labels = [label for label in message.labels if label and label != GUI_ALARM_LABEL]
+        if labels:
+            text += f"\n규칙: {', '.join(labels)}"
+        text += f"\n부킹 완료 시각: {message.last_at[11:]}"
+        self.update_alarm(text)
+
+    def update_active_alarms_count(self):
+        count = len(self.active_alarms)
+        self.run_on_ui(self.active_alarms_label.configure, text=f"활성 알람: {count}개")
+
+if __name__ == "__main__":
+    app = App()
+    app.mainloop()
@@ -0,0 +1,62 @@
+"""HttpFetcher 페이지 수집을 stub_site 대역 서버로 확인"""
+import pytest
+
+pytest.importorskip("aiohttp")
+
+import fetchers
+import stub_site
+from benchmarks import synthetic
+from listing_parser import parse_listing
+
+PLAY_DATE = "2026-11-01"
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    """골프장 50개를 20개씩 3페이지로 녹화한 대역 서버 (요청한 페이지 번호를 기록)"""
+    synthetic.write_site(str(tmp_path), [PLAY_DATE], 50, per_page=20)
+    requested = []
+    do_get = stub_site.StubHandler.do_GET
+
+    def recording_get(handler):
+        requested.append(handler.path)
+        do_get(handler)
+
+    monkeypatch.setattr(stub_site.StubHandler, "do_GET", recording_get)
+    server, base_url = stub_site.serve(str(tmp_path))
+    yield base_url, requested
+    server.shutdown()
+    server.server_close()
+
+
+def fetch_rows(fetcher):
+    try:
+        html = fetcher.fetch(PLAY_DATE)
+    finally:
+        fetcher.close()
+    return parse_listing(html, PLAY_DATE, f"{PLAY_DATE} 06:00:00")
+
+
+def test_fetches_all_pages_and_stops_at_empty_page(site):
+    base_url, requested = site
+    rows = fetch_rows(fetchers.HttpFetcher(base_url=base_url, max_pages=50))
+    assert len(rows) == 50
+    assert len({row["golf_course"] for row in rows}) == 50
+    # 3페이지 + 골프장이 없는 4페이지에서 멈춤
+    assert len(requested) == 4
+    assert requested[-1].endswith("&page=4")
+
+
+def test_stops_when_server_ignores_page_param(site):
+    base_url, requested = site
+    # 서버가 모르는 파라미터로 요청하면 매번 첫 페이지가 오므로 반복을 보고 멈춰야 함
+    rows = fetch_rows(fetchers.HttpFetcher(base_url=base_url, page_param="offset", max_pages=50))
+    assert len(rows) == 20
+    assert len(requested) == 2
+
+
+def test_respects_max_pages(site):
+    base_url, requested = site
+    rows = fetch_rows(fetchers.HttpFetcher(base_url=base_url, max_pages=2))
+    assert len(rows) == 40
+    assert len(requested) == 2
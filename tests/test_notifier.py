@@ -0,0 +1,111 @@
+"""NotificationDispatcher + WebhookSink를 stub_site 웹훅 대역으로 확인"""
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+import notifier
+import stub_site
+from alarm_rules import Alert
+
+
+def alert(golf_course, previous_teams, current_teams, label="규칙"):
+    return Alert(1, label, golf_course, "2026-11-01", "경기남부 > 용인", previous_teams, current_teams, 150000, ())
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "시간 초과"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def webhook(tmp_path):
+    """(웹훅 주소, 받은 본문 목록, 응답 코드 기록, 핸들러 클래스)"""
+    received = []
+    server, base_url = stub_site.serve(str(tmp_path), webhooks=received)
+    handler = server.RequestHandlerClass
+    statuses = []
+    do_post = handler.do_POST
+
+    def recording_post(request):
+        statuses.append(handler.webhook_status)
+        do_post(request)
+
+    handler.do_POST = recording_post
+    yield base_url + "/webhook", received, statuses, handler
+    server.shutdown()
+    server.server_close()
+
+
+def dispatcher_for(url, window=0.2):
+    sink = notifier.WebhookSink(url=url, per_minute=0, retries=3, timeout=2)
+    return notifier.NotificationDispatcher([sink], window=window, backoff=0.05, backoff_max=0.1).start()
+
+
+def test_retries_after_server_error(webhook):
+    url, received, statuses, handler = webhook
+    handler.webhook_status = 503
+    original = handler.do_POST
+
+    def fail_once(request):
+        original(request)
+        handler.webhook_status = 204  # 첫 요청만 실패
+
+    handler.do_POST = fail_once
+    dispatcher = dispatcher_for(url, window=0.01)
+    dispatcher.submit([alert("테스트CC", 3, 2)])
+    wait_for(lambda: received)
+    dispatcher.close(timeout=2)
+
+    assert statuses == [503, 204]
+    assert len(received) == 1
+    assert received[0]["golf_course"] == "테스트CC"
+
+
+def test_does_not_retry_client_error(webhook):
+    url, received, statuses, handler = webhook
+    handler.webhook_status = 400
+    dispatcher = dispatcher_for(url, window=0.01)
+    dispatcher.submit([alert("테스트CC", 3, 2)])
+    wait_for(lambda: statuses)
+    dispatcher.close(timeout=2)
+
+    assert statuses == [400]
+    assert received == []
+
+
+def test_coalesces_alerts_within_window(webhook):
+    url, received, statuses, handler = webhook
+    dispatcher = dispatcher_for(url, window=0.3)
+    dispatcher.submit([alert("테스트CC", 5, 4, label="A")])
+    time.sleep(0.05)
+    dispatcher.submit([alert("테스트CC", 4, 2, label="B"), alert("다른CC", 1, 0)])
+    wait_for(lambda: len(received) == 2)
+    time.sleep(0.1)
+    dispatcher.close(timeout=2)
+
+    by_course = {body["golf_course"]: body for body in received}
+    assert len(received) == 2
+    merged = by_course["테스트CC"]
+    assert merged["count"] == 2
+    assert (merged["previous_teams"], merged["current_teams"]) == (5, 2)
+    assert merged["labels"] == ["A", "B"]
+    assert by_course["다른CC"]["count"] == 1
+
+
+def test_close_flushes_pending_and_drops_later_alerts(webhook):
+    url, received, statuses, handler = webhook
+    dispatcher = dispatcher_for(url, window=60)
+    dispatcher.submit([alert("테스트CC", 3, 2)])
+    dispatcher.close(timeout=2)
+    # 묶는 중이던 알림은 close에서 바로 보냄
+    assert len(received) == 1
+
+    threads = threading.active_count()
+    assert dispatcher.submit([alert("테스트CC", 2, 1)]) == 0
+    assert threading.active_count() == threads
+    assert len(received) == 1
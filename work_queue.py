@@ -0,0 +1,380 @@
+"""여러 프로세스/호스트로 수집을 나누는 리스(lease) 기반 작업 큐 (SQLite)
+
+데몬(scrape_daemon.py --queue)은 갱신할 날짜가 되면 (roundDay, 목록 파라미터)마다 작업을
+큐 파일에 넣고, 워커 프로세스(python work_queue.py worker)가 작업을 하나씩 가져가(claim)
+페이지를 받아 파싱한 결과를 다시 큐에 기록한다. 데몬은 한 날짜의 작업이 모두 끝나면
+결과를 골프장 단위로 합쳐 하나의 스냅샷으로 반영한다.
+
+- 작업을 가져갈 때 리스(만료 시각)와 토큰을 받고, 처리하는 동안 하트비트로 리스를 연장한다.
+  워커가 죽어 리스가 만료되면 다른 워커가 다시 가져간다 (QUEUE_MAX_ATTEMPTS번까지)
+- 결과 기록과 완료 표시는 토큰이 맞을 때만 한 트랜잭션으로 하므로, 리스를 잃은 워커의
+  늦은 결과는 버려지고 같은 작업의 결과가 두 번 반영되지 않는다
+- 같은 날짜를 다시 넣으면 세대(generation)만 올라가고 작업 행은 하나로 유지된다. 이미 대기/처리
+  중인 작업은 그대로 두므로 같은 페이지를 동시에 두 번 받지 않는다
+- 여러 목록 파라미터(정렬/지역 등)에 같은 골프장이 나오면 가장 최근에 받은 행 하나만 남긴다
+
+    python scrape_daemon.py --queue work_queue.db --spawn 4
+    python work_queue.py worker --queue /shared/work_queue.db   # 다른 호스트에서 워커 추가
+    python work_queue.py stats
+
+리스 시각은 벽시계(time.time) 기준이므로 여러 호스트의 시계가 맞아 있어야 한다. 네트워크
+디렉터리를 함께 쓸 때는 TEETIME_QUEUE_JOURNAL=DELETE로 WAL을 끈다.
+"""
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+import zlib
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import datetime
+
+import config
+import metrics
+import records
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    round_day TEXT NOT NULL,
+    params TEXT NOT NULL,                -- 목록 URL에 덧붙일 파라미터 ('' = 기본 목록)
+    generation INTEGER NOT NULL,         -- 다시 넣을 때마다 1씩 증가
+    state TEXT NOT NULL,                 -- queued, leased, done, failed
+    due REAL NOT NULL,                   -- 이 시각(time.time) 이후에 가져갈 수 있음
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_token TEXT,
+    lease_expires REAL,
+    last_error TEXT,
+    UNIQUE (round_day, params)
+);
+CREATE INDEX IF NOT EXISTS items_claim ON items (state, due);
+CREATE TABLE IF NOT EXISTS results (
+    item_id INTEGER PRIMARY KEY,         -- 작업마다 마지막 결과 하나
+    generation INTEGER NOT NULL,
+    scraping_date TEXT NOT NULL,
+    worker TEXT,
+    payload BLOB NOT NULL                -- zlib 압축한 파싱 결과 (JSON 레코드 목록)
+);
+"""
+
+SUBMIT_SQL = """
+INSERT INTO items (round_day, params, generation, state, due) VALUES (?, ?, 1, 'queued', ?)
+ON CONFLICT (round_day, params) DO UPDATE SET
+    generation = generation + 1, state = 'queued', due = excluded.due, attempts = 0,
+    lease_owner = NULL, lease_token = NULL, lease_expires = NULL, last_error = NULL
+WHERE state IN ('done', 'failed')
+"""
+
+CLAIM_SQL = """
+SELECT id, round_day, params, generation, attempts, state FROM items
+WHERE (state = 'queued' AND due <= ?) OR (state = 'leased' AND lease_expires < ?)
+ORDER BY due, id LIMIT 1
+"""
+
+RETRY_BACKOFF = 5.0  # 실패한 작업의 첫 재시도 대기(초), 매번 두 배
+
+# 가져간 작업 (token이 맞아야 완료/실패/하트비트가 반영됨)
+Item = namedtuple('Item', 'id round_day params generation token attempts')
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class WorkQueue:
+    """SQLite 파일 하나로 된 작업 큐 (스레드마다 연결을 따로 씀)"""
+
+    def __init__(self, path=None, lease=None, max_attempts=None, journal_mode=None):
+        self.path = path or config.QUEUE_PATH or "work_queue.db"
+        self.lease = config.QUEUE_LEASE_SECONDS if lease is None else lease
+        self.max_attempts = config.QUEUE_MAX_ATTEMPTS if max_attempts is None else max_attempts
+        self.journal_mode = journal_mode or config.QUEUE_JOURNAL_MODE
+        self._local = threading.local()
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute(f"PRAGMA journal_mode={self.journal_mode}")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """쓰기 잠금을 바로 잡는 트랜잭션 (여러 워커가 같은 작업을 가져가지 않도록)"""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    # 데몬 쪽
+
+    def submit(self, round_day, params_list):
+        """날짜 하나의 작업들을 넣고 {작업 id: 기다릴 세대} 반환"""
+        params_list = list(params_list)
+        with self._transaction() as conn:
+            conn.executemany(SUBMIT_SQL, [(round_day, params, time.time()) for params in params_list])
+            rows = conn.execute(
+                f"SELECT id, generation FROM items WHERE round_day = ? AND params IN ({', '.join('?' for _ in params_list)})",
+                [round_day] + params_list,
+            ).fetchall()
+        return dict(rows)
+
+    def states(self, item_ids):
+        """{작업 id: (상태, 세대, 마지막 오류)}"""
+        item_ids = list(item_ids)
+        rows = self._conn().execute(
+            f"SELECT id, state, generation, last_error FROM items WHERE id IN ({', '.join('?' for _ in item_ids)})",
+            item_ids,
+        ).fetchall()
+        return {item_id: (state, generation, error) for item_id, state, generation, error in rows}
+
+    def results(self, item_ids):
+        """{작업 id: (세대, 스크래핑 시각, 파싱 결과 레코드 목록)}"""
+        item_ids = list(item_ids)
+        rows = self._conn().execute(
+            f"SELECT item_id, generation, scraping_date, payload FROM results "
+            f"WHERE item_id IN ({', '.join('?' for _ in item_ids)})",
+            item_ids,
+        ).fetchall()
+        return {
+            item_id: (generation, scraping_date, json.loads(zlib.decompress(payload)))
+            for item_id, generation, scraping_date, payload in rows
+        }
+
+    def prune(self, before):
+        """지난 날짜(before 이전)의 작업과 결과 삭제"""
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM results WHERE item_id IN (SELECT id FROM items WHERE round_day < ?)", (before,))
+            return conn.execute("DELETE FROM items WHERE round_day < ?", (before,)).rowcount
+
+    def stats(self):
+        """상태별 작업 수"""
+        return dict(self._conn().execute("SELECT state, COUNT(*) FROM items GROUP BY state").fetchall())
+
+    # 워커 쪽
+
+    def claim(self, worker):
+        """가져갈 수 있는 작업 하나를 리스로 잡아 반환 (없으면 None)
+
+        대기 중인 작업과 리스가 만료된 작업이 대상이다. 시도 횟수를 다 쓴 만료 작업은 failed로 바꾼다.
+        """
+        with self._transaction() as conn:
+            while True:
+                now = time.time()
+                row = conn.execute(CLAIM_SQL, (now, now)).fetchone()
+                if row is None:
+                    return None
+                item_id, round_day, params, generation, attempts, state = row
+                if state == "leased":
+                    metrics.counter("teetime_queue_lease_expired_total", "리스가 만료되어 다시 가져간 작업 수").inc()
+                    if attempts >= self.max_attempts:
+                        conn.execute("UPDATE items SET state = 'failed', last_error = ?, lease_owner = NULL, "
+                                     "lease_token = NULL, lease_expires = NULL WHERE id = ?",
+                                     ("리스 만료 (워커 응답 없음)", item_id))
+                        continue
+                token = uuid.uuid4().hex
+                conn.execute(
+                    "UPDATE items SET state = 'leased', lease_owner = ?, lease_token = ?, lease_expires = ?, "
+                    "attempts = attempts + 1 WHERE id = ?",
+                    (worker, token, now + self.lease, item_id),
+                )
+                return Item(item_id, round_day, params, generation, token, attempts + 1)
+
+    def heartbeat(self, item):
+        """리스 연장 (리스를 잃었으면 False)"""
+        with self._transaction() as conn:
+            return conn.execute(
+                "UPDATE items SET lease_expires = ? WHERE id = ? AND lease_token = ? AND state = 'leased'",
+                (time.time() + self.lease, item.id, item.token),
+            ).rowcount == 1
+
+    def complete(self, item, rows, scraping_date, worker=None):
+        """결과를 기록하고 완료 표시 (리스를 잃었으면 아무것도 바꾸지 않고 False)"""
+        payload = zlib.compress(json.dumps(rows, ensure_ascii=False).encode("utf-8"))
+        with self._transaction() as conn:
+            updated = conn.execute(
+                "UPDATE items SET state = 'done', lease_owner = NULL, lease_token = NULL, lease_expires = NULL, "
+                "last_error = NULL WHERE id = ? AND lease_token = ? AND state = 'leased'",
+                (item.id, item.token),
+            ).rowcount
+            if updated != 1:
+                return False
+            conn.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                         (item.id, item.generation, scraping_date, worker, payload))
+        return True
+
+    def fail(self, item, error):
+        """실패 기록 (시도 횟수가 남았으면 점점 길게 기다렸다가 다시 대기, 아니면 failed)"""
+        delay = RETRY_BACKOFF * 2 ** (item.attempts - 1)
+        with self._transaction() as conn:
+            return conn.execute(
+                "UPDATE items SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'queued' END, due = ?, "
+                "last_error = ?, lease_owner = NULL, lease_token = NULL, lease_expires = NULL "
+                "WHERE id = ? AND lease_token = ? AND state = 'leased'",
+                (self.max_attempts, time.time() + delay, error, item.id, item.token),
+            ).rowcount == 1
+
+
+def merge_results(results):
+    """여러 목록 파라미터의 파싱 결과를 골프장 단위로 합침 (같은 골프장은 가장 최근 행)
+
+    결과 순서와 상관없이 같은 입력이면 같은 결과가 나오므로 다시 합쳐도 안전하다.
+    """
+    merged = {}
+    for rows in results:
+        for row in rows:
+            old = merged.get(row["golf_course"])
+            if old is None or str(row["scraping_date"]) > str(old["scraping_date"]):
+                merged[row["golf_course"]] = row
+    return records.normalize(merged.values())
+
+
+class QueueScraper:
+    """run_scheduler의 scrape(날짜) 자리에 넣는 큐 기반 수집
+
+    날짜의 작업을 큐에 넣고 워커들이 모두 끝낼 때까지 기다린 뒤 합친 데이터프레임을 반환한다.
+    하나라도 끝내 실패하면 예외를 내서 스케줄러가 그 날짜를 백오프하게 한다.
+    """
+
+    def __init__(self, queue=None, params=None, timeout=None, poll=None):
+        self.queue = queue or WorkQueue()
+        self.params = list(config.QUEUE_LISTING_PARAMS if params is None else params)
+        self.timeout = config.QUEUE_WAIT_TIMEOUT if timeout is None else timeout
+        self.poll = config.QUEUE_POLL_INTERVAL if poll is None else poll
+
+    def __call__(self, play_date):
+        generations = self.queue.submit(play_date, self.params)
+        deadline = time.monotonic() + self.timeout
+        with metrics.span("queue_wait"):
+            while True:
+                states = self.queue.states(generations)
+                finished = {
+                    item_id: states[item_id] for item_id, generation in generations.items()
+                    if states[item_id][0] in ("done", "failed") and states[item_id][1] >= generation
+                }
+                if len(finished) == len(generations):
+                    break
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"작업 대기 시간 초과 ({len(finished)}/{len(generations)}개 완료)")
+                time.sleep(self.poll)
+
+        errors = [error or "알 수 없는 오류" for state, _, error in finished.values() if state == "failed"]
+        if errors:
+            raise RuntimeError(f"작업 {len(errors)}개 실패: {errors[0]}")
+        results = self.queue.results(generations)
+        with metrics.span("queue_merge"):
+            return records.to_frame(merge_results(results[item_id][2] for item_id in sorted(results)))
+
+
+class _Heartbeat:
+    """작업을 처리하는 동안 리스를 주기적으로 연장하는 스레드"""
+
+    def __init__(self, queue, item):
+        self.queue = queue
+        self.item = item
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="queue-heartbeat", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.queue.lease / 3):
+            try:
+                if not self.queue.heartbeat(self.item):
+                    self.lost = True
+                    return
+            except sqlite3.Error as e:
+                print(f"하트비트 실패: {str(e)}")
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+
+def run_worker(queue=None, fetcher=None, worker=None, should_stop=None, poll=None):
+    """작업을 가져와 수집/파싱하고 결과를 기록하는 것을 반복 (처리한 작업 수 반환)"""
+    import fetchers
+    from listing_parser import parse_listing
+
+    queue = queue or WorkQueue()
+    fetcher = fetcher or fetchers.get_fetcher()
+    worker = worker or worker_name()
+    should_stop = should_stop or (lambda: False)
+    poll = config.QUEUE_POLL_INTERVAL if poll is None else poll
+    processed = 0
+    print(f"워커 시작: {worker} ({queue.path})")
+    try:
+        while not should_stop():
+            item = queue.claim(worker)
+            if item is None:
+                time.sleep(poll)
+                continue
+            label = f"{item.round_day}{' ' + item.params if item.params else ''}"
+            with _Heartbeat(queue, item) as heartbeat:
+                try:
+                    with metrics.span("queue_item"):
+                        html = fetcher.fetch(item.round_day, item.params or None)
+                        scraping_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                        rows = parse_listing(html, item.round_day, scraping_date)
+                    if not rows:
+                        raise RuntimeError("골프장이 하나도 없습니다")
+                except Exception as e:
+                    queue.fail(item, f"{type(e).__name__}: {str(e)}")
+                    print(f"작업 실패 ({label}, {item.attempts}번째 시도): {str(e)}")
+                    continue
+            if heartbeat.lost or not queue.complete(item, rows, scraping_date, worker):
+                print(f"리스를 잃어 결과를 버립니다: {label}")
+                continue
+            processed += 1
+            print(f"작업 완료: {label} ({len(rows)}개 골프장)")
+    finally:
+        fetcher.close()
+    return processed
+
+
+def spawn_workers(count, queue_path):
+    """같은 호스트에 워커 프로세스 count개 시작 (Popen 목록 반환)"""
+    import subprocess
+    return [
+        subprocess.Popen([sys.executable, os.path.abspath(__file__), "worker", "--queue", queue_path])
+        for _ in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="수집 작업 큐")
+    parser.add_argument("command", choices=["worker", "stats"])
+    parser.add_argument("--queue", default=config.QUEUE_PATH or "work_queue.db", help="큐 파일 경로")
+    parser.add_argument("--name", help="워커 이름 (기본 호스트:PID)")
+    args = parser.parse_args()
+
+    queue = WorkQueue(args.queue)
+    if args.command == "stats":
+        for state, count in sorted(queue.stats().items()):
+            print(f"{state}: {count}")
+        return 0
+    try:
+        run_worker(queue, worker=args.name)
+    except KeyboardInterrupt:
+        print("\n워커를 종료합니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())